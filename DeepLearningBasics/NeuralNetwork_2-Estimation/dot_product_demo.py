@@ -1,14 +1,9 @@
-def dot_product(first_vector, second_vector):
-    # Remember you can only use dot product on with the same size
-    assert( len(first_vector) == len(second_vector))
+import os
+import sys
 
-    vectors_size = len(first_vector)
-    dot_product_result = 0
-
-    for index in range(vectors_size):
-        dot_product_result += first_vector[index] * second_vector[index]
-
-    return dot_product_result
+# dot_product and the dense layer live in DeepLearningBasics/nn_toolkit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from nn_toolkit import dot_product
 
 
 test_vector_one = [2, 3, 4]
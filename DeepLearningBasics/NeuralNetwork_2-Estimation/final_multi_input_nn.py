@@ -1,13 +1,9 @@
-def dot_product(first_vector, second_vector):
-    assert( len(first_vector) == len(second_vector))
+import os
+import sys
 
-    vectors_size = len(first_vector)
-    dot_product_result = 0
-
-    for index in range(vectors_size):
-        dot_product_result += first_vector[index] * second_vector[index]
-
-    return dot_product_result
+# dot_product and the dense layer live in DeepLearningBasics/nn_toolkit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from nn_toolkit import dot_product
 
 def multi_input_neural_network(input_information, weights):
     calories_burned = dot_product(input_information, weights)
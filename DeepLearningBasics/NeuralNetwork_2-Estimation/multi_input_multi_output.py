@@ -1,22 +1,14 @@
-def dot_product(first_vector, second_vector):
-    assert( len(first_vector) == len(second_vector))
+import os
+import sys
 
-    vectors_size = len(first_vector)
-    dot_product_result = 0
+# dot_product and the dense layer live in DeepLearningBasics/nn_toolkit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from nn_toolkit import Dense
 
-    for index in range(vectors_size):
-        dot_product_result += first_vector[index] * second_vector[index]
-
-    return dot_product_result
 
 def multi_input_multi_output_neural_network(input_information, weights):
-    # Estimates will be put and returned in an array
-    estimates = []
-    
-    for weights_for_estimate in weights:
-        estimates.append( dot_product(input_information, weights_for_estimate) )
-
-    return estimates
+    # All the estimates are computed at once, as a single matrix-vector product
+    return Dense(weights).forward(input_information)
 
 
 #DEMO
@@ -0,0 +1,44 @@
+import os
+import sys
+
+# The shared helpers live in DeepLearningBasics/nn_toolkit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from nn_toolkit import Nesterov, StoppingPolicy
+
+def neural_network(input, weight):
+    predicted_value = input * weight
+    return predicted_value
+
+
+minutes_running = 20
+actual_calories_burned = 180
+
+# We perform this extra assignment just to keep consistency with the names
+input = minutes_running
+expected_value = actual_calories_burned
+
+weight = 7
+
+# hot_cold_prediction_iterative.py tries weight + learning_rate and weight - learning_rate
+# on every step, two extra predictions to find out which way to go. The derivative of the
+# error tells us directly, and how big the step should be. Nesterov momentum keeps
+# some of the previous step, which gets us there in fewer steps.
+optimizer = Nesterov(alpha=0.002, beta=0.3)
+# Stop when we are less than 0.1 calories off
+stopping = StoppingPolicy(tolerance=0.01, max_iterations=1000)
+
+while True:
+    predicted_value = neural_network(input, weight)
+    print("According to my neural network, I burned {} calories".format(predicted_value))
+    error = (predicted_value - expected_value)**2
+    print("The error in the prediction is {} ".format(error))
+
+    derivative = input * (predicted_value - expected_value)
+    weight = optimizer.step(weight, derivative)
+    print("The new value of our weight is {}".format(weight))
+
+    print("\n")
+    if stopping.should_stop(error, derivative):
+        break
+
+print(stopping.summary())
@@ -0,0 +1,16 @@
+import os
+import sys
+
+# The shared helpers live in DeepLearningBasics/nn_toolkit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from nn_toolkit import SingleWeightTrainer, grid_search, results_table, run_sweep
+
+# gradient_descent_iterative.py uses alpha = 24. Which values of alpha reach an
+# error of 0, and how fast? Alphas that are too big make the error explode, those
+# trials are stopped as soon as it happens.
+space = {'alpha': [0.1, 1, 5, 10, 24, 30, 49, 51, 100]}
+
+if __name__ == '__main__':
+    # No successive halving here, we want to see how every alpha ends
+    trials = run_sweep(SingleWeightTrainer, grid_search(space), max_iterations=1000, min_iterations=1000)
+    print(results_table(trials))
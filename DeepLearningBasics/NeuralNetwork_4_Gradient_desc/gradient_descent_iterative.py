@@ -1,3 +1,10 @@
+import os
+import sys
+
+# The shared helpers live in DeepLearningBasics/nn_toolkit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from nn_toolkit import StoppingPolicy
+
 def neural_network(input, weight):
     predicted_value = input * weight
     return predicted_value
@@ -7,6 +14,9 @@ input = 0.2
 expected_value = 8
 weight = 10
 
+# Stop when the error reaches 0, but never run more than 1000 iterations
+stopping = StoppingPolicy(tolerance=0, max_iterations=1000)
+
 while True:
     # Because of how python handles floating point, we round the values
     predicted_value = round(neural_network(input, weight), 2)
@@ -24,5 +34,7 @@ while True:
     print("The new value of our weight is {}".format(weight))
     
     print("\n")
-    if(error == 0):
-        break
\ No newline at end of file
+    if stopping.should_stop(error, derivative):
+        break
+
+print(stopping.summary())
\ No newline at end of file
@@ -1,3 +1,10 @@
+import os
+import sys
+
+# The shared helpers live in DeepLearningBasics/nn_toolkit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from nn_toolkit import StoppingPolicy
+
 def calculate_weight_adjustments(inputs, correction_factor):
     weight_adjustments = []
 
@@ -33,6 +40,9 @@ weights = [10, 2, 11]
 expected_value = 8
 alpha = 0.04
 
+# Stop when the error reaches 0, but never run more than 1000 iterations
+stopping = StoppingPolicy(tolerance=0, max_iterations=1000)
+
 while True:
     # Because of how python handles floating point, we round the values
     predicted_value = round(multi_input_neural_network(inputs, weights), 2)
@@ -49,5 +59,7 @@ while True:
 
     
     print("\n")
-    if(error == 0):
-        break
\ No newline at end of file
+    if stopping.should_stop(error, weight_adjustments):
+        break
+
+print(stopping.summary())
\ No newline at end of file
@@ -1,22 +1,18 @@
-def dot_product(first_vector, second_vector):
-    assert( len(first_vector) == len(second_vector))
+import os
+import sys
 
-    vectors_size = len(first_vector)
-    dot_product_result = 0
+# The shared helpers live in DeepLearningBasics/nn_toolkit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from nn_toolkit import Dense, RingBufferSink, StoppingPolicy
 
-    for index in range(vectors_size):
-        dot_product_result += first_vector[index] * second_vector[index]
-
-    return round(dot_product_result, 2)
+# Run with --quiet to skip the prints, the metrics are then kept in memory instead
+quiet = '--quiet' in sys.argv
+metrics = RingBufferSink()
 
 
 def multi_input_multi_output_neural_network(inputs, weights):
-    predicted_values= []
-    
-    for weights_for_estimate in weights:
-        predicted_values.append( dot_product(inputs, weights_for_estimate) )
-
-    return predicted_values
+    # Every estimate is still rounded to 2 decimals, but computed in a single product
+    return Dense(weights, decimals=2).forward(inputs)
 
 def calculate_errors(predicted_values, expected_values):
     errors = []
@@ -69,35 +65,42 @@ weights_3 = [2.2, 5.3, 7]   # Weights for the third output
 
 weights = [weights_1, weights_2,  weights_3]
 
+# Stop when all errors are 0, but never run more than 1000 iterations
+stopping = StoppingPolicy(tolerance=0, max_iterations=1000)
+
+step = 0
 while True:
     predicted_values = multi_input_multi_output_neural_network(inputs, weights)
-    print("According to my neural network, the 1st result is {}".format(predicted_values[0]))
-    print("According to my neural network, the 2nd result is {}".format(predicted_values[1]))
-    print("According to my neural network, the 3rd result is {}".format(predicted_values[2]))
-
     errors = calculate_errors(predicted_values, expected_values)
-    print("The error in the 1st prediction is {} ".format(errors[0]))
-    print("The error in the 2nd prediction is {} ".format(errors[1]))
-    print("The error in the 3rd prediction is {} ".format(errors[2]))
 
     ## These weights participated in the prediction of the first output value
     weight_correction_factors = calculate_weight_correction_matrix(alpha, inputs, expected_values, predicted_values)
     weights = calculate_corrected_weights(weights, weight_correction_factors)
 
-    print("\n")
-    print("The 1st weight for the first output is now {} ".format(weights[0][0]) )
-    print("The 2nd weight for the first output is now {} ".format(weights[0][1]) )
-    print("The 3rd weight for the first output is now {} ".format(weights[0][2]) )
-    print("\n")
-    print("The 1st weight for the second output is now {} ".format(weights[1][0]) )
-    print("The 2nd weight for the second output is now {} ".format(weights[1][1]) )
-    print("The 3rd weight for the second output is now {} ".format(weights[1][2]) )
-    print("\n")
-    print("The 1st weight for the third output is now {} ".format(weights[2][0]) )
-    print("The 2nd weight for the third output is now {} ".format(weights[2][1]) )
-    print("The 3rd weight for the third output is now {} ".format(weights[2][2]) )
-
-    print("\n")
-    #We stop when all errors are 0
-    if(calculate_total_error(errors) == 0):
-        break
\ No newline at end of file
+    step += 1
+    metrics.record(step, total_error=calculate_total_error(errors))
+    if not quiet:
+        print("According to my neural network, the 1st result is {}".format(predicted_values[0]))
+        print("According to my neural network, the 2nd result is {}".format(predicted_values[1]))
+        print("According to my neural network, the 3rd result is {}".format(predicted_values[2]))
+        print("The error in the 1st prediction is {} ".format(errors[0]))
+        print("The error in the 2nd prediction is {} ".format(errors[1]))
+        print("The error in the 3rd prediction is {} ".format(errors[2]))
+        print("\n")
+        print("The 1st weight for the first output is now {} ".format(weights[0][0]) )
+        print("The 2nd weight for the first output is now {} ".format(weights[0][1]) )
+        print("The 3rd weight for the first output is now {} ".format(weights[0][2]) )
+        print("\n")
+        print("The 1st weight for the second output is now {} ".format(weights[1][0]) )
+        print("The 2nd weight for the second output is now {} ".format(weights[1][1]) )
+        print("The 3rd weight for the second output is now {} ".format(weights[1][2]) )
+        print("\n")
+        print("The 1st weight for the third output is now {} ".format(weights[2][0]) )
+        print("The 2nd weight for the third output is now {} ".format(weights[2][1]) )
+        print("The 3rd weight for the third output is now {} ".format(weights[2][2]) )
+        print("\n")
+
+    if stopping.should_stop(calculate_total_error(errors), weight_correction_factors):
+        break
+
+print(stopping.summary())
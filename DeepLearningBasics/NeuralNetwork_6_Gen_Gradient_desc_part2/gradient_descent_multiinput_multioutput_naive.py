@@ -1,22 +1,14 @@
-def dot_product(first_vector, second_vector):
-    assert( len(first_vector) == len(second_vector))
+import os
+import sys
 
-    vectors_size = len(first_vector)
-    dot_product_result = 0
-
-    for index in range(vectors_size):
-        dot_product_result += first_vector[index] * second_vector[index]
-
-    return round(dot_product_result, 2)
+# The shared helpers live in DeepLearningBasics/nn_toolkit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from nn_toolkit import Dense, StoppingPolicy
 
 
 def multi_input_multi_output_neural_network(inputs, weights):
-    predicted_values= []
-    
-    for weights_for_estimate in weights:
-        predicted_values.append( dot_product(inputs, weights_for_estimate) )
-
-    return predicted_values
+    # Every estimate is still rounded to 2 decimals, but computed in a single product
+    return Dense(weights, decimals=2).forward(inputs)
 
 alpha = 0.2
 inputs = [0.2, 2.3, 1.2]
@@ -28,6 +20,9 @@ weights_3 = [2.2, 5.3, 7]   # Weights for the third output
 
 weights = [weights_1, weights_2,  weights_3]
 
+# Stop when the error reaches 0, but never run more than 1000 iterations
+stopping = StoppingPolicy(tolerance=0, max_iterations=1000)
+
 while True:
     predicted_values = multi_input_multi_output_neural_network(inputs, weights)
     print("According to my neural network, the 1st result is {}".format(predicted_values[0]))
@@ -82,6 +77,7 @@ while True:
     print("The 3rd weight for the third output is now {} ".format(weights[2][2]) )
 
     print("\n")
-    #We stop when all errors are 0
-    if(error_1 + error_2 + error_3 == 0):
-        break
\ No newline at end of file
+    if stopping.should_stop(error_1 + error_2 + error_3):
+        break
+
+print(stopping.summary())
\ No newline at end of file
@@ -1,5 +1,19 @@
+import os
+import sys
+
 import numpy as nmpy
 
+# The metrics sinks and the data sources live in DeepLearningBasics/nn_toolkit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from nn_toolkit import ArraySource, CsvSource, MemmapSource, RingBufferSink, prefetch, profiler_from_argv
+
+# Run with --quiet to skip the prints, the metrics are then kept in memory instead
+quiet = '--quiet' in sys.argv
+metrics = RingBufferSink()
+
+# Run with --profile (or --profile=allocations, --trace=PATH) for a report of where the time goes
+profiler = profiler_from_argv(sys.argv)
+
 # Variable setup: we use numpy's array to create a more concise implementation
 alpha = 0.1
 weights = nmpy.array([0.5, 0.5, 0.5])
@@ -17,24 +31,71 @@ inputs = nmpy.array([[0,0,1],
 
 expected_values = nmpy.array([0,1,1,1,0,0,0,1])
 
+# Run with --csv=PATH (a numeric CSV file with a header, the expected value in the
+# last column) or --npy=INPUTS,EXPECTED (two .npy files) to train on data streamed
+# from disk instead, with 3 inputs like the ones above. Only one chunk of the file is
+# in memory at a time, and the next one is read on a background thread while we
+# train. Run with --shuffle to see the examples in a different order every run.
+csv_path = next((argument.split('=', 1)[1] for argument in sys.argv if argument.startswith('--csv=')), None)
+npy_paths = next((argument.split('=', 1)[1] for argument in sys.argv if argument.startswith('--npy=')), None)
+shuffle = '--shuffle' in sys.argv
+rng = nmpy.random.RandomState(0)
+
+if csv_path:
+    data_source = CsvSource(csv_path)
+elif npy_paths:
+    data_source = MemmapSource(*npy_paths.split(','))
+else:
+    data_source = ArraySource(inputs, expected_values)
+
+# Floating point operations per example, for the profiler: the dot product, and
+# scaling the inputs by the error and alpha before subtracting them
+forward_flops = 2 * len(weights)
+update_flops = 4 * len(weights)
+
+def unbatched(data_source, shuffle, rng):
+    # One (input_set, expected_value) pair at a time, from batches of one example
+    for input_batch, expected_batch in data_source.batches(batch_size=1, shuffle=shuffle, rng=rng):
+        yield input_batch[0], expected_batch[0]
+
+profiler.start()
 # Let's run the optimization for every input 15 times
 for run in range(15):
     # This is the total error of a single run
     error_for_run = 0
+    examples_in_run = 0
     # Now we apply gradient descent to every pair of inputs/expected values
-    for input_set, expected_value in zip(inputs, expected_values):
+    for input_set, expected_value in prefetch(unbatched(data_source, shuffle, rng)):
+        profiler.lap('data')
 
         # We can calculate our predicted value with a simple dot product operation, neat!
         predicted_value = round( input_set.dot(weights), 1)
-        print("Our network predicted {} for the inputs {}".format(predicted_value, input_set))
+        profiler.lap('forward', forward_flops)
+        if not quiet:
+            print("Our network predicted {} for the inputs {}".format(predicted_value, input_set))
+            profiler.lap('print')
 
         # Error calculation is the same as before, but with numpy magic!
         error = (predicted_value - expected_value) ** 2
         error_for_run += error
+        examples_in_run += 1
+        profiler.lap('loss', 3)
 
         # With the magic of numpy, updating weights is this easy!
         weights -= alpha * (input_set * (predicted_value - expected_value) )
+        profiler.lap('update', update_flops)
+
+    profiler.step(examples_in_run)
+    metrics.record(run, error=error_for_run)
+    if not quiet:
+        print("The accumulated error for this run is {} \n\n\n".format(error_for_run))
+    profiler.lap('metrics')
+
+if quiet:
+    print("The accumulated error for the last run is {}".format(metrics.latest()[1]['error']))
 
-    print("The accumulated error for this run is {} \n\n\n".format(error_for_run))
+if profiler.enabled:
+    print(profiler.report())
+    profiler.close()
 
 # TODO: Round the predicted value, and remove the weights print statement, and maybe, remove the weights rounding
\ No newline at end of file
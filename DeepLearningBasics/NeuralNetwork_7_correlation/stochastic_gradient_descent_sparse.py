@@ -0,0 +1,35 @@
+import os
+import sys
+
+import numpy as nmpy
+
+# The shared helpers live in DeepLearningBasics/nn_toolkit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from nn_toolkit import SparseLinearSGD, SparseRows
+
+# Same data and update rule as stochastic_gradient_descent.py, but every input_set
+# only keeps its non-zero entries. Here it makes no difference, with thousands of
+# one-hot columns per row it is what makes training fast.
+alpha = 0.1
+weights = nmpy.array([0.5, 0.5, 0.5])
+
+inputs = nmpy.array([[0,0,1],
+                     [0,1,0],
+                     [1,1,1],
+                     [0,1,1],
+                     [1,0,0],
+                     [1,0,1],
+                     [0,0,0],
+                     [1,1,0]
+                    ])
+
+expected_values = nmpy.array([0,1,1,1,0,0,0,1])
+
+sparse_inputs = SparseRows.from_dense(inputs)
+model = SparseLinearSGD(weights, alpha)
+
+for run in range(15):
+    error_for_run = model.train_epoch(sparse_inputs, expected_values)
+    print("The accumulated error for run {} is {}".format(run, error_for_run))
+
+print("The final weights are {}".format(model.weights))
@@ -1,5 +1,23 @@
+import os
+import sys
+
 import numpy as nmpy
 
+# The shared helpers live in DeepLearningBasics/nn_toolkit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from nn_toolkit import RingBufferSink, StoppingPolicy, load_checkpoint, profiler_from_argv, save_checkpoint
+
+# Run with --quiet to skip the prints, the metrics are then kept in memory instead
+quiet = '--quiet' in sys.argv
+metrics = RingBufferSink()
+
+# Run with --checkpoint=PATH to resume from PATH (when it exists) and save the weights there
+checkpoint_path = next((argument.split('=', 1)[1] for argument in sys.argv
+                        if argument.startswith('--checkpoint=')), None)
+
+# Run with --profile (or --profile=allocations, --trace=PATH) for a report of where the time goes
+profiler = profiler_from_argv(sys.argv)
+
 # These methods run over numpy arrays
 def relu(x):
     return (x > 0) * x
@@ -13,6 +31,14 @@ hidden_layer_number_of_nodes = 4
 
 weights_1 = nmpy.random.random((3 ,hidden_layer_number_of_nodes))
 weights_2 = nmpy.random.random((hidden_layer_number_of_nodes))
+run = 0
+
+if checkpoint_path and os.path.exists(checkpoint_path):
+    # The checkpoint is mapped copy-on-write, so we can keep training on it in place
+    saved_weights, saved_metadata = load_checkpoint(checkpoint_path, writable=True)
+    weights_1, weights_2 = saved_weights['weights_1'], saved_weights['weights_2']
+    run = saved_metadata['run']
+    print("Resuming from {} after {} runs".format(checkpoint_path, run))
 
 inputs = nmpy.array([[1,1,1],
                      [1,1,0],
@@ -22,33 +48,64 @@ inputs = nmpy.array([[1,1,1],
 
 expected_values = nmpy.array([1,0,1,0])
 
-run = 0
+# Some random initial weights never reach an error of 0, so we also give up
+# when the error hasn't improved in 500 runs or after 10000 runs
+stopping = StoppingPolicy(tolerance=0, patience=500, max_iterations=10000)
+# A resumed run only gets the iterations the checkpointed one had left
+stopping.reset(iteration=run)
+
+# Floating point operations per example, for the profiler: the two dot products and
+# the relu; the two deltas; and scaling and subtracting both weight updates
+number_of_inputs = inputs.shape[1]
+forward_flops = 2 * number_of_inputs * hidden_layer_number_of_nodes + 3 * hidden_layer_number_of_nodes
+backward_flops = 2 * hidden_layer_number_of_nodes
+update_flops = 3 * hidden_layer_number_of_nodes + 3 * number_of_inputs * hidden_layer_number_of_nodes
+
+profiler.start()
 while True:
     overall_run_error = 0
 
     for input_set, expected_value in zip(inputs, expected_values):
+        profiler.lap('data')
         # These are the outputs of the intermediate layer (the one with 4 nodes)
         hidden_outputs = relu( nmpy.dot(input_set, weights_1) )
         # This is the final output, this concludes the prediction process
         predicted_value = round(nmpy.dot(hidden_outputs, weights_2), 1)
+        profiler.lap('forward', forward_flops)
 
         # Now, we calculate the deltas and update the weights using
         # the logic we previously described
         layer2_delta = (predicted_value - expected_value)
+        # We calculate an accumulated error for every run
+        overall_run_error += nmpy.sum((predicted_value-expected_value) ** 2)
+        profiler.lap('loss', 3)
+
         # relu_deriv makes sure we only update nodes with output > 0
         layer1_delta = (weights_2 * layer2_delta) * relu_deriv(hidden_outputs)
+        profiler.lap('backward', backward_flops)
 
         weights_2 -= alpha * hidden_outputs.dot(layer2_delta)
         weights_1 -= alpha * nmpy.outer(input_set, layer1_delta)
-
-        # We calculate an accumulated error for every run
-        overall_run_error += nmpy.sum((predicted_value-expected_value) ** 2)
+        profiler.lap('update', update_flops)
 
     run += 1
+    profiler.step(len(inputs))
+    metrics.record(run, error=overall_run_error)
     ## Let's print some debug data
-    print("The weights in the final layer are: \n{}".format(weights_2) )
-    print("The weights in the first layer are: \n{}".format(weights_1) )
-    print("The overall error for the run {} is {}\n\n".format(run, overall_run_error))
+    if not quiet:
+        print("The weights in the final layer are: \n{}".format(weights_2) )
+        print("The weights in the first layer are: \n{}".format(weights_1) )
+        print("The overall error for the run {} is {}\n\n".format(run, overall_run_error))
+    profiler.lap('metrics')
 
-    if overall_run_error == 0:
+    if stopping.should_stop(overall_run_error):
         break
+
+print(stopping.summary())
+
+if profiler.enabled:
+    print(profiler.report())
+    profiler.close()
+
+if checkpoint_path:
+    save_checkpoint(checkpoint_path, {'weights_1': weights_1, 'weights_2': weights_2}, {'run': run})
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import numpy as nmpy
+
+# The reusable trainer lives in DeepLearningBasics/nn_toolkit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from nn_toolkit import TwoLayerNetwork
+
+# Same data as two_layer_network.py
+inputs = nmpy.array([[1,1,1],
+                     [1,1,0],
+                     [0,1,0],
+                     [0,1,1]
+                    ])
+
+expected_values = nmpy.array([1,0,1,0])
+
+# batch_size=1 is the per-sample update of two_layer_network.py,
+# batch_size=len(inputs) runs every epoch as a single full-batch step
+network = TwoLayerNetwork(number_of_inputs=3, hidden_layer_number_of_nodes=4, alpha=0.1)
+
+run = 0
+while True:
+    overall_run_error = network.train_epoch(inputs, expected_values, batch_size=1)
+
+    run += 1
+    print("The overall error for the run {} is {}".format(run, overall_run_error))
+
+    if overall_run_error == 0 or run == 1000:
+        break
+
+print("The weights in the final layer are: \n{}".format(network.weights_2))
+print("The weights in the first layer are: \n{}".format(network.weights_1))
+print("Predictions for the training inputs: {}".format(network.predict(inputs)))
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import numpy as nmpy
+
+# The shared helpers live in DeepLearningBasics/nn_toolkit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from nn_toolkit import TwoLayerNetwork, TwoLayerPredictor, format_report, precision_report
+
+# Trains the network of two_layer_network.py (with more hidden nodes), then checks
+# how much its predictions change when the weights are served as float32 or int8.
+inputs = nmpy.array([[1,1,1],
+                     [1,1,0],
+                     [0,1,0],
+                     [0,1,1]
+                    ])
+
+expected_values = nmpy.array([1,0,1,0])
+
+network = TwoLayerNetwork(3, hidden_layer_number_of_nodes=32, alpha=0.02, rng=nmpy.random.RandomState(0))
+network.fit(inputs, expected_values, epochs=500)
+
+# Held-out inputs: noisy versions of the training inputs, with the same labels
+rng = nmpy.random.RandomState(1)
+rows = rng.randint(len(inputs), size=10000)
+held_out_inputs = inputs[rows] + rng.normal(0, 0.1, (len(rows), 3))
+held_out_expected_values = expected_values[rows]
+
+predictor = TwoLayerPredictor(network.weights_1, network.weights_2)
+print(format_report(precision_report(predictor, held_out_inputs, held_out_expected_values)))
@@ -0,0 +1,27 @@
+import os
+import sys
+
+# The shared helpers live in DeepLearningBasics/nn_toolkit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from nn_toolkit import TwoLayerTrainer, grid_search, results_table, run_sweep, save_results
+
+# Instead of editing alpha and hidden_layer_number_of_nodes in two_layer_network.py
+# and running it again, try every combination at once, on all the cores.
+# Run with --results=PATH to also save the table as CSV.
+results_path = next((argument.split('=', 1)[1] for argument in sys.argv
+                     if argument.startswith('--results=')), None)
+
+space = {
+    'alpha': [0.001, 0.01, 0.03, 0.1, 0.3, 1, 3],
+    'hidden_layer_number_of_nodes': [2, 4, 8, 16],
+    'seed': [0, 1, 2],
+}
+
+if __name__ == '__main__':
+    # Same stopping rules as two_layer_network.py, for every trial
+    trials = run_sweep(TwoLayerTrainer, grid_search(space), max_iterations=10000, max_seconds=10,
+                       min_iterations=50, patience=500)
+    print(results_table(trials))
+
+    if results_path:
+        save_results(trials, results_path)
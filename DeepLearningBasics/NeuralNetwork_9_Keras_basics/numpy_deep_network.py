@@ -0,0 +1,33 @@
+import os
+import sys
+
+import numpy as nmpy
+
+# The shared helpers live in DeepLearningBasics/nn_toolkit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from nn_toolkit import Adam, DeepNetwork
+
+# The model of Keras_DL_Tutorial.ipynb (Dense 512, 216, 128, 64, 32, 16 with relu,
+# then Dense(10, softmax), trained with adam on batches of 15), written with NumPy only.
+# Instead of downloading MNIST, the images are synthetic: every class has its own
+# 28x28 pattern, and every image is its class' pattern plus noise.
+rng = nmpy.random.RandomState(0)
+patterns = rng.rand(10, 28 * 28)
+
+
+def images(number_of_images):
+    labels = rng.randint(10, size=number_of_images)
+    pixels = patterns[labels] + rng.normal(0, 0.5, (number_of_images, 28 * 28))
+    return nmpy.clip(pixels, 0, 1).astype(nmpy.float32), labels
+
+
+x_train, y_train = images(6000)
+x_test, y_test = images(1000)
+
+network = DeepNetwork([28 * 28, 512, 216, 128, 64, 32, 16, 10], output='softmax',
+                      optimizer=Adam(0.001), dtype=nmpy.float32, rng=rng)
+
+for epoch in range(1, 4):
+    loss = network.train_epoch(x_train, y_train, batch_size=15, shuffle=True, rng=rng)
+    print("Epoch {}: loss {:.4f}, test accuracy {:.3f}".format(
+        epoch, loss / len(x_train), network.accuracy(x_test, y_test)))
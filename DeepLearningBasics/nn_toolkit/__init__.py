@@ -0,0 +1,22 @@
+# Reusable building blocks for the DeepLearningBasics examples.
+#
+# The numbered NeuralNetwork_* folders are meant to be read top to bottom, so they
+# keep everything inline. The code in this package is the same math, written so it
+# can be imported and run over large amounts of data.
+from .two_layer import TwoLayerNetwork, relu, relu_deriv
+from .dense import Dense, dot_product, multi_input_multi_output_neural_network
+from .data_sources import ArraySource, CsvSource, MemmapSource, prefetch
+from .metrics import FileSink, NullSink, PrintSink, RingBufferSink, SampledSink
+from .stopping import StoppingPolicy
+from .parallel import DataParallelTrainer, LinearModel, TwoLayerModel
+from .serving import InferenceServer, LinearPredictor, MicroBatcher, TwoLayerPredictor, load_predictor
+from .checkpoint import load_checkpoint, save_checkpoint
+from .inplace import MatrixUpdates, MultiOutputUpdates, SingleOutputUpdates, as_weights
+from .sweep import SingleWeightTrainer, TwoLayerTrainer, grid_search, log_uniform, random_search, results_table, run_sweep, save_results
+from .ensemble import TwoLayerEnsemble
+from .quantization import ReducedLinearPredictor, ReducedTwoLayerPredictor, format_report, precision_report, reduce_precision
+from .sparse import SparseLinearSGD, SparseRows
+from .least_squares import NormalEquations, least_squares_weights
+from .optimizers import Adam, ExponentialDecay, GradientDescent, InverseTimeDecay, Momentum, Nesterov, RMSProp, StepDecay
+from .deep import DeepNetwork
+from .profiling import NullProfiler, Profiler, profiler_from_argv
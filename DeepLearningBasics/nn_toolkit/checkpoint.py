@@ -0,0 +1,75 @@
+import json
+import mmap
+import os
+import struct
+
+import numpy as nmpy
+
+# Checkpoint layout:
+#   8 bytes   magic, b'NNCKPT01'
+#   4 bytes   length of the JSON header, little-endian uint32
+#   n bytes   JSON header: {"arrays": [{"name", "dtype", "shape", "offset"}], "metadata": {...}}
+#   ...       raw C-ordered array data, every array starting on an ALIGNMENT boundary
+# Loading only parses the small header. The arrays are views on a memory map of
+# the file, so nothing is copied and every process that loads the same checkpoint
+# shares the same page-cached pages.
+MAGIC = b'NNCKPT01'
+ALIGNMENT = 64
+PREFIX = struct.Struct('<8sI')
+
+
+def align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def save_checkpoint(path, arrays, metadata=None):
+    # `arrays` maps names to anything nmpy.asarray accepts, nested lists included
+    arrays = {name: nmpy.ascontiguousarray(array) for name, array in arrays.items()}
+
+    # The offsets depend on the header size, and the header contains the offsets,
+    # so we grow the reserved header space until everything fits
+    header_space = ALIGNMENT
+    while True:
+        offset = align(PREFIX.size + header_space)
+        entries = []
+        for name, array in arrays.items():
+            entries.append({'name': name, 'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset})
+            offset = align(offset + array.nbytes)
+
+        header = json.dumps({'arrays': entries, 'metadata': metadata or {}}).encode()
+        if len(header) <= header_space:
+            break
+        header_space = align(len(header))
+
+    # Write to a temporary file and rename it, so readers never see half a checkpoint
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as checkpoint_file:
+        checkpoint_file.write(PREFIX.pack(MAGIC, len(header)))
+        checkpoint_file.write(header)
+        for entry, array in zip(entries, arrays.values()):
+            checkpoint_file.seek(entry['offset'])
+            checkpoint_file.write(array.data)
+        checkpoint_file.truncate(max(offset, PREFIX.size + header_space))
+    os.replace(temporary_path, path)
+
+
+def load_checkpoint(path, writable=False):
+    # Returns (arrays, metadata). With writable=False the arrays are read-only views
+    # of the shared mapping. writable=True maps the file copy-on-write: the arrays
+    # can be updated in place (to resume training) without touching the file.
+    with open(path, 'rb') as checkpoint_file:
+        mapping = mmap.mmap(checkpoint_file.fileno(), 0,
+                            access=mmap.ACCESS_COPY if writable else mmap.ACCESS_READ)
+
+    magic, header_length = PREFIX.unpack_from(mapping, 0)
+    if magic != MAGIC:
+        raise ValueError("{} is not a checkpoint file".format(path))
+    header = json.loads(mapping[PREFIX.size:PREFIX.size + header_length])
+
+    arrays = {}
+    for entry in header['arrays']:
+        dtype = nmpy.dtype(entry['dtype'])
+        count = int(nmpy.prod(entry['shape']))
+        arrays[entry['name']] = nmpy.frombuffer(mapping, dtype, count, entry['offset']).reshape(entry['shape'])
+
+    return arrays, header['metadata']
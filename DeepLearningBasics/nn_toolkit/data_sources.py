@@ -0,0 +1,170 @@
+import itertools
+import queue
+import threading
+
+import numpy as nmpy
+
+
+# Data sources hand out (input_batch, expected_batch) pairs without needing the whole
+# dataset in memory. Only one chunk of `chunk_rows` rows is materialized at a time,
+# so memory stays bounded no matter how big the files are.
+
+class ArraySource:
+    # In-memory arrays, handy for the small examples and for tests against the others
+    def __init__(self, inputs, expected_values, chunk_rows=65536):
+        self.inputs = inputs
+        self.expected_values = expected_values
+        self.chunk_rows = chunk_rows
+        assert( len(self.inputs) == len(self.expected_values) )
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def chunks(self, shuffle=False, rng=None):
+        # Shuffling works on whole chunks first (cheap seeks on disk), then on the
+        # rows inside every chunk, so each epoch sees a different order
+        number_of_rows = len(self)
+        chunk_starts = nmpy.arange(0, number_of_rows, self.chunk_rows)
+        if shuffle:
+            (rng or nmpy.random).shuffle(chunk_starts)
+
+        for start in chunk_starts:
+            end = min(start + self.chunk_rows, number_of_rows)
+            yield (nmpy.asarray(self.inputs[start:end], dtype=float),
+                   nmpy.asarray(self.expected_values[start:end], dtype=float))
+
+    def batches(self, batch_size=1, shuffle=False, rng=None):
+        return batches_from_chunks(self.chunks(shuffle, rng), batch_size, shuffle, rng)
+
+
+class MemmapSource(ArraySource):
+    # Reads .npy files (np.save) or raw binary files (np.memmap) without loading them
+    def __init__(self, inputs_path, expected_values_path, chunk_rows=65536,
+                 dtype=None, number_of_inputs=None):
+        super().__init__(open_memmap(inputs_path, dtype, number_of_inputs),
+                         open_memmap(expected_values_path, dtype),
+                         chunk_rows)
+
+
+class CsvSource:
+    # Streams a numeric CSV file where one column holds the expected value. CSV files
+    # can't be read at random positions, so shuffling goes through a buffer of
+    # `shuffle_chunks` chunks: every chunk read is mixed with the rows left from the
+    # previous ones and a random chunk of them goes out, so rows move across chunks.
+    def __init__(self, path, target_column=-1, chunk_rows=65536, delimiter=',', skip_header=True,
+                 shuffle_chunks=4):
+        self.path = path
+        self.target_column = target_column
+        self.chunk_rows = chunk_rows
+        self.delimiter = delimiter
+        self.skip_header = skip_header
+        self.shuffle_chunks = shuffle_chunks
+
+    def file_chunks(self):
+        # The chunks in file order
+        with open(self.path) as csv_file:
+            if self.skip_header:
+                next(csv_file, None)
+
+            while True:
+                lines = list(itertools.islice(csv_file, self.chunk_rows))
+                if not lines:
+                    break
+
+                rows = nmpy.loadtxt(lines, delimiter=self.delimiter, ndmin=2)
+                expected_values = rows[:, self.target_column]
+                inputs = nmpy.delete(rows, self.target_column, axis=1)
+                yield inputs, expected_values
+
+    def chunks(self, shuffle=False, rng=None):
+        if not shuffle:
+            yield from self.file_chunks()
+            return
+
+        rng = rng or nmpy.random
+        buffered_inputs, buffered_values = None, None
+        for inputs, expected_values in self.file_chunks():
+            if buffered_inputs is None:
+                buffered_inputs, buffered_values = inputs, expected_values
+            else:
+                buffered_inputs = nmpy.concatenate([buffered_inputs, inputs])
+                buffered_values = nmpy.concatenate([buffered_values, expected_values])
+
+            if len(buffered_inputs) >= self.shuffle_chunks * self.chunk_rows:
+                order = rng.permutation(len(buffered_inputs))
+                chunk_rows, kept_rows = order[:self.chunk_rows], order[self.chunk_rows:]
+                yield buffered_inputs[chunk_rows], buffered_values[chunk_rows]
+                buffered_inputs, buffered_values = buffered_inputs[kept_rows], buffered_values[kept_rows]
+
+        # The end of the file: what is left in the buffer, in random order
+        if buffered_inputs is not None:
+            order = rng.permutation(len(buffered_inputs))
+            for start in range(0, len(order), self.chunk_rows):
+                chunk_rows = order[start:start + self.chunk_rows]
+                yield buffered_inputs[chunk_rows], buffered_values[chunk_rows]
+
+    def batches(self, batch_size=1, shuffle=False, rng=None):
+        return batches_from_chunks(self.chunks(shuffle, rng), batch_size, shuffle, rng)
+
+
+def open_memmap(path, dtype=None, number_of_columns=None):
+    if path.endswith('.npy'):
+        return nmpy.load(path, mmap_mode='r')
+
+    # Raw files carry no header, so the caller has to tell us how to read them
+    data = nmpy.memmap(path, dtype=dtype or nmpy.float64, mode='r')
+    if number_of_columns is not None:
+        data = data.reshape(-1, number_of_columns)
+
+    return data
+
+
+def batches_from_chunks(chunks, batch_size=1, shuffle=False, rng=None):
+    for inputs, expected_values in chunks:
+        order = nmpy.arange(len(inputs))
+        if shuffle:
+            (rng or nmpy.random).shuffle(order)
+
+        for start in range(0, len(order), batch_size):
+            batch_rows = order[start:start + batch_size]
+            yield inputs[batch_rows], expected_values[batch_rows]
+
+
+def prefetch(iterable, depth=2):
+    # Runs `iterable` on a background thread, keeping at most `depth` items ready.
+    # Reading and parsing the next chunk then overlaps with training on the current one.
+    end_of_data = object()
+    ready_items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                ready_items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def producer():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except Exception as error:
+            put(error)
+            return
+        put(end_of_data)
+
+    worker = threading.Thread(target=producer, daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = ready_items.get()
+            if item is end_of_data:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
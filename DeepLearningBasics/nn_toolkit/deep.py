@@ -0,0 +1,162 @@
+import numpy as nmpy
+
+# A fully connected network with any number of relu layers, like the Keras model of
+# NeuralNetwork_9_Keras_basics (Dense(512) -> ... -> Dense(16) -> Dense(10, softmax)),
+# in plain NumPy. The output layer is linear with a squared error (like
+# two_layer_network.py) or softmax with a cross-entropy on integer labels.
+#
+# Every array a training step needs (activations, deltas, gradients, relu masks) is
+# allocated once per batch size in a Workspace, and every operation writes into
+# those arrays with out=, so in steady state a training step allocates nothing.
+
+
+class Workspace:
+    # The buffers of one batch size. activations[0] holds the inputs, deltas[l] the
+    # error at activations[l], masks[l] which units of layer l were off.
+    def __init__(self, layer_sizes, batch_size, dtype):
+        self.batch_size = batch_size
+        self.activations = [nmpy.zeros((batch_size, size), dtype=dtype) for size in layer_sizes]
+        self.deltas = [nmpy.zeros((batch_size, size), dtype=dtype) for size in layer_sizes]
+        self.masks = [nmpy.zeros((batch_size, size), dtype=bool) for size in layer_sizes]
+        self.weight_gradients = [nmpy.zeros((inputs, outputs), dtype=dtype)
+                                 for inputs, outputs in zip(layer_sizes[:-1], layer_sizes[1:])]
+        self.bias_gradients = [nmpy.zeros(outputs, dtype=dtype) for outputs in layer_sizes[1:]]
+
+        # For the softmax: one value per row, and the flat position of every label
+        self.row_values = nmpy.zeros((batch_size, 1), dtype=dtype)
+        self.label_values = nmpy.zeros(batch_size, dtype=dtype)
+        self.row_offsets = nmpy.arange(batch_size) * layer_sizes[-1]
+        self.label_positions = nmpy.zeros(batch_size, dtype=nmpy.intp)
+
+
+class DeepNetwork:
+    def __init__(self, layer_sizes, output='linear', alpha=0.01, optimizer=None,
+                 dtype=nmpy.float64, rng=None):
+        assert( output in ('linear', 'softmax') )
+        random = rng or nmpy.random
+        self.layer_sizes = list(layer_sizes)
+        self.output = output
+        self.alpha = alpha
+        # An optimizer from optimizers.py replaces the plain `weights -= alpha * gradient`
+        self.optimizer = optimizer
+        self.dtype = dtype
+
+        # He initialization, so the signal keeps its size through many relu layers
+        self.weights = [(random.normal(size=(inputs, outputs)) * nmpy.sqrt(2 / inputs)).astype(dtype)
+                        for inputs, outputs in zip(self.layer_sizes[:-1], self.layer_sizes[1:])]
+        self.biases = [nmpy.zeros(outputs, dtype=dtype) for outputs in self.layer_sizes[1:]]
+        self.workspaces = {}
+
+    def workspace(self, batch_size):
+        if batch_size not in self.workspaces:
+            self.workspaces[batch_size] = Workspace(self.layer_sizes, batch_size, self.dtype)
+        return self.workspaces[batch_size]
+
+    def forward(self, input_batch):
+        # Returns the workspace; its last activations are the outputs. They are
+        # overwritten by the next call with the same batch size.
+        workspace = self.workspace(len(input_batch))
+        activations = workspace.activations
+        nmpy.copyto(activations[0], input_batch)
+
+        last_layer = len(self.weights) - 1
+        for layer, (weights, biases) in enumerate(zip(self.weights, self.biases)):
+            # `outputs += biases` would make NumPy allocate a buffer to broadcast the
+            # biases; copyto broadcasts without one. The deltas aren't in use yet, so
+            # they hold the product meanwhile.
+            outputs, product = activations[layer + 1], workspace.deltas[layer + 1]
+            nmpy.matmul(activations[layer], weights, out=product)
+            nmpy.copyto(outputs, biases)
+            outputs += product
+            if layer < last_layer:
+                nmpy.maximum(outputs, 0, out=outputs)
+
+        if self.output == 'softmax':
+            # The per-row values are spread over the whole row with copyto too
+            outputs, row_values, spread = activations[-1], workspace.row_values, workspace.deltas[-1]
+            nmpy.max(outputs, axis=1, keepdims=True, out=row_values)
+            nmpy.copyto(spread, row_values)
+            outputs -= spread
+            nmpy.exp(outputs, out=outputs)
+            nmpy.sum(outputs, axis=1, keepdims=True, out=row_values)
+            nmpy.copyto(spread, row_values)
+            outputs /= spread
+
+        return workspace
+
+    def output_delta(self, workspace, expected_batch):
+        # The gradient of the loss at the outputs, into deltas[-1]. Returns the loss.
+        outputs, delta = workspace.activations[-1], workspace.deltas[-1]
+
+        if self.output == 'linear':
+            nmpy.subtract(outputs, expected_batch.reshape(outputs.shape), out=delta)
+            flat_delta = delta.reshape(-1)
+            return float(flat_delta.dot(flat_delta))
+
+        # Softmax with cross-entropy: the delta is the probabilities, minus 1 at the label
+        positions, label_values = workspace.label_positions, workspace.label_values
+        nmpy.add(workspace.row_offsets, expected_batch, out=positions)
+        nmpy.copyto(delta, outputs)
+        nmpy.take(outputs.reshape(-1), positions, out=label_values)
+        nmpy.subtract(label_values, 1, out=label_values)
+        nmpy.put(delta.reshape(-1), positions, label_values)
+
+        nmpy.take(outputs.reshape(-1), positions, out=label_values)
+        nmpy.log(label_values, out=label_values)
+        return -float(label_values.sum())
+
+    def train_batch(self, input_batch, expected_batch):
+        # One gradient step on the mean loss of the batch. Returns the summed loss.
+        workspace = self.forward(input_batch)
+        loss = self.output_delta(workspace, expected_batch)
+        scale = 1 / len(input_batch)
+
+        for layer in reversed(range(len(self.weights))):
+            delta = workspace.deltas[layer + 1]
+            weight_gradient, bias_gradient = workspace.weight_gradients[layer], workspace.bias_gradients[layer]
+            nmpy.matmul(workspace.activations[layer].T, delta, out=weight_gradient)
+            weight_gradient *= scale
+            nmpy.sum(delta, axis=0, out=bias_gradient)
+            bias_gradient *= scale
+
+            # The delta of the layer below goes through the weights before they change,
+            # and only reaches the units the relu let through. Multiplying by the
+            # boolean mask would cast it in a temporary buffer; copyto doesn't.
+            if layer > 0:
+                nmpy.matmul(delta, self.weights[layer].T, out=workspace.deltas[layer])
+                nmpy.less_equal(workspace.activations[layer], 0, out=workspace.masks[layer])
+                nmpy.copyto(workspace.deltas[layer], 0, where=workspace.masks[layer])
+
+            self.update(self.weights[layer], weight_gradient, ('weights', layer))
+            self.update(self.biases[layer], bias_gradient, ('biases', layer))
+
+        return loss
+
+    def update(self, parameters, gradient, slot):
+        if self.optimizer is not None:
+            self.optimizer.step(parameters, gradient, slot)
+        else:
+            gradient *= self.alpha
+            parameters -= gradient
+
+    def train_epoch(self, inputs, expected_values, batch_size=32, shuffle=False, rng=None):
+        # Batches are slices of the data (views, no copies). Shuffling reorders the
+        # data once per epoch instead.
+        if shuffle:
+            order = (rng or nmpy.random).permutation(len(inputs))
+            inputs, expected_values = inputs[order], expected_values[order]
+
+        loss = 0
+        for start in range(0, len(inputs), batch_size):
+            loss += self.train_batch(inputs[start:start + batch_size], expected_values[start:start + batch_size])
+
+        return loss
+
+    def predict(self, inputs, batch_size=1024):
+        # Outputs for every row (a copy, unlike forward), probabilities for softmax
+        inputs = nmpy.atleast_2d(inputs)
+        return nmpy.concatenate([self.forward(inputs[start:start + batch_size]).activations[-1].copy()
+                                 for start in range(0, len(inputs), batch_size)])
+
+    def accuracy(self, inputs, labels):
+        return nmpy.mean(nmpy.argmax(self.predict(inputs), axis=1) == labels)
@@ -0,0 +1,57 @@
+import numpy as nmpy
+
+
+# Vector version of the dot_product helper used across NeuralNetwork_2 and NeuralNetwork_6
+def dot_product(first_vector, second_vector):
+    # Remember you can only use dot product on vectors with the same size
+    assert( len(first_vector) == len(second_vector))
+
+    return nmpy.dot(first_vector, second_vector)
+
+
+class Dense:
+    # A fully connected layer without activation. weights has one row per output
+    # (the same layout as all_weights in multi_input_multi_output.py) and is stored
+    # as a single contiguous float buffer, so a whole layer is one BLAS call.
+    def __init__(self, weights, dtype=nmpy.float64, decimals=None):
+        self.weights = nmpy.ascontiguousarray(weights, dtype=dtype)
+        assert( self.weights.ndim == 2 )
+        # NeuralNetwork_6 rounds every estimate to 2 decimals, None keeps full precision
+        self.decimals = decimals
+
+    @classmethod
+    def random(cls, number_of_inputs, number_of_outputs, dtype=nmpy.float64, rng=None):
+        random = rng or nmpy.random
+        return cls(random.random((number_of_outputs, number_of_inputs)), dtype=dtype)
+
+    @property
+    def number_of_inputs(self):
+        return self.weights.shape[1]
+
+    @property
+    def number_of_outputs(self):
+        return self.weights.shape[0]
+
+    def forward(self, inputs):
+        inputs = nmpy.asarray(inputs, dtype=self.weights.dtype)
+        assert( inputs.shape[-1] == self.number_of_inputs )
+
+        # A single input vector is a matrix-vector product, a (batch, inputs)
+        # matrix gives a (batch, outputs) matrix with one matrix-matrix product
+        if inputs.ndim == 1:
+            estimates = self.weights.dot(inputs)
+        else:
+            estimates = inputs.dot(self.weights.T)
+
+        if self.decimals is not None:
+            estimates = nmpy.round(estimates, self.decimals)
+
+        return estimates
+
+    def __call__(self, inputs):
+        return self.forward(inputs)
+
+
+def multi_input_multi_output_neural_network(inputs, weights, decimals=None):
+    # Drop-in replacement for the per-row loop of the NeuralNetwork_2/NeuralNetwork_6 scripts
+    return Dense(weights, decimals=decimals).forward(inputs)
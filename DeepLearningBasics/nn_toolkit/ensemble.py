@@ -0,0 +1,106 @@
+import numpy as nmpy
+
+from .stopping import StoppingPolicy
+from .two_layer import iterate_minibatches, relu, relu_deriv
+
+
+class TwoLayerEnsemble:
+    # M independent TwoLayerNetworks trained together. The weights of all the models
+    # are stacked into (M, inputs, hidden) and (M, hidden) arrays, so every pass is a
+    # handful of batched matmul/einsum calls for all M models instead of M small ones.
+    #
+    # Model m with seeds=[..., s, ...] starts from the same weights as
+    # TwoLayerNetwork(rng=nmpy.random.RandomState(s)) and follows the same updates.
+    def __init__(self, number_of_models, number_of_inputs, hidden_layer_number_of_nodes=4, alpha=0.1,
+                 decimals=1, weights_1=None, weights_2=None, seeds=None):
+        self.alpha = alpha
+        self.decimals = decimals
+
+        if weights_1 is None or weights_2 is None:
+            seeds = range(number_of_models) if seeds is None else seeds
+            random_states = [nmpy.random.RandomState(seed) for seed in seeds]
+            # Drawn in the same order as TwoLayerNetwork: first layer, then second layer
+            weights = [(random.random((number_of_inputs, hidden_layer_number_of_nodes)),
+                        random.random((hidden_layer_number_of_nodes))) for random in random_states]
+            weights_1 = [layer_1 for layer_1, _ in weights]
+            weights_2 = [layer_2 for _, layer_2 in weights]
+
+        self.weights_1 = nmpy.array(weights_1, dtype=float)
+        self.weights_2 = nmpy.array(weights_2, dtype=float)
+        assert( self.weights_1.shape == (number_of_models, number_of_inputs, hidden_layer_number_of_nodes) )
+
+        # Models that stopped keep their weights, the others go on training
+        self.active = nmpy.ones(number_of_models, dtype=bool)
+        self.stopping = None
+
+    @property
+    def number_of_models(self):
+        return len(self.weights_1)
+
+    def forward(self, input_batch):
+        # (batch, inputs) -> (M, batch, hidden) and (M, batch)
+        hidden_outputs = relu(nmpy.matmul(input_batch, self.weights_1))
+        predicted_values = nmpy.einsum('mbh,mh->mb', hidden_outputs, self.weights_2)
+        if self.decimals is not None:
+            predicted_values = nmpy.round(predicted_values, self.decimals)
+
+        return hidden_outputs, predicted_values
+
+    def train_batch(self, input_batch, expected_batch):
+        # Same math as TwoLayerNetwork.train_batch, with one more axis for the models.
+        # Returns the error of every model on this batch.
+        hidden_outputs, predicted_values = self.forward(input_batch)
+
+        layer2_delta = predicted_values - expected_batch
+        layer1_delta = layer2_delta[:, :, None] * self.weights_2[:, None, :] * relu_deriv(hidden_outputs)
+
+        # Stopped models get a step of 0
+        step = (self.alpha / len(input_batch)) * self.active
+        self.weights_2 -= step[:, None] * nmpy.einsum('mbh,mb->mh', hidden_outputs, layer2_delta)
+        self.weights_1 -= step[:, None, None] * nmpy.einsum('bi,mbh->mih', input_batch, layer1_delta)
+
+        return nmpy.sum(layer2_delta ** 2, axis=1)
+
+    def train_epoch(self, inputs, expected_values, batch_size=1, shuffle=False, rng=None):
+        inputs = nmpy.asarray(inputs, dtype=float)
+        expected_values = nmpy.asarray(expected_values, dtype=float)
+
+        overall_run_errors = nmpy.zeros(self.number_of_models)
+        for input_batch, expected_batch in iterate_minibatches(inputs, expected_values,
+                                                               batch_size, shuffle, rng):
+            overall_run_errors += self.train_batch(input_batch, expected_batch)
+
+        return overall_run_errors
+
+    def fit(self, inputs, expected_values, batch_size=1, stopping=None, shuffle=False, rng=None):
+        # Trains until every model stopped. `stopping` makes the StoppingPolicy of one
+        # model, by default the one of two_layer_network.py. Each model checks its own
+        # policy after every epoch; afterwards self.stopping[m].reason says why it stopped.
+        stopping = stopping or (lambda: StoppingPolicy(tolerance=0, patience=500, max_iterations=10000))
+        self.stopping = [stopping() for _ in range(self.number_of_models)]
+        self.active[:] = True
+
+        while self.active.any():
+            overall_run_errors = self.train_epoch(inputs, expected_values, batch_size, shuffle, rng)
+            for model in nmpy.flatnonzero(self.active):
+                if self.stopping[model].should_stop(overall_run_errors[model]):
+                    self.active[model] = False
+
+        return self.stopping
+
+    def predict_all(self, inputs):
+        # One row of predictions per model
+        return self.forward(nmpy.atleast_2d(nmpy.asarray(inputs, dtype=float)))[1]
+
+    def predict(self, inputs, combine='mean'):
+        # 'mean' averages the models, 'vote' rounds every prediction to the nearest
+        # class and returns the most common one (the smallest class on a tie)
+        predictions = self.predict_all(inputs)
+        if combine == 'mean':
+            return predictions.mean(axis=0)
+
+        assert( combine == 'vote' )
+        votes = nmpy.rint(predictions)
+        classes = nmpy.unique(votes)
+        counts = (votes[None, :, :] == classes[:, None, None]).sum(axis=1)
+        return classes[nmpy.argmax(counts, axis=0)]
@@ -0,0 +1,69 @@
+import numpy as nmpy
+
+# The weight update helpers of NeuralNetwork_5 and NeuralNetwork_6, with the same
+# names and arguments, but writing into buffers allocated once instead of building
+# new lists on every iteration. After the first step a training loop that uses them
+# allocates nothing: every result lives in a buffer owned by the engine, and the
+# weights are updated where they are.
+#
+# Weights must be a float64 numpy array (as_weights converts the lists of the
+# scripts) because they are modified in place, and the other vectors numpy arrays
+# too, or they would be converted on every call. The returned adjustments are views of
+# the engine's buffers, they are overwritten by the next call.
+
+
+def as_weights(weights):
+    return nmpy.array(weights, dtype=nmpy.float64)
+
+
+class SingleOutputUpdates:
+    # NeuralNetwork_5/gradient_descent_multiinput_singleoutput.py
+    def __init__(self, number_of_inputs):
+        self.weight_adjustments = nmpy.zeros(number_of_inputs)
+
+    def calculate_weight_adjustments(self, inputs, correction_factor):
+        return nmpy.multiply(inputs, correction_factor, out=self.weight_adjustments)
+
+    def calculate_updated_weights(self, weights, weight_adjustments):
+        return nmpy.subtract(weights, weight_adjustments, out=weights)
+
+
+class MultiOutputUpdates:
+    # NeuralNetwork_5/gradient_descent_singleinput_multioutput.py
+    def __init__(self, number_of_outputs):
+        self.weight_adjustments = nmpy.zeros(number_of_outputs)
+
+    def calculate_weight_adjustments(self, alpha, input, predicted_values, expected_values):
+        adjustments = nmpy.subtract(predicted_values, expected_values, out=self.weight_adjustments)
+        return nmpy.multiply(adjustments, alpha * input, out=adjustments)
+
+    def calculate_updated_weights(self, weights, weight_adjustments):
+        return nmpy.subtract(weights, weight_adjustments, out=weights)
+
+
+class MatrixUpdates:
+    # NeuralNetwork_6/gradient_descent_multiinput_multioutput.py, weights has one
+    # row per output
+    def __init__(self, number_of_outputs, number_of_inputs):
+        self.predicted_values = nmpy.zeros(number_of_outputs)
+        self.deltas = nmpy.zeros(number_of_outputs)
+        self.delta_column = self.deltas[:, None]
+        self.correction_factors = nmpy.zeros((number_of_outputs, number_of_inputs))
+
+    def predict(self, weights, inputs):
+        return nmpy.dot(weights, inputs, out=self.predicted_values)
+
+    def calculate_weight_correction_matrix(self, alpha, inputs, expected_values, predicted_values):
+        deltas = nmpy.subtract(predicted_values, expected_values, out=self.deltas)
+        nmpy.multiply(deltas, alpha, out=deltas)
+        # The outer product as a (outputs, 1) x (1, inputs) matmul: multiply.outer
+        # is a bit faster, but it allocates a scratch buffer on every call
+        return nmpy.matmul(self.delta_column, inputs[None, :], out=self.correction_factors)
+
+    def calculate_corrected_weights(self, weights, correction_factors):
+        return nmpy.subtract(weights, correction_factors, out=weights)
+
+    def step(self, weights, alpha, inputs, expected_values, predicted_values):
+        # Both helpers in one call: weights -= alpha * outer(predicted - expected, inputs)
+        correction_factors = self.calculate_weight_correction_matrix(alpha, inputs, expected_values, predicted_values)
+        return self.calculate_corrected_weights(weights, correction_factors)
@@ -0,0 +1,86 @@
+import numpy as nmpy
+
+# The linear networks of NeuralNetwork_5, NeuralNetwork_6 and NeuralNetwork_7 minimize
+# the squared error of inputs.dot(weights), which is ordinary least squares: instead
+# of thousands of gradient steps, the best weights solve the normal equations
+#
+#     (X^T X + ridge * I) delta = X^T (y - X w0),     weights = w0 + delta
+#
+# X^T X is only (inputs, inputs), and it is a sum over rows, so it can be
+# accumulated one chunk at a time on data that doesn't fit in memory.
+#
+# The solution is measured from the initial weights w0: when the data doesn't pin
+# the weights down (fewer rows than inputs, like the single-example scripts), the
+# result is the solution closest to w0, which is also where gradient descent
+# started from w0 ends up. ridge > 0 pulls the weights towards w0.
+
+
+class NormalEquations:
+    def __init__(self, number_of_inputs, number_of_outputs=1):
+        self.xtx = nmpy.zeros((number_of_inputs, number_of_inputs))
+        self.xty = nmpy.zeros((number_of_inputs, number_of_outputs))
+        self.number_of_rows = 0
+
+    def update(self, inputs, expected_values):
+        # inputs: (rows, inputs), expected_values: (rows,) or (rows, outputs)
+        inputs = nmpy.atleast_2d(nmpy.asarray(inputs, dtype=nmpy.float64))
+        expected_values = nmpy.asarray(expected_values, dtype=nmpy.float64).reshape(len(inputs), -1)
+
+        self.xtx += inputs.T.dot(inputs)
+        self.xty += inputs.T.dot(expected_values)
+        self.number_of_rows += len(inputs)
+        return self
+
+    def update_from_chunks(self, chunks):
+        # Any iterable of (inputs, expected_values), like ArraySource.chunks()
+        for inputs, expected_values in chunks:
+            self.update(inputs, expected_values)
+        return self
+
+    def merge(self, other):
+        self.xtx += other.xtx
+        self.xty += other.xty
+        self.number_of_rows += other.number_of_rows
+        return self
+
+    def solve(self, initial_weights=None, ridge=0.0, method='cholesky'):
+        # Returns (inputs, outputs) weights. Cholesky is the fastest, but needs a
+        # positive definite matrix: without ridge and with fewer independent rows
+        # than inputs it falls back to lstsq, which finds the smallest change.
+        assert( method in ('cholesky', 'lstsq') )
+        number_of_inputs = len(self.xtx)
+        if initial_weights is None:
+            initial_weights = nmpy.zeros_like(self.xty)
+
+        matrix = self.xtx + ridge * nmpy.eye(number_of_inputs)
+        residuals = self.xty - self.xtx.dot(initial_weights)
+
+        if method == 'cholesky':
+            try:
+                lower = nmpy.linalg.cholesky(matrix)
+                return initial_weights + nmpy.linalg.solve(lower.T, nmpy.linalg.solve(lower, residuals))
+            except nmpy.linalg.LinAlgError:
+                pass
+
+        return initial_weights + nmpy.linalg.lstsq(matrix, residuals, rcond=None)[0]
+
+
+def least_squares_weights(weights, inputs=None, expected_values=None, chunks=None, ridge=0.0, method='cholesky'):
+    # Weights in, weights out, like the update helpers of the scripts, but already
+    # fitted. `weights` is either one weight per input (a single output) or one row
+    # per output (the layout of NeuralNetwork_6), as a list or an array, and the
+    # result has the same layout and type. The data comes as inputs/expected_values
+    # or as `chunks` of them.
+    initial_weights = nmpy.asarray(weights, dtype=nmpy.float64)
+    single_output = initial_weights.ndim == 1
+    columns = initial_weights[:, None] if single_output else initial_weights.T
+
+    equations = NormalEquations(*columns.shape)
+    if inputs is not None:
+        equations.update(inputs, expected_values)
+    if chunks is not None:
+        equations.update_from_chunks(chunks)
+
+    solved = equations.solve(columns, ridge, method)
+    solved = solved[:, 0] if single_output else solved.T
+    return solved.tolist() if isinstance(weights, list) else solved
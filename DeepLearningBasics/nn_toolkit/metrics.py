@@ -0,0 +1,113 @@
+import collections
+import csv
+import json
+import sys
+
+
+# Metrics sinks replace the per-step print calls of the training loops. Every sink
+# has the same two methods: record(step, **values) and close(). The `enabled` flag
+# lets a hot loop skip building the values at all when nothing will be stored.
+
+class NullSink:
+    enabled = False
+
+    def record(self, step, **values):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PrintSink(NullSink):
+    # The old behaviour: one formatted line per step
+    enabled = True
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def record(self, step, **values):
+        formatted_values = ", ".join("{}={}".format(name, value) for name, value in values.items())
+        print("step {}: {}".format(step, formatted_values), file=self.stream)
+
+
+class SampledSink(NullSink):
+    # Forwards only every `every`-th step to another sink
+    enabled = True
+
+    def __init__(self, every=1000, sink=None):
+        self.every = every
+        self.sink = sink or PrintSink()
+
+    def record(self, step, **values):
+        if step % self.every == 0:
+            self.sink.record(step, **values)
+
+    def close(self):
+        self.sink.close()
+
+
+class RingBufferSink(NullSink):
+    # Keeps the last `capacity` steps in memory, older ones are dropped
+    enabled = True
+
+    def __init__(self, capacity=10000):
+        self.steps = collections.deque(maxlen=capacity)
+
+    def record(self, step, **values):
+        self.steps.append((step, values))
+
+    def latest(self):
+        return self.steps[-1] if self.steps else None
+
+    def values(self, name):
+        return [values[name] for _, values in self.steps if name in values]
+
+
+class FileSink(NullSink):
+    # Writes CSV or JSONL, buffering `flush_every` steps between writes to disk.
+    # The CSV columns are the value names of the first recorded step.
+    enabled = True
+
+    def __init__(self, path, file_format=None, flush_every=1000):
+        self.file_format = file_format or ('jsonl' if path.endswith('.jsonl') else 'csv')
+        assert( self.file_format in ('csv', 'jsonl') )
+        self.flush_every = flush_every
+        self.pending = []
+        self.csv_writer = None
+        self.output_file = open(path, 'w', newline='')
+
+    def record(self, step, **values):
+        self.pending.append((step, values))
+        if len(self.pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self.file_format == 'jsonl':
+            self.output_file.write("".join(json.dumps(dict(step=step, **to_builtin(values))) + "\n"
+                                           for step, values in self.pending))
+        else:
+            for step, values in self.pending:
+                if self.csv_writer is None:
+                    self.csv_writer = csv.DictWriter(self.output_file, ['step'] + list(values))
+                    self.csv_writer.writeheader()
+                self.csv_writer.writerow(dict(step=step, **to_builtin(values)))
+
+        self.pending = []
+        self.output_file.flush()
+
+    def close(self):
+        if not self.output_file.closed:
+            self.flush()
+            self.output_file.close()
+
+
+def to_builtin(values):
+    # numpy scalars and arrays aren't JSON serializable, plain Python values are
+    return {name: value.tolist() if hasattr(value, 'tolist') else value
+            for name, value in values.items()}
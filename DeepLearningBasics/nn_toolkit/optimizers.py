@@ -0,0 +1,163 @@
+import numpy as nmpy
+
+# Replacements for `weights -= alpha * gradient`. An optimizer keeps, for every
+# weight array it updates (a "slot"), a few arrays of state of the same shape,
+# allocated on its first step and then updated in place: a step allocates nothing.
+#
+# NumPy weights are updated in place and returned. Weights that can't be updated in
+# place (a float, or the lists of the NeuralNetwork_3-6 scripts) are converted, and a
+# new float or list is returned, so the scripts keep their `weights = ...` lines.
+
+
+class ConstantRate:
+    def __call__(self, alpha, iteration):
+        return alpha
+
+
+class StepDecay:
+    # alpha * factor ** (number of full `every` periods done)
+    def __init__(self, every=100, factor=0.5):
+        self.every = every
+        self.factor = factor
+
+    def __call__(self, alpha, iteration):
+        return alpha * self.factor ** ((iteration - 1) // self.every)
+
+
+class ExponentialDecay:
+    def __init__(self, rate=0.999):
+        self.rate = rate
+
+    def __call__(self, alpha, iteration):
+        return alpha * self.rate ** (iteration - 1)
+
+
+class InverseTimeDecay:
+    # alpha / (1 + decay * iteration), the classic SGD schedule
+    def __init__(self, decay=0.01):
+        self.decay = decay
+
+    def __call__(self, alpha, iteration):
+        return alpha / (1 + self.decay * (iteration - 1))
+
+
+class GradientDescent:
+    # Plain weights -= alpha * gradient, with an optional learning rate schedule
+    state_names = ()
+
+    def __init__(self, alpha=0.01, schedule=None):
+        self.alpha = alpha
+        self.schedule = schedule or ConstantRate()
+        self.slots = {}
+
+    def slot_state(self, slot, weights):
+        if slot not in self.slots:
+            state = {name: nmpy.zeros_like(weights) for name in self.state_names + ('scratch',)}
+            state['iteration'] = 0
+            self.slots[slot] = state
+        return self.slots[slot]
+
+    def step(self, weights, gradient, slot=0):
+        if not isinstance(weights, nmpy.ndarray):
+            updated = nmpy.array(weights, dtype=nmpy.float64)
+            self.step(updated, nmpy.asarray(gradient, dtype=nmpy.float64), slot)
+            return updated.tolist()
+
+        state = self.slot_state(slot, weights)
+        state['iteration'] += 1
+        learning_rate = self.schedule(self.alpha, state['iteration'])
+        self.update(weights, gradient, learning_rate, state)
+        return weights
+
+    def update(self, weights, gradient, learning_rate, state):
+        scratch = nmpy.multiply(gradient, learning_rate, out=state['scratch'])
+        weights -= scratch
+
+    def reset(self):
+        self.slots = {}
+
+
+class Momentum(GradientDescent):
+    # velocity = beta * velocity + gradient, weights -= alpha * velocity. With
+    # nesterov=True the step looks ahead: weights -= alpha * (gradient + beta * velocity)
+    state_names = ('velocity',)
+
+    def __init__(self, alpha=0.01, beta=0.9, nesterov=False, schedule=None):
+        super().__init__(alpha, schedule)
+        self.beta = beta
+        self.nesterov = nesterov
+
+    def update(self, weights, gradient, learning_rate, state):
+        velocity, scratch = state['velocity'], state['scratch']
+        velocity *= self.beta
+        velocity += gradient
+
+        if self.nesterov:
+            nmpy.multiply(velocity, self.beta, out=scratch)
+            scratch += gradient
+            scratch *= learning_rate
+        else:
+            nmpy.multiply(velocity, learning_rate, out=scratch)
+        weights -= scratch
+
+
+class Nesterov(Momentum):
+    def __init__(self, alpha=0.01, beta=0.9, schedule=None):
+        super().__init__(alpha, beta, True, schedule)
+
+
+class RMSProp(GradientDescent):
+    # Divides every gradient by a running average of its size, so weights with
+    # small gradients get bigger steps
+    state_names = ('mean_square',)
+
+    def __init__(self, alpha=0.001, decay=0.9, epsilon=1e-8, schedule=None):
+        super().__init__(alpha, schedule)
+        self.decay = decay
+        self.epsilon = epsilon
+
+    def update(self, weights, gradient, learning_rate, state):
+        mean_square, scratch = state['mean_square'], state['scratch']
+        nmpy.multiply(gradient, gradient, out=scratch)
+        scratch *= 1 - self.decay
+        mean_square *= self.decay
+        mean_square += scratch
+
+        nmpy.sqrt(mean_square, out=scratch)
+        scratch += self.epsilon
+        nmpy.divide(gradient, scratch, out=scratch)
+        scratch *= learning_rate
+        weights -= scratch
+
+
+class Adam(GradientDescent):
+    # Momentum on the gradient plus RMSProp scaling, with the bias correction of
+    # Kingma & Ba folded into the learning rate and epsilon
+    state_names = ('mean', 'mean_square')
+
+    def __init__(self, alpha=0.001, beta_1=0.9, beta_2=0.999, epsilon=1e-8, schedule=None):
+        super().__init__(alpha, schedule)
+        self.beta_1 = beta_1
+        self.beta_2 = beta_2
+        self.epsilon = epsilon
+
+    def update(self, weights, gradient, learning_rate, state):
+        mean, mean_square, scratch = state['mean'], state['mean_square'], state['scratch']
+        mean *= self.beta_1
+        nmpy.multiply(gradient, 1 - self.beta_1, out=scratch)
+        mean += scratch
+
+        nmpy.multiply(gradient, gradient, out=scratch)
+        scratch *= 1 - self.beta_2
+        mean_square *= self.beta_2
+        mean_square += scratch
+
+        iteration = state['iteration']
+        correction = (1 - self.beta_2 ** iteration) ** 0.5
+        step_size = learning_rate * correction / (1 - self.beta_1 ** iteration)
+
+        nmpy.sqrt(mean_square, out=scratch)
+        scratch += self.epsilon * correction
+        nmpy.divide(mean, scratch, out=scratch)
+        scratch *= step_size
+        weights -= scratch
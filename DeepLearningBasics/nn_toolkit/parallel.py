@@ -0,0 +1,177 @@
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as nmpy
+
+from .two_layer import relu, relu_deriv
+
+
+# Models for the data-parallel trainer. All the weights of a model live in a single
+# flat float64 vector, so they can be placed in one shared memory block; `unpack`
+# turns that vector back into the arrays the math uses (views, not copies).
+
+class LinearModel:
+    # The model of NeuralNetwork_7_correlation/stochastic_gradient_descent.py
+    def __init__(self, number_of_inputs, decimals=None):
+        self.shapes = [(number_of_inputs,)]
+        self.decimals = decimals
+
+    def gradient(self, weights, inputs, expected_values):
+        weights, = self.unpack(weights)
+        predicted_values = inputs.dot(weights)
+        if self.decimals is not None:
+            predicted_values = nmpy.round(predicted_values, self.decimals)
+
+        deltas = predicted_values - expected_values
+        return inputs.T.dot(deltas) / len(inputs), nmpy.sum(deltas ** 2)
+
+    def unpack(self, flat_weights):
+        return unpack(flat_weights, self.shapes)
+
+
+class TwoLayerModel(LinearModel):
+    # The model of NeuralNetwork_8_backpropagation/two_layer_network.py
+    def __init__(self, number_of_inputs, hidden_layer_number_of_nodes=4, decimals=None):
+        self.shapes = [(number_of_inputs, hidden_layer_number_of_nodes), (hidden_layer_number_of_nodes,)]
+        self.decimals = decimals
+
+    def gradient(self, weights, inputs, expected_values):
+        weights_1, weights_2 = self.unpack(weights)
+        hidden_outputs = relu(inputs.dot(weights_1))
+        predicted_values = hidden_outputs.dot(weights_2)
+        if self.decimals is not None:
+            predicted_values = nmpy.round(predicted_values, self.decimals)
+
+        layer2_delta = predicted_values - expected_values
+        layer1_delta = nmpy.outer(layer2_delta, weights_2) * relu_deriv(hidden_outputs)
+
+        gradient = nmpy.concatenate([inputs.T.dot(layer1_delta).ravel(),
+                                     hidden_outputs.T.dot(layer2_delta)])
+        return gradient / len(inputs), nmpy.sum(layer2_delta ** 2)
+
+
+def unpack(flat_weights, shapes):
+    arrays = []
+    offset = 0
+    for shape in shapes:
+        size = int(nmpy.prod(shape))
+        arrays.append(flat_weights[offset:offset + size].reshape(shape))
+        offset += size
+
+    return arrays
+
+
+# Everything a worker process needs is attached once, when the pool starts
+_worker = {}
+
+def _attach(name, shape):
+    block = shared_memory.SharedMemory(name=name)
+    return block, nmpy.ndarray(shape, dtype=nmpy.float64, buffer=block.buf)
+
+def _init_worker(model, inputs_spec, expected_values_spec, weights_spec):
+    _worker['model'] = model
+    _worker['blocks'], arrays = zip(*[_attach(*spec) for spec in
+                                     (inputs_spec, expected_values_spec, weights_spec)])
+    _worker['inputs'], _worker['expected_values'], _worker['weights'] = arrays
+
+def _sync_gradient(rows):
+    start, end = rows
+    return _worker['model'].gradient(_worker['weights'],
+                                     _worker['inputs'][start:end],
+                                     _worker['expected_values'][start:end])
+
+def _hogwild_shard(task):
+    # Trains on one shard, writing straight into the shared weights without any lock
+    start, end, batch_size, alpha, seed = task
+    model, weights = _worker['model'], _worker['weights']
+    order = nmpy.random.RandomState(seed).permutation(nmpy.arange(start, end))
+
+    shard_error = 0
+    for batch_start in range(0, len(order), batch_size):
+        batch_rows = nmpy.sort(order[batch_start:batch_start + batch_size])
+        gradient, error = model.gradient(weights, _worker['inputs'][batch_rows],
+                                         _worker['expected_values'][batch_rows])
+        weights -= alpha * gradient
+        shard_error += error
+
+    return shard_error
+
+
+class DataParallelTrainer:
+    # Shards the training rows across `workers` processes.
+    #   mode='sync':    every step each worker computes the gradient of its slice of
+    #                   the global batch, and the averaged gradient is applied once.
+    #   mode='hogwild': every worker runs SGD over its own shard, updating the shared
+    #                   weight buffer in place with no synchronization at all.
+    def __init__(self, model, initial_weights, alpha=0.1, workers=4, mode='sync', batch_size=32):
+        assert( mode in ('sync', 'hogwild') )
+        self.model = model
+        self.alpha = alpha
+        self.workers = workers
+        self.mode = mode
+        self.batch_size = batch_size
+        self.initial_weights = nmpy.concatenate([nmpy.ravel(w) for w in initial_weights]).astype(nmpy.float64)
+        self.weights = self.initial_weights.copy()
+
+    def fit(self, inputs, expected_values, epochs=1, seed=0):
+        # Returns the accumulated error of every epoch, like TwoLayerNetwork.fit
+        inputs = nmpy.asarray(inputs, dtype=nmpy.float64)
+        expected_values = nmpy.asarray(expected_values, dtype=nmpy.float64)
+
+        blocks = []
+        try:
+            specs = []
+            shared_arrays = []
+            for array in (inputs, expected_values, self.weights):
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                blocks.append(block)
+                shared_array = nmpy.ndarray(array.shape, dtype=nmpy.float64, buffer=block.buf)
+                shared_array[...] = array
+                shared_arrays.append(shared_array)
+                specs.append((block.name, array.shape))
+            shared_weights = shared_arrays[-1]
+
+            with multiprocessing.Pool(self.workers, _init_worker, (self.model, *specs)) as pool:
+                if self.mode == 'sync':
+                    errors = [self.sync_epoch(pool, shared_weights, len(inputs)) for _ in range(epochs)]
+                else:
+                    errors = [self.hogwild_epoch(pool, len(inputs), seed + epoch) for epoch in range(epochs)]
+
+            self.weights = shared_weights.copy()
+            del shared_arrays, shared_weights
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        return errors
+
+    def sync_epoch(self, pool, shared_weights, number_of_rows):
+        epoch_error = 0
+        global_batch_size = self.batch_size * self.workers
+        for start in range(0, number_of_rows, global_batch_size):
+            end = min(start + global_batch_size, number_of_rows)
+            slices = shard_bounds(start, end, self.workers)
+            results = pool.map(_sync_gradient, slices)
+
+            # Weight every worker's mean gradient by its number of rows
+            gradient = sum(worker_gradient * (slice_end - slice_start)
+                           for (worker_gradient, _), (slice_start, slice_end) in zip(results, slices))
+            shared_weights -= self.alpha * gradient / (end - start)
+            epoch_error += sum(error for _, error in results)
+
+        return epoch_error
+
+    def hogwild_epoch(self, pool, number_of_rows, seed):
+        tasks = [(start, end, self.batch_size, self.alpha, seed * self.workers + index)
+                 for index, (start, end) in enumerate(shard_bounds(0, number_of_rows, self.workers))]
+        return sum(pool.map(_hogwild_shard, tasks))
+
+    def unpacked_weights(self):
+        return self.model.unpack(self.weights)
+
+
+def shard_bounds(start, end, number_of_shards):
+    # Splits [start, end) in `number_of_shards` contiguous, non-empty pieces
+    edges = nmpy.linspace(start, end, number_of_shards + 1).astype(int)
+    return [(int(low), int(high)) for low, high in zip(edges[:-1], edges[1:]) if high > low]
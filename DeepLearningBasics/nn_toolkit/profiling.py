@@ -0,0 +1,181 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+import numpy as nmpy
+
+# Profilers split the body of a training loop into phases (data, forward, loss,
+# backward, update...) and report how the time goes. Like the metrics sinks, every
+# profiler has the same methods, and NullProfiler does nothing, so a script calls
+# them unconditionally and only pays for an empty method call when profiling is off.
+#
+# A phase ends with lap(name): it gets the time since the previous lap (or start()).
+# Loops run their phases one after the other, so this needs a single clock reading
+# per phase, and whatever runs between the phases (like fetching the next row from
+# the iterator) is counted too instead of going missing. step(samples) marks the
+# end of a training step, for the samples per second.
+
+
+class NullProfiler:
+    enabled = False
+
+    def start(self):
+        pass
+
+    def lap(self, phase, flops=0):
+        pass
+
+    def step(self, samples=1):
+        pass
+
+    def report(self):
+        return ""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Profiler(NullProfiler):
+    # Times every phase; with track_allocations also records, through tracemalloc,
+    # the most memory each phase allocated at once (which slows everything down, so
+    # the times are then inflated). With trace_path, close() writes every phase and
+    # step as a Chrome trace, which chrome://tracing, Perfetto or speedscope show as
+    # a timeline/flame graph.
+    enabled = True
+
+    def __init__(self, trace_path=None, track_allocations=False, max_trace_events=1000000):
+        self.trace_path = trace_path
+        self.track_allocations = track_allocations
+        self.max_trace_events = max_trace_events
+
+        self.durations = {}
+        self.flops = {}
+        self.allocations = {}
+        self.trace_events = []
+        self.steps = 0
+        self.samples = 0
+        self.first_start = None
+        self.last_step_end = None
+        self.last_lap = None
+        self.step_start = None
+
+        # Only stop tracing in close() if we were the ones who started it
+        self.started_tracing = track_allocations and not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start()
+
+    def start(self):
+        # Restarts the clock, so whatever ran since the last lap isn't counted
+        self.last_lap = time.perf_counter_ns()
+        if self.first_start is None:
+            self.first_start = self.last_lap
+        if self.step_start is None:
+            self.step_start = self.last_lap
+        if self.track_allocations:
+            self.allocation_start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+    def lap(self, phase, flops=0):
+        now = time.perf_counter_ns()
+        if self.last_lap is None:
+            # The first lap of a run has no beginning: it only starts the clock
+            self.start()
+            return
+
+        if phase not in self.durations:
+            self.durations[phase], self.flops[phase], self.allocations[phase] = [], 0, []
+        self.durations[phase].append(now - self.last_lap)
+        self.flops[phase] += flops
+
+        if self.track_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            self.allocations[phase].append(peak - self.allocation_start)
+            self.allocation_start = current
+            tracemalloc.reset_peak()
+
+        if self.trace_path and len(self.trace_events) < self.max_trace_events:
+            self.trace_events.append(trace_event(phase, self.last_lap, now))
+
+        # Measuring took time too, the next phase starts after it
+        self.last_lap = time.perf_counter_ns()
+
+    def step(self, samples=1):
+        now = time.perf_counter_ns()
+        self.steps += 1
+        self.samples += samples
+        self.last_step_end = now
+
+        if self.trace_path and self.step_start is not None and len(self.trace_events) < self.max_trace_events:
+            self.trace_events.append(trace_event('step', self.step_start, now))
+        self.step_start = now
+
+    def seconds(self):
+        if self.first_start is None or self.last_step_end is None:
+            return 0.0
+        return (self.last_step_end - self.first_start) / 1e9
+
+    def summary(self):
+        # One dictionary per phase, in the order they first ran
+        total = sum(sum(durations) for durations in self.durations.values()) or 1
+        rows = []
+        for phase, durations in self.durations.items():
+            phase_seconds = sum(durations) / 1e9
+            allocations = self.allocations[phase]
+            rows.append({'phase': phase,
+                         'calls': len(durations),
+                         'seconds': phase_seconds,
+                         'mean_us': phase_seconds / len(durations) * 1e6,
+                         'p99_us': nmpy.percentile(durations, 99) / 1e3,
+                         'share': sum(durations) / total,
+                         'mflops': self.flops[phase] / phase_seconds / 1e6 if phase_seconds else 0.0,
+                         'mean_kb': nmpy.mean(allocations) / 1024 if allocations else None})
+        return rows
+
+    def report(self):
+        lines = ["{:<10} {:>9} {:>10} {:>10} {:>10} {:>7} {:>9} {:>9}".format(
+            "phase", "calls", "seconds", "mean us", "p99 us", "share", "MFLOP/s", "mean KB")]
+        for row in self.summary():
+            lines.append("{:<10} {:>9} {:>10.4f} {:>10.2f} {:>10.2f} {:>6.1f}% {:>9.1f} {:>9}".format(
+                row['phase'], row['calls'], row['seconds'], row['mean_us'], row['p99_us'], row['share'] * 100,
+                row['mflops'], "-" if row['mean_kb'] is None else "{:.2f}".format(row['mean_kb'])))
+
+        seconds = self.seconds()
+        lines.append("{} steps, {} samples in {:.3f}s: {:.0f} samples/s".format(
+            self.steps, self.samples, seconds, self.samples / seconds if seconds else 0.0))
+        return "\n".join(lines)
+
+    def save_trace(self, path):
+        with open(path, 'w') as trace_file:
+            json.dump({'traceEvents': self.trace_events, 'displayTimeUnit': 'ms'}, trace_file)
+
+    def close(self):
+        if self.trace_path:
+            self.save_trace(self.trace_path)
+        if self.started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+            self.started_tracing = False
+
+
+def trace_event(name, start_ns, end_ns):
+    # A "complete" event of the Chrome trace format, times in microseconds
+    return {'name': name, 'ph': 'X', 'ts': start_ns / 1e3, 'dur': (end_ns - start_ns) / 1e3,
+            'pid': os.getpid(), 'tid': threading.get_ident()}
+
+
+def profiler_from_argv(argv):
+    # --profile times the phases, --profile=allocations also tracks memory, and
+    # --trace=PATH (which implies --profile) writes a Chrome trace to PATH
+    trace_path = next((argument.split('=', 1)[1] for argument in argv if argument.startswith('--trace=')), None)
+    track_allocations = '--profile=allocations' in argv
+
+    if trace_path or track_allocations or '--profile' in argv:
+        return Profiler(trace_path, track_allocations)
+    return NullProfiler()
@@ -0,0 +1,157 @@
+import threading
+
+import numpy as nmpy
+
+from .serving import LinearPredictor, TwoLayerPredictor
+from .two_layer import relu
+
+# Smaller copies of trained weights for inference. float32 halves the bytes every
+# prediction reads; int8 quarters them again, with one float32 scale per output
+# (symmetric: 0 stays exactly 0, and the largest weight of an output maps to 127).
+#
+# NumPy has no int8 matrix product, so int8 weights are converted to float32 a block
+# of columns at a time, into a small buffer that is reused: the full float32 matrix
+# never exists, and the arithmetic runs at float32 speed.
+PRECISIONS = ('float64', 'float32', 'int8')
+
+# Values per dequantized block, 1 MB of float32
+BLOCK_VALUES = 2 ** 18
+
+
+class Int8Matrix:
+    # A (inputs, outputs) weight matrix stored as int8 values times a float32 scale
+    # per output column. A 1-D vector (a single output) gets a single scale.
+    def __init__(self, weights):
+        weights = nmpy.asarray(weights, dtype=nmpy.float64)
+        scales = nmpy.abs(weights).max(axis=0) / 127
+        scales = nmpy.where(scales > 0, scales, 1.0)
+
+        self.values = nmpy.rint(weights / scales).astype(nmpy.int8)
+        self.scales = scales.astype(nmpy.float32)
+        self.block_columns = max(1, BLOCK_VALUES // len(self.values))
+        # One dequantization buffer per thread, the servers predict from a thread pool
+        self.buffers = threading.local()
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.scales.nbytes
+
+    def dequantize(self):
+        return self.values * self.scales
+
+    def dot(self, inputs):
+        # inputs.dot(dequantized weights), one block of output columns at a time:
+        # every block is dequantized into the buffer and multiplied straight into
+        # its columns of the result
+        buffer = getattr(self.buffers, 'buffer', None)
+        if buffer is None:
+            buffer = self.buffers.buffer = nmpy.empty((len(self.values), self.block_columns), dtype=nmpy.float32)
+
+        if self.values.ndim == 1:
+            weights = buffer[:, 0]
+            nmpy.copyto(weights, self.values)
+            weights *= self.scales
+            return inputs.dot(weights)
+
+        number_of_outputs = self.values.shape[1]
+        result = nmpy.empty(inputs.shape[:-1] + (number_of_outputs,), dtype=nmpy.float32)
+        for start in range(0, number_of_outputs, self.block_columns):
+            columns = slice(start, start + self.block_columns)
+            weights = buffer[:, :len(self.scales[columns])]
+            nmpy.copyto(weights, self.values[:, columns])
+            weights *= self.scales[columns]
+            nmpy.matmul(inputs, weights, out=result[..., columns])
+
+        return result
+
+
+def convert_weights(weights, precision):
+    assert( precision in PRECISIONS )
+    if precision == 'int8':
+        return Int8Matrix(weights)
+
+    return nmpy.ascontiguousarray(weights, dtype=precision)
+
+
+def multiply(inputs, weights):
+    # inputs.dot(weights) for both plain arrays and Int8Matrix
+    if isinstance(weights, Int8Matrix):
+        return weights.dot(inputs)
+
+    return inputs.dot(weights)
+
+
+def compute_dtype(precision):
+    return nmpy.float64 if precision == 'float64' else nmpy.float32
+
+
+class ReducedLinearPredictor:
+    # LinearPredictor (multi_input_multi_output_neural_network) at a lower precision.
+    # weights has one row per output, like everywhere else.
+    def __init__(self, weights, precision='float32'):
+        self.precision = precision
+        self.dtype = compute_dtype(precision)
+        self.weights = convert_weights(nmpy.asarray(weights).T, precision)
+
+    @property
+    def nbytes(self):
+        return self.weights.nbytes
+
+    def predict(self, input_batch):
+        return multiply(nmpy.asarray(input_batch, dtype=self.dtype), self.weights)
+
+
+class ReducedTwoLayerPredictor:
+    # TwoLayerPredictor (the relu network of two_layer_network.py) at a lower precision
+    def __init__(self, weights_1, weights_2, precision='float32'):
+        self.precision = precision
+        self.dtype = compute_dtype(precision)
+        self.weights_1 = convert_weights(weights_1, precision)
+        self.weights_2 = convert_weights(weights_2, precision)
+
+    @property
+    def nbytes(self):
+        return self.weights_1.nbytes + self.weights_2.nbytes
+
+    def predict(self, input_batch):
+        hidden_outputs = relu(multiply(nmpy.asarray(input_batch, dtype=self.dtype), self.weights_1))
+        return multiply(hidden_outputs, self.weights_2)
+
+
+def reduce_precision(predictor, precision='float32'):
+    # The conversion step: a trained LinearPredictor or TwoLayerPredictor (see
+    # serving.load_predictor) in, a predictor with the same predict() out
+    if isinstance(predictor, LinearPredictor):
+        return ReducedLinearPredictor(predictor.layer.weights, precision)
+
+    assert( isinstance(predictor, TwoLayerPredictor) )
+    return ReducedTwoLayerPredictor(predictor.weights_1, predictor.weights_2, precision)
+
+
+def precision_report(predictor, inputs, expected_values=None, precisions=PRECISIONS):
+    # How far every precision drifts from float64 on held-out inputs. With
+    # expected_values, also the mean squared error of each precision.
+    reference = reduce_precision(predictor, 'float64').predict(inputs)
+    rows = []
+    for precision in precisions:
+        reduced = reduce_precision(predictor, precision)
+        predicted_values = reduced.predict(inputs).astype(nmpy.float64)
+        drift = nmpy.abs(predicted_values - reference)
+
+        row = {'precision': precision, 'weight_bytes': reduced.nbytes,
+               'max_drift': drift.max(), 'mean_drift': drift.mean()}
+        if expected_values is not None:
+            row['mse'] = nmpy.mean((predicted_values - expected_values) ** 2)
+        rows.append(row)
+
+    return rows
+
+
+def format_report(rows):
+    names = list(rows[0])
+    lines = [' '.join('{:>12}'.format(name) for name in names)]
+    for row in rows:
+        lines.append(' '.join('{:>12.4g}'.format(row[name]) if isinstance(row[name], float)
+                              else '{:>12}'.format(row[name]) for name in names))
+
+    return '\n'.join(lines)
@@ -0,0 +1,279 @@
+import asyncio
+import concurrent.futures
+import json
+
+import numpy as nmpy
+
+from .checkpoint import load_checkpoint
+from .dense import Dense
+from .two_layer import relu
+
+# Requests with a bigger body are answered with a 413 without reading it
+MAX_BODY_BYTES = 2 ** 20
+
+
+# Models the server can load. Both take a (batch, inputs) matrix and return one row
+# of outputs per input row, so a whole micro-batch is a single matrix multiply.
+
+class LinearPredictor:
+    # multi_input_multi_output_neural_network from NeuralNetwork_2/NeuralNetwork_6
+    def __init__(self, weights):
+        self.layer = Dense(weights)
+
+    @property
+    def number_of_inputs(self):
+        return self.layer.number_of_inputs
+
+    def predict(self, input_batch):
+        return self.layer.forward(input_batch)
+
+
+class TwoLayerPredictor:
+    # The forward pass of NeuralNetwork_8_backpropagation/two_layer_network.py
+    def __init__(self, weights_1, weights_2):
+        # ascontiguousarray doesn't copy weights that are already float64 and contiguous
+        self.weights_1 = nmpy.ascontiguousarray(weights_1, dtype=nmpy.float64)
+        self.weights_2 = nmpy.ascontiguousarray(weights_2, dtype=nmpy.float64)
+
+    @property
+    def number_of_inputs(self):
+        return self.weights_1.shape[0]
+
+    def predict(self, input_batch):
+        return relu(input_batch.dot(self.weights_1)).dot(self.weights_2)
+
+
+def load_predictor(path):
+    # A checkpoint (see checkpoint.py) or an .npz file, with either `weights` (linear)
+    # or `weights_1` and `weights_2`. Checkpoints are memory mapped, so every server
+    # process loading the same file shares one copy of the weights.
+    if path.endswith('.npz'):
+        with nmpy.load(path) as saved:
+            saved = dict(saved)
+    else:
+        saved, _ = load_checkpoint(path)
+
+    if 'weights' in saved:
+        return LinearPredictor(saved['weights'])
+    return TwoLayerPredictor(saved['weights_1'], saved['weights_2'])
+
+
+class MicroBatcher:
+    # Collects concurrent predict() calls and evaluates them together. A batch is
+    # sent as soon as it has max_batch_size requests, or max_wait_ms after its
+    # first request arrived, whichever comes first. Batches are evaluated on a
+    # thread pool (numpy releases the GIL), so the event loop keeps accepting
+    # requests in the meantime.
+    def __init__(self, predictor, max_batch_size=64, max_wait_ms=2, threads=2):
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.executor = concurrent.futures.ThreadPoolExecutor(threads)
+        self.pending = None
+        self.batch_task = None
+        # The event loop only keeps weak references to tasks, these keep the
+        # running batches alive until they are done
+        self.batch_tasks = set()
+
+    async def start(self):
+        self.pending = asyncio.Queue()
+        self.batch_task = asyncio.get_running_loop().create_task(self.batch_loop())
+
+    async def stop(self):
+        self.batch_task.cancel()
+        try:
+            await self.batch_task
+        except asyncio.CancelledError:
+            pass
+
+        # Requests still in the queue would otherwise wait forever
+        while not self.pending.empty():
+            _, future = self.pending.get_nowait()
+            future.cancel()
+        self.executor.shutdown(wait=False)
+
+    async def predict(self, inputs):
+        # Inputs of the wrong shape are rejected here: in a batch they would make
+        # stacking fail for every other request in it
+        inputs = nmpy.asarray(inputs, dtype=nmpy.float64)
+        number_of_inputs = getattr(self.predictor, 'number_of_inputs', None)
+        if inputs.ndim != 1 or (number_of_inputs is not None and len(inputs) != number_of_inputs):
+            raise ValueError("expected a list of {} inputs, got shape {}".format(number_of_inputs, inputs.shape))
+
+        future = asyncio.get_running_loop().create_future()
+        await self.pending.put((inputs, future))
+        return await future
+
+    async def batch_loop(self):
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = [await self.pending.get()]
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.pending.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                task = loop.create_task(self.run_batch(batch))
+                self.batch_tasks.add(task)
+                task.add_done_callback(self.batch_tasks.discard)
+                batch = []
+        except asyncio.CancelledError:
+            # Stopped while collecting a batch, which will never run
+            for _, future in batch:
+                future.cancel()
+            raise
+
+    async def run_batch(self, batch):
+        inputs, futures = zip(*batch)
+        try:
+            outputs = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.predictor.predict, nmpy.stack(inputs))
+        except Exception as error:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for future, output in zip(futures, outputs):
+            if not future.done():
+                future.set_result(output)
+
+
+class InferenceServer:
+    # A tiny HTTP/1.1 server with a single endpoint:
+    #   POST /predict  {"inputs": [0, 1, 1]}  ->  {"outputs": 0.97}
+    # It listens on a TCP port, or on a Unix socket when `unix_path` is given.
+    # Connections are kept alive, so a client can send many requests on one socket.
+    def __init__(self, batcher, host='127.0.0.1', port=8080, unix_path=None):
+        self.batcher = batcher
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.server = None
+
+    async def start(self):
+        await self.batcher.start()
+        if self.unix_path:
+            self.server = await asyncio.start_unix_server(self.handle_connection, self.unix_path)
+        else:
+            self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.batcher.stop()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await read_http_request(reader)
+                if request is None:
+                    break
+
+                method, path, body = request
+                if method is None:
+                    status, response = 400, {'error': 'malformed request line'}
+                elif method == 'POST' and path == '/predict':
+                    try:
+                        output = await self.batcher.predict(json.loads(body)['inputs'])
+                        status, response = 200, {'outputs': output.tolist()}
+                    except (KeyError, TypeError, ValueError) as error:
+                        status, response = 400, {'error': str(error)}
+                else:
+                    status, response = 404, {'error': 'not found'}
+
+                writer.write(http_response(status, json.dumps(response).encode()))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as error:
+            # Headers we can't trust (see read_http_request): the rest of the stream
+            # can't be parsed, so the connection is answered and closed
+            writer.write(http_response(getattr(error, 'status', 400), json.dumps({'error': str(error)}).encode()))
+        finally:
+            writer.close()
+
+
+class BadRequest(ValueError):
+    # Raised by read_http_request, with the HTTP status to answer with
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+async def read_http_request(reader):
+    # (method, path, body), None at the end of the connection. A request line that
+    # isn't "METHOD PATH VERSION" gives a None method, answered with a 400. A
+    # Content-Length that isn't a number or is negative raises BadRequest(400), and
+    # one over MAX_BODY_BYTES BadRequest(413).
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+
+    parts = request_line.decode('latin-1').split()
+    method, path = parts[:2] if len(parts) == 3 else (None, None)
+    content_length = 0
+    while True:
+        header = await reader.readline()
+        if header in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = header.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            try:
+                content_length = int(value)
+            except ValueError:
+                raise BadRequest(400, "invalid Content-Length {!r}".format(value.strip()))
+            if content_length < 0:
+                raise BadRequest(400, "invalid Content-Length {}".format(content_length))
+            if content_length > MAX_BODY_BYTES:
+                raise BadRequest(413, "request body over {} bytes".format(MAX_BODY_BYTES))
+
+    body = await reader.readexactly(content_length) if content_length else b''
+    return method, path, body
+
+
+def http_response(status, body):
+    reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large'}
+    return ("HTTP/1.1 {} {}\r\nContent-Type: application/json\r\n"
+            "Content-Length: {}\r\n\r\n".format(status, reasons[status], len(body))).encode() + body
+
+
+def http_request(inputs):
+    # The bytes of a keep-alive POST /predict request, used by clients and benchmarks
+    body = json.dumps({'inputs': inputs}).encode()
+    return ("POST /predict HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+            "Content-Length: {}\r\n\r\n".format(len(body))).encode() + body
+
+
+def serve(weights_path, host='127.0.0.1', port=8080, unix_path=None, max_batch_size=64, max_wait_ms=2):
+    batcher = MicroBatcher(load_predictor(weights_path), max_batch_size, max_wait_ms)
+    asyncio.run(InferenceServer(batcher, host, port, unix_path).serve_forever())
+
+
+if __name__ == '__main__':
+    # python -m nn_toolkit.serving weights.npz --port 8080
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve trained weights over HTTP")
+    parser.add_argument('weights_path')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--unix-path')
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=2)
+    arguments = parser.parse_args()
+
+    serve(arguments.weights_path, arguments.host, arguments.port, arguments.unix_path,
+          arguments.max_batch_size, arguments.max_wait_ms)
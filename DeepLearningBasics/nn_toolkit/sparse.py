@@ -0,0 +1,100 @@
+import numpy as nmpy
+
+# SGD for inputs that are mostly zeros, like one-hot encoded categories. Each row is
+# stored as the positions and values of its non-zero entries, and the prediction
+# and the update of stochastic_gradient_descent.py only touch those positions:
+# a row costs O(non-zeros) instead of O(features). The zeros skipped contribute
+# exactly 0 to both, so on dense data the weights are equal up to rounding: the
+# sums run over fewer terms, in another order, and can differ in the last bits.
+
+
+class SparseRows:
+    # Compressed sparse rows: the non-zeros of row r are values[indptr[r]:indptr[r + 1]]
+    # at positions indices[indptr[r]:indptr[r + 1]], with no position repeated in a row.
+    # Same layout as scipy.sparse.csr_matrix (data/indices/indptr), which can be
+    # passed wherever SparseRows is expected.
+    def __init__(self, values, indices, indptr, number_of_columns):
+        self.data = nmpy.asarray(values, dtype=nmpy.float64)
+        self.indices = nmpy.asarray(indices, dtype=nmpy.int64)
+        self.indptr = nmpy.asarray(indptr, dtype=nmpy.int64)
+        self.shape = (len(self.indptr) - 1, number_of_columns)
+
+    @classmethod
+    def from_dense(cls, inputs):
+        inputs = nmpy.asarray(inputs)
+        rows, columns = nmpy.nonzero(inputs)
+        indptr = nmpy.r_[0, nmpy.cumsum(nmpy.bincount(rows, minlength=len(inputs)))]
+        return cls(inputs[rows, columns], columns, indptr, inputs.shape[1])
+
+    @classmethod
+    def from_pairs(cls, rows, number_of_columns):
+        # rows: an (indices, values) pair per row
+        lengths = [len(indices) for indices, _ in rows]
+        indptr = nmpy.r_[0, nmpy.cumsum(lengths)]
+        indices = nmpy.concatenate([nmpy.asarray(indices) for indices, _ in rows]) if rows else []
+        values = nmpy.concatenate([nmpy.asarray(values) for _, values in rows]) if rows else []
+        return cls(values, indices, indptr, number_of_columns)
+
+    @classmethod
+    def from_indices(cls, codes, number_of_columns):
+        # The output='indices' of OneHotEncoder: a single 1 per row, none for -1
+        codes = nmpy.asarray(codes)
+        known_rows = codes >= 0
+        indptr = nmpy.r_[0, nmpy.cumsum(known_rows)]
+        return cls(nmpy.ones(known_rows.sum()), codes[known_rows], indptr, number_of_columns)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def toarray(self):
+        dense = nmpy.zeros(self.shape)
+        rows = nmpy.repeat(nmpy.arange(len(self)), nmpy.diff(self.indptr))
+        dense[rows, self.indices] = self.data
+        return dense
+
+
+def row(rows, number):
+    # The (indices, values) of one row, as views
+    start, end = rows.indptr[number], rows.indptr[number + 1]
+    return rows.indices[start:end], rows.data[start:end]
+
+
+class SparseLinearSGD:
+    # The linear model and update rule of NeuralNetwork_7_correlation/stochastic_gradient_descent.py
+    def __init__(self, weights, alpha=0.1, decimals=1):
+        self.weights = nmpy.array(weights, dtype=nmpy.float64)
+        self.alpha = alpha
+        # The script rounds every prediction to 1 decimal, None keeps full precision
+        self.decimals = decimals
+
+    def predict_row(self, indices, values):
+        predicted_value = values.dot(self.weights[indices])
+        if self.decimals is not None:
+            predicted_value = round(predicted_value, self.decimals)
+
+        return predicted_value
+
+    def train_row(self, indices, values, expected_value):
+        predicted_value = self.predict_row(indices, values)
+        self.weights[indices] -= self.alpha * (values * (predicted_value - expected_value))
+
+        return (predicted_value - expected_value) ** 2
+
+    def train_epoch(self, rows, expected_values, order=None):
+        # One SGD step per row, in `order` if given. Returns the error of the run.
+        error_for_run = 0
+        for number in (range(len(expected_values)) if order is None else order):
+            indices, values = row(rows, number)
+            error_for_run += self.train_row(indices, values, expected_values[number])
+
+        return error_for_run
+
+    def predict(self, rows):
+        # Every row at once: weights times the non-zeros, summed per row
+        products = rows.data * self.weights[rows.indices]
+        row_numbers = nmpy.repeat(nmpy.arange(rows.shape[0]), nmpy.diff(rows.indptr))
+        predicted_values = nmpy.bincount(row_numbers, weights=products, minlength=rows.shape[0])
+        if self.decimals is not None:
+            predicted_values = nmpy.round(predicted_values, self.decimals)
+
+        return predicted_values
@@ -0,0 +1,77 @@
+import time
+
+import numpy as nmpy
+
+# Reasons reported by StoppingPolicy.reason
+CONVERGED = 'converged'
+STALLED = 'stalled'
+SMALL_GRADIENT = 'small gradient'
+MAX_ITERATIONS = 'max iterations'
+TIME_BUDGET = 'time budget'
+DIVERGED = 'diverged'
+
+
+class StoppingPolicy:
+    # Replaces the `while True: ... if error == 0: break` pattern. The loop calls
+    # should_stop once per iteration, and the first criterion that triggers is kept
+    # in `reason`. Any criterion left as None is disabled.
+    def __init__(self, tolerance=0.0, patience=None, min_relative_improvement=1e-4,
+                 gradient_tolerance=None, max_iterations=10000, max_seconds=None):
+        self.tolerance = tolerance
+        self.patience = patience
+        self.min_relative_improvement = min_relative_improvement
+        self.gradient_tolerance = gradient_tolerance
+        self.max_iterations = max_iterations
+        self.max_seconds = max_seconds
+        self.reset()
+
+    def reset(self, iteration=0):
+        # `iteration` is how many iterations already ran, for a run resumed from a
+        # checkpoint: max_iterations counts those too
+        self.iteration = iteration
+        self.best_loss = float('inf')
+        self.iterations_without_improvement = 0
+        self.reason = None
+        self.start_time = time.perf_counter()
+
+    @property
+    def elapsed_seconds(self):
+        return time.perf_counter() - self.start_time
+
+    def should_stop(self, loss, gradient=None):
+        self.iteration += 1
+        loss = float(loss)
+
+        if not nmpy.isfinite(loss):
+            self.reason = DIVERGED
+        elif loss <= self.tolerance:
+            self.reason = CONVERGED
+        elif self.stalled(loss):
+            self.reason = STALLED
+        elif (self.gradient_tolerance is not None and gradient is not None
+              and nmpy.linalg.norm(nmpy.ravel(gradient)) <= self.gradient_tolerance):
+            self.reason = SMALL_GRADIENT
+        elif self.max_iterations is not None and self.iteration >= self.max_iterations:
+            self.reason = MAX_ITERATIONS
+        elif self.max_seconds is not None and self.elapsed_seconds >= self.max_seconds:
+            self.reason = TIME_BUDGET
+
+        return self.reason is not None
+
+    def stalled(self, loss):
+        # True when the loss hasn't improved by min_relative_improvement for
+        # `patience` iterations in a row
+        if self.patience is None:
+            return False
+
+        if loss < self.best_loss * (1 - self.min_relative_improvement):
+            self.iterations_without_improvement = 0
+        else:
+            self.iterations_without_improvement += 1
+        self.best_loss = min(self.best_loss, loss)
+
+        return self.iterations_without_improvement >= self.patience
+
+    def summary(self):
+        return "Stopped after {} iterations ({:.3f}s): {}".format(
+            self.iteration, self.elapsed_seconds, self.reason)
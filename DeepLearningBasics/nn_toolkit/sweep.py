@@ -0,0 +1,187 @@
+import csv
+import itertools
+import math
+import multiprocessing
+import time
+
+import numpy as nmpy
+
+from .stopping import DIVERGED, StoppingPolicy
+from .two_layer import TwoLayerNetwork
+
+# Hyperparameter sweeps: instead of editing `alpha` and rerunning the script, every
+# configuration of a search space is trained in a pool of processes. Trials that go
+# nowhere are dropped early with successive halving: all trials get a small number
+# of iterations, the best 1/eta of them get eta times more, and so on until the
+# iteration budget. Trials that diverge or stall stop on their own at any time.
+
+# Status of a trial that can keep training, and of one dropped by successive halving.
+# A finished trial has the StoppingPolicy reason as its status.
+RUNNING = 'running'
+PRUNED = 'pruned'
+
+
+def grid_search(space):
+    # {'alpha': [0.01, 0.1], 'hidden_layer_number_of_nodes': [4, 8]} -> every combination
+    names = list(space)
+    for values in itertools.product(*(space[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def random_search(space, number_of_trials, rng=None):
+    # Every value of `space` is a list to choose from, a (low, high) tuple for a
+    # uniform float, or a function that takes the random generator (see log_uniform)
+    random = rng or nmpy.random
+    for _ in range(number_of_trials):
+        yield {name: sample(values, random) for name, values in space.items()}
+
+
+def sample(values, random):
+    if callable(values):
+        return values(random)
+    if isinstance(values, tuple):
+        low, high = values
+        return float(random.uniform(low, high))
+
+    return values[random.randint(len(values))]
+
+
+def log_uniform(low, high):
+    # For learning rates: as likely to pick 0.001-0.01 as 0.1-1
+    return lambda random: float(nmpy.exp(random.uniform(nmpy.log(low), nmpy.log(high))))
+
+
+# Trainers run one iteration per call to step() and return its error. They are
+# pickled to and from the worker processes between rounds, so they must be
+# defined at module level.
+
+class SingleWeightTrainer:
+    # NeuralNetwork_4_Gradient_desc/gradient_descent_iterative.py
+    def __init__(self, alpha=24, input=0.2, expected_value=8, weight=10):
+        self.alpha = alpha
+        self.input = input
+        self.expected_value = expected_value
+        self.weight = weight
+
+    def step(self):
+        predicted_value = round(self.input * self.weight, 2)
+        derivative = self.input * (predicted_value - self.expected_value)
+        self.weight -= self.alpha * derivative
+
+        return (predicted_value - self.expected_value)**2
+
+
+class TwoLayerTrainer:
+    # NeuralNetwork_8_backpropagation/two_layer_network.py, one epoch per step
+    inputs = nmpy.array([[1, 1, 1],
+                         [1, 1, 0],
+                         [0, 1, 0],
+                         [0, 1, 1]])
+    expected_values = nmpy.array([1, 0, 1, 0])
+
+    def __init__(self, alpha=0.1, hidden_layer_number_of_nodes=4, seed=0):
+        self.network = TwoLayerNetwork(3, hidden_layer_number_of_nodes, alpha,
+                                       rng=nmpy.random.RandomState(seed))
+
+    def step(self):
+        return self.network.train_epoch(self.inputs, self.expected_values)
+
+
+class Trial:
+    def __init__(self, number, config, trainer, stopping):
+        self.number = number
+        self.config = config
+        self.trainer = trainer
+        self.stopping = stopping
+        self.status = RUNNING
+        self.first_loss = None
+        self.loss = float('nan')
+        # Time spent training, without the time spent waiting for a worker
+        self.seconds = 0.0
+
+    @property
+    def iterations(self):
+        return self.stopping.iteration
+
+
+def advance(arguments):
+    # Trains `trial` until it has done `iterations` iterations in total, or stops
+    trial, iterations, divergence_ratio = arguments
+    stopping = trial.stopping
+    stopping.start_time = time.perf_counter() - trial.seconds
+
+    # Diverging trials overflow, that is expected and caught below
+    with nmpy.errstate(all='ignore'):
+        while stopping.iteration < iterations:
+            trial.loss = float(trial.trainer.step())
+            if trial.first_loss is None:
+                trial.first_loss = trial.loss
+
+            if stopping.should_stop(trial.loss):
+                trial.status = stopping.reason
+                break
+            # Catches a diverging trial long before its loss overflows
+            if trial.first_loss > 0 and trial.loss > trial.first_loss * divergence_ratio:
+                trial.status = DIVERGED
+                break
+
+    trial.seconds = stopping.elapsed_seconds
+    return trial
+
+
+def run_sweep(trainer_class, configurations, workers=None, max_iterations=1000, max_seconds=None,
+              min_iterations=10, eta=3, tolerance=0.0, patience=None, divergence_ratio=1e6):
+    # Trains trainer_class(**config) for every configuration and returns the trials,
+    # best loss first. max_iterations and max_seconds are budgets per trial; the
+    # tolerance and patience have the meaning they have in StoppingPolicy.
+    # min_iterations=max_iterations trains every trial to the end, without halving.
+    assert( eta > 1 )
+    trials = [Trial(number, config, trainer_class(**config),
+                    StoppingPolicy(tolerance, patience, max_iterations=max_iterations, max_seconds=max_seconds))
+              for number, config in enumerate(configurations)]
+
+    pool = multiprocessing.Pool(workers) if workers != 1 else None
+    try:
+        running = trials
+        iterations = min(min_iterations, max_iterations)
+        while running:
+            work = [(trial, iterations, divergence_ratio) for trial in running]
+            advanced = pool.map(advance, work, chunksize=1) if pool else list(map(advance, work))
+            for trial in advanced:
+                trials[trial.number] = trial
+
+            # Successive halving: only the best 1/eta of the trials still running go on
+            running = sorted((trial for trial in advanced if trial.status == RUNNING), key=lambda trial: trial.loss)
+            keep = math.ceil(len(running) / eta)
+            for trial in running[keep:]:
+                trial.status = PRUNED
+            running = running[:keep]
+            iterations = min(iterations * eta, max_iterations)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    return sorted(trials, key=lambda trial: (nmpy.nan_to_num(trial.loss, nan=nmpy.inf), trial.number))
+
+
+def result_rows(trials):
+    names = list(trials[0].config) if trials else []
+    yield ['trial'] + names + ['iterations', 'seconds', 'loss', 'status']
+    for trial in trials:
+        yield ([trial.number] + [trial.config[name] for name in names] +
+               [trial.iterations, round(trial.seconds, 4), trial.loss, trial.status])
+
+
+def results_table(trials):
+    # One line per trial, every column as wide as its widest value, ready to print
+    rows = [['{:.4g}'.format(cell) if isinstance(cell, float) else str(cell) for cell in row]
+            for row in result_rows(trials)]
+    widths = [max(len(cell) for cell in column) for column in zip(*rows)]
+
+    return '\n'.join(' '.join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows)
+
+
+def save_results(trials, path):
+    with open(path, 'w', newline='') as results_file:
+        csv.writer(results_file).writerows(result_rows(trials))
@@ -0,0 +1,88 @@
+import numpy as nmpy
+
+
+# These methods run over numpy arrays, exactly like in two_layer_network.py
+def relu(x):
+    return (x > 0) * x
+
+def relu_deriv(prev_output):
+    return prev_output > 0
+
+
+def iterate_minibatches(inputs, expected_values, batch_size, shuffle=False, rng=None):
+    number_of_rows = len(inputs)
+    order = nmpy.arange(number_of_rows)
+    if shuffle:
+        (rng or nmpy.random).shuffle(order)
+
+    for start in range(0, number_of_rows, batch_size):
+        batch_rows = order[start:start + batch_size]
+        yield inputs[batch_rows], expected_values[batch_rows]
+
+
+class TwoLayerNetwork:
+    # Same network as NeuralNetwork_8_backpropagation/two_layer_network.py
+    # (inputs -> relu hidden layer -> single linear output), but every pass runs
+    # over a whole (batch, features) matrix instead of a single input_set.
+    def __init__(self, number_of_inputs, hidden_layer_number_of_nodes=4, alpha=0.1,
+                 decimals=1, weights_1=None, weights_2=None, rng=None, optimizer=None):
+        random = rng or nmpy.random
+        self.alpha = alpha
+        # An optimizer from optimizers.py replaces the plain `weights -= alpha * gradient`
+        self.optimizer = optimizer
+        # The original script rounds every prediction to 1 decimal, use None to skip it
+        self.decimals = decimals
+
+        if weights_1 is None:
+            weights_1 = random.random((number_of_inputs, hidden_layer_number_of_nodes))
+        if weights_2 is None:
+            weights_2 = random.random((hidden_layer_number_of_nodes))
+
+        self.weights_1 = nmpy.array(weights_1, dtype=float)
+        self.weights_2 = nmpy.array(weights_2, dtype=float)
+
+    def forward(self, input_batch):
+        hidden_outputs = relu(input_batch.dot(self.weights_1))
+        predicted_values = hidden_outputs.dot(self.weights_2)
+        if self.decimals is not None:
+            predicted_values = nmpy.round(predicted_values, self.decimals)
+
+        return hidden_outputs, predicted_values
+
+    def predict(self, inputs):
+        return self.forward(nmpy.atleast_2d(inputs))[1]
+
+    def train_batch(self, input_batch, expected_batch):
+        hidden_outputs, predicted_values = self.forward(input_batch)
+
+        # One row of deltas per sample in the batch
+        layer2_delta = predicted_values - expected_batch
+        layer1_delta = nmpy.outer(layer2_delta, self.weights_2) * relu_deriv(hidden_outputs)
+
+        # Averaging over the batch means batch_size=1 is plain SGD, and alpha keeps
+        # the same meaning for bigger batches
+        batch_size = len(input_batch)
+        if self.optimizer is None:
+            self.weights_2 -= (self.alpha / batch_size) * hidden_outputs.T.dot(layer2_delta)
+            self.weights_1 -= (self.alpha / batch_size) * input_batch.T.dot(layer1_delta)
+        else:
+            self.optimizer.step(self.weights_2, hidden_outputs.T.dot(layer2_delta) / batch_size, 'weights_2')
+            self.optimizer.step(self.weights_1, input_batch.T.dot(layer1_delta) / batch_size, 'weights_1')
+
+        return nmpy.sum(layer2_delta ** 2)
+
+    def train_epoch(self, inputs, expected_values, batch_size=1, shuffle=False, rng=None):
+        inputs = nmpy.asarray(inputs, dtype=float)
+        expected_values = nmpy.asarray(expected_values, dtype=float)
+
+        overall_run_error = 0
+        for input_batch, expected_batch in iterate_minibatches(inputs, expected_values,
+                                                               batch_size, shuffle, rng):
+            overall_run_error += self.train_batch(input_batch, expected_batch)
+
+        return overall_run_error
+
+    def fit(self, inputs, expected_values, batch_size=1, epochs=1, shuffle=False, rng=None):
+        # Returns the accumulated error of every epoch
+        return [self.train_epoch(inputs, expected_values, batch_size, shuffle, rng)
+                for _ in range(epochs)]
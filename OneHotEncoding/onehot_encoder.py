@@ -0,0 +1,109 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+UNKNOWN_CATEGORY = '__unknown__'
+
+
+class OneHotEncoder:
+    # A faster, reusable version of strings_to_onehot from OneHotEncodingDemo.ipynb.
+    #
+    # - The vocabulary is a dict category -> column index, built once by fit() and kept
+    #   (it can be saved and loaded), so the same category always gets the same column.
+    # - Columns are sorted, like pd.get_dummies, so the order doesn't depend on `set`.
+    # - transform() encodes a whole column in one vectorized hash lookup.
+    # - handle_unknown decides what happens with categories that weren't seen by fit:
+    #   'error' raises, 'ignore' leaves the row all zeros, 'bucket' adds one extra
+    #   UNKNOWN_CATEGORY column for all of them.
+    def __init__(self, handle_unknown='error', dtype=np.uint8):
+        assert( handle_unknown in ('error', 'ignore', 'bucket') )
+        self.handle_unknown = handle_unknown
+        self.dtype = dtype
+        self.vocabulary = {}
+
+    @property
+    def categories(self):
+        return list(self.vocabulary)
+
+    @property
+    def number_of_columns(self):
+        return len(self.vocabulary) + (self.handle_unknown == 'bucket')
+
+    @property
+    def column_names(self):
+        return self.categories + ([UNKNOWN_CATEGORY] if self.handle_unknown == 'bucket' else [])
+
+    def fit(self, categories_column):
+        self.vocabulary = {}
+        return self.partial_fit(categories_column)
+
+    def partial_fit(self, categories_column):
+        # New categories get the next free columns, existing ones keep their index
+        new_categories = sorted(set(pd.Series(categories_column).dropna().unique()) - set(self.vocabulary))
+        for category in new_categories:
+            self.vocabulary[category] = len(self.vocabulary)
+
+        return self
+
+    def codes(self, categories_column):
+        # The column index of every row, with -1 for unknown categories
+        codes = pd.Categorical(categories_column, categories=self.categories).codes.astype(np.int64)
+
+        unknown_rows = codes < 0
+        if unknown_rows.any():
+            if self.handle_unknown == 'error':
+                unknown_categories = pd.unique(np.asarray(categories_column, dtype=object)[unknown_rows])
+                raise ValueError("Unknown categories: {}".format(list(unknown_categories[:10])))
+            if self.handle_unknown == 'bucket':
+                codes[unknown_rows] = len(self.vocabulary)
+
+        return codes
+
+    def transform(self, categories_column, output='dense'):
+        # output='dense'   -> (rows, columns) matrix of 0/1
+        #        'indices' -> one column index per row, -1 for ignored unknowns
+        #        'csr'     -> scipy.sparse.csr_matrix, one stored 1 per row
+        codes = self.codes(categories_column)
+
+        if output == 'indices':
+            return codes
+        if output == 'csr':
+            return self.codes_to_csr(codes)
+        assert( output == 'dense' )
+
+        one_hot_matrix = np.zeros((len(codes), self.number_of_columns), dtype=self.dtype)
+        known_rows = np.flatnonzero(codes >= 0)
+        one_hot_matrix[known_rows, codes[known_rows]] = 1
+        return one_hot_matrix
+
+    def codes_to_csr(self, codes):
+        try:
+            from scipy import sparse
+        except ImportError:
+            raise ImportError("output='csr' needs scipy, use output='indices' without it")
+
+        known_rows = codes >= 0
+        indptr = np.concatenate([[0], np.cumsum(known_rows)])
+        return sparse.csr_matrix((np.ones(known_rows.sum(), dtype=self.dtype), codes[known_rows], indptr),
+                                 shape=(len(codes), self.number_of_columns))
+
+    def fit_transform(self, categories_column, output='dense'):
+        return self.fit(categories_column).transform(categories_column, output)
+
+    def transform_frame(self, categories_column):
+        # Same result as strings_to_onehot: a DataFrame with one column per category
+        return pd.DataFrame(self.transform(categories_column), columns=self.column_names)
+
+    def save(self, path):
+        with open(path, 'w') as vocabulary_file:
+            json.dump({'handle_unknown': self.handle_unknown, 'categories': self.categories}, vocabulary_file)
+
+    @classmethod
+    def load(cls, path, dtype=np.uint8):
+        with open(path) as vocabulary_file:
+            saved = json.load(vocabulary_file)
+
+        encoder = cls(saved['handle_unknown'], dtype)
+        encoder.vocabulary = {category: index for index, category in enumerate(saved['categories'])}
+        return encoder
@@ -0,0 +1,266 @@
+import csv
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# The cleaning steps of 8_data_cleaning.ipynb (dropna, fillna, drop_duplicates,
+# map(upper), replace) fused into a single pass over the file, one chunk at a time.
+# Every step works in place on the current chunk, so peak memory is about one chunk.
+#
+# Duplicates are found with a 64-bit hash of the key columns. The hashes of every
+# row kept so far are saved next to the output, together with how far into the
+# source file we got, so the next run only cleans the rows appended since then.
+#
+# The state is saved after every chunk, along with the size of the output at that
+# point. An interrupted run loses at most the chunk it was working on: the next run
+# cuts the output back to the saved size and carries on from the saved offset.
+#
+# The column types are inferred from the first chunk, and every later chunk (of this
+# run and of the next ones) is read with the same types: otherwise a column with
+# missing values in one chunk only would be written as 30.0 there and as 30
+# everywhere else. A later chunk that doesn't fit them (a float in an integer
+# column, a word in a True/False column) widens them from then on, to float64 or
+# object. Pass `dtypes` to get the same types in every chunk regardless.
+
+
+class CleaningPipeline:
+    def __init__(self, fill=None, drop_missing=None, upper=None, lower=None, replace=None,
+                 dedupe_on=None, dtypes=None, chunk_bytes=64 * 2 ** 20):
+        # fill:         {column: default}, like frame.fillna({...})
+        # drop_missing: columns that must have a value, rows without one are dropped.
+        #               Runs after `fill`, so it only sees what fill didn't cover.
+        # upper/lower:  columns to turn into upper or lower case
+        # replace:      {column: {old: new}}, like frame[column].replace(old, new)
+        # dedupe_on:    columns that identify a row, or [] for the whole row
+        # dtypes:       {column: dtype} applied after filling, so every chunk agrees
+        self.fill = fill or {}
+        self.drop_missing = drop_missing
+        self.upper = upper or []
+        self.lower = lower or []
+        self.replace = replace or {}
+        self.dedupe_on = dedupe_on
+        self.dtypes = dtypes or {}
+        self.chunk_bytes = chunk_bytes
+
+    def clean_chunk(self, chunk, seen_hashes=None):
+        # Returns the cleaned chunk and the hashes of its kept rows
+        if self.fill:
+            chunk.fillna(self.fill, inplace=True)
+        if self.drop_missing is not None:
+            chunk.dropna(subset=self.drop_missing or None, inplace=True)
+        for column, dtype in self.dtypes.items():
+            chunk[column] = chunk[column].astype(dtype)
+
+        # Deduplicating before the remaining steps saves work on the dropped rows,
+        # but only when those steps don't change the key columns
+        transformed_columns = set(self.upper) | set(self.lower) | set(self.replace)
+        dedupe_first = self.dedupe_on and not transformed_columns & set(self.dedupe_on)
+        hashes = np.array([], dtype=np.uint64)
+        if dedupe_first:
+            chunk, hashes = self.dedupe(chunk, seen_hashes)
+
+        for column in self.upper:
+            chunk[column] = chunk[column].str.upper()
+        for column in self.lower:
+            chunk[column] = chunk[column].str.lower()
+        for column, replacements in self.replace.items():
+            # Nullable columns can't take values of another type, like True -> 'Yes'
+            values = chunk[column].astype(object) if isinstance(chunk[column].dtype, pd.api.extensions.ExtensionDtype) \
+                and not pd.api.types.is_string_dtype(chunk[column].dtype) else chunk[column]
+            chunk[column] = values.replace(list(replacements), list(replacements.values()))
+
+        if self.dedupe_on is not None and not dedupe_first:
+            chunk, hashes = self.dedupe(chunk, seen_hashes)
+        return chunk, hashes
+
+    def dedupe(self, chunk, seen_hashes):
+        hashes = pd.util.hash_pandas_object(chunk[self.dedupe_on] if self.dedupe_on else chunk,
+                                            index=False).to_numpy()
+        # Duplicates inside the chunk, then rows seen in earlier chunks or runs
+        keep = ~pd.Series(hashes).duplicated().to_numpy()
+        if seen_hashes is not None and len(seen_hashes):
+            keep &= ~contains_sorted(seen_hashes, hashes)
+
+        return chunk[keep], hashes[keep]
+
+    def run(self, source_path, output_path, incremental=True):
+        # Cleans source_path into output_path. With incremental=True and an output
+        # from a previous run, only the bytes appended to the source since then are
+        # read. Returns the number of rows written by this run.
+        state = PipelineState(output_path)
+        if not (incremental and state.matches(source_path)):
+            state.reset(source_path)
+            if os.path.exists(output_path):
+                os.remove(output_path)
+
+        # Rows written after the last saved state are written again by this run
+        with open(output_path, 'ab') as output_file:
+            output_file.truncate(state.output_bytes)
+
+        written_rows = 0
+        with open(source_path, 'rb') as source_file, open(output_path, 'a', newline='') as output_file:
+            source_file.seek(state.offset)
+            while True:
+                block = source_file.read(self.chunk_bytes)
+                if not block:
+                    break
+                # Chunks end on a line boundary: the part after the last newline is read
+                # again with the next chunk. At the end of the file, the last line counts
+                # even without a newline (appenders must always write whole lines).
+                lines_end = block.rfind(b'\n') + 1
+                at_end_of_file = source_file.read(1) == b''
+                complete = block if at_end_of_file or lines_end == 0 else block[:lines_end]
+                if lines_end == 0 and not at_end_of_file:
+                    # A single line longer than chunk_bytes, read it whole
+                    source_file.seek(state.offset)
+                    complete = source_file.readline()
+                source_file.seek(state.offset + len(complete))
+
+                chunk = state.read_chunk(complete)
+                chunk, hashes = self.clean_chunk(chunk, state.seen_hashes)
+                chunk.to_csv(output_file, header=state.output_bytes == 0, index=False)
+                output_file.flush()
+
+                written_rows += len(chunk)
+                state.offset += len(complete)
+                state.output_bytes = os.fstat(output_file.fileno()).st_size
+                state.add_hashes(hashes)
+                state.save()
+
+        state.save()
+        return written_rows
+
+
+class PipelineState:
+    # Saved as <output>.state.json (where we stopped in the source, its header, the
+    # column types and the size of the output) and <output>.hashes.<n>.npy (sorted
+    # hashes of the rows already written). Each save writes a new hashes file, then
+    # replaces the state file that names it: a run interrupted during a save finds
+    # the previous state and hashes intact.
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.state_path = output_path + '.state.json'
+        self.source = None
+        self.header = None
+        self.offset = 0
+        self.dtypes = None
+        self.output_bytes = 0
+        self.saves = 0
+        self.seen_hashes = np.array([], dtype=np.uint64)
+
+        if os.path.exists(self.state_path) and os.path.exists(output_path):
+            with open(self.state_path) as state_file:
+                saved = json.load(state_file)
+            self.source, self.header, self.offset = saved['source'], saved['header'], saved['offset']
+            self.dtypes = saved.get('dtypes')
+            self.output_bytes = saved.get('output_bytes', os.path.getsize(output_path))
+            self.saves = saved.get('saves', 0)
+            if os.path.exists(self.hashes_path(self.saves)):
+                self.seen_hashes = np.load(self.hashes_path(self.saves))
+
+    def hashes_path(self, saves):
+        return '{}.hashes.{}.npy'.format(self.output_path, saves)
+
+    @property
+    def columns(self):
+        # Parsed like the data, so quoted names with commas stay whole
+        return next(csv.reader([self.header]))
+
+    def matches(self, source_path):
+        # The source must be the same file, with the same header, that only grew
+        if self.source != os.path.abspath(source_path) or os.path.getsize(source_path) < self.offset:
+            return False
+        return read_header(source_path)[0] == self.header
+
+    def reset(self, source_path):
+        self.source = os.path.abspath(source_path)
+        self.header, self.offset = read_header(source_path)
+        self.dtypes = None
+        self.output_bytes = 0
+        self.seen_hashes = np.array([], dtype=np.uint64)
+
+    def read_chunk(self, data):
+        # Parses `data` with the types of the previous chunks, inferring them from the
+        # first one, and widening them when this chunk doesn't fit
+        try:
+            chunk = pd.read_csv(io.BytesIO(data), header=None, names=self.columns, dtype=self.dtypes)
+            if self.dtypes is not None:
+                return chunk
+        except (TypeError, ValueError):
+            chunk = pd.read_csv(io.BytesIO(data), header=None, names=self.columns)
+
+        self.dtypes = widen_dtypes(self.dtypes, chunk)
+        return chunk.astype(self.dtypes)
+
+    def add_hashes(self, hashes):
+        # `hashes` are unique and not seen yet, so they can go straight into their
+        # sorted positions, which is cheaper than sorting everything again
+        if len(hashes):
+            hashes = np.sort(hashes)
+            self.seen_hashes = np.insert(self.seen_hashes, np.searchsorted(self.seen_hashes, hashes), hashes)
+
+    def save(self):
+        saves = self.saves + 1
+        np.save(self.hashes_path(saves), self.seen_hashes)
+        with open(self.state_path + '.tmp', 'w') as state_file:
+            json.dump({'source': self.source, 'header': self.header, 'offset': self.offset, 'dtypes': self.dtypes,
+                       'output_bytes': self.output_bytes, 'saves': saves}, state_file)
+        os.replace(self.state_path + '.tmp', self.state_path)
+
+        if os.path.exists(self.hashes_path(self.saves)):
+            os.remove(self.hashes_path(self.saves))
+        self.saves = saves
+
+
+def column_dtypes(chunk):
+    # The types read_csv inferred for `chunk`, as {column: dtype name}, made to fit
+    # the later chunks too: integer and True/False columns become their nullable
+    # versions, so that a missing value further on doesn't change their type, and a
+    # column without any value yet is read as text rather than as float.
+    dtypes = {}
+    for column, values in chunk.items():
+        kind = pd.api.types.infer_dtype(values, skipna=True)
+        if values.isna().all():
+            dtypes[column] = 'object'
+        elif kind == 'boolean':
+            dtypes[column] = 'boolean'
+        elif kind == 'integer':
+            dtypes[column] = 'Int64'
+        else:
+            dtypes[column] = str(values.dtype)
+    return dtypes
+
+
+def widen_dtypes(dtypes, chunk):
+    # The types of the previous chunks (None for the first one) made to fit `chunk`
+    # too. Text columns and columns without any value in the chunk fit whatever
+    # type they had.
+    inferred = column_dtypes(chunk)
+    if dtypes is None:
+        return inferred
+
+    widened = {}
+    for column, dtype in dtypes.items():
+        if dtype in (inferred[column], 'object', 'str') or chunk[column].isna().all():
+            widened[column] = dtype
+        elif {dtype, inferred[column]} <= {'Int64', 'float64'}:
+            widened[column] = 'float64'
+        else:
+            widened[column] = 'object'
+    return widened
+
+
+def read_header(path):
+    # The header line and the byte offset where the data starts
+    with open(path, 'rb') as source_file:
+        header = source_file.readline()
+    return header.decode().strip(), len(header)
+
+
+def contains_sorted(sorted_values, values):
+    # np.isin for a sorted array: a binary search per value, no sorting
+    positions = np.minimum(np.searchsorted(sorted_values, values), len(sorted_values) - 1)
+    return sorted_values[positions] == values
@@ -0,0 +1,157 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# A columnar directory stores every column of a DataFrame in its own .npy file,
+# plus a small columns.json describing them. Numeric columns are saved as they
+# are, text and categorical columns as integer codes plus a JSON list of categories.
+# Loading memory-maps the .npy files, so reading it back needs no parsing at all,
+# and columns that aren't requested are never touched. An index other than the
+# default 0..n-1 (like read_csv(index_col=...) makes) is stored as columns too.
+# Dates (like read_csv(parse_dates=...) makes) are saved as datetime64 .npy files.
+MANIFEST = 'columns.json'
+
+
+def json_value(value):
+    # json.dump's `default`: numpy scalars become Python scalars. Anything else
+    # can't be stored faithfully, and saving fails with a TypeError.
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError("Object of type {} is not JSON serializable".format(type(value).__name__))
+
+
+def categories_kind(categories):
+    if isinstance(categories, pd.DatetimeIndex):
+        return 'datetime'
+    if isinstance(categories, pd.TimedeltaIndex):
+        return 'timedelta'
+    return 'plain'
+
+
+def categories_to_json(categories):
+    # Dates and durations as ISO strings, restore_categories turns them back
+    if categories_kind(categories) != 'plain':
+        return [value.isoformat() for value in categories]
+    return list(categories)
+
+
+def restore_categories(categories, kind, dtype=None):
+    # Back from categories_to_json, with the original unit and time zone
+    if kind == 'datetime':
+        dtype = pd.api.types.pandas_dtype(dtype)
+        values = pd.to_datetime(categories, format='ISO8601', utc=True)
+        values = values.tz_convert(dtype.tz) if getattr(dtype, 'tz', None) else values.tz_localize(None)
+        return values.as_unit(getattr(dtype, 'unit', None) or np.datetime_data(dtype)[0])
+    if kind == 'timedelta':
+        return pd.to_timedelta(categories).as_unit(np.datetime_data(dtype)[0])
+    return categories
+
+
+def has_default_index(frame):
+    return isinstance(frame.index, pd.RangeIndex) and frame.index.start == 0 and frame.index.step == 1 \
+        and frame.index.name is None
+
+
+def save_columnar(frame, directory, source=None):
+    # `source` is anything JSON can store describing where the frame came from,
+    # kept in the manifest for the caller to check (see read_manifest)
+    os.makedirs(directory, exist_ok=True)
+    manifest = {'columns': [], 'rows': len(frame)}
+    if source is not None:
+        manifest['source'] = source
+
+    if not has_default_index(frame):
+        index_names = list(frame.index.names)
+        frame = frame.reset_index()
+        manifest['index'] = {'columns': list(frame.columns[:len(index_names)]), 'names': index_names}
+
+    for position, name in enumerate(frame.columns):
+        column = frame[name]
+        entry = {'name': name, 'file': 'column_{}.npy'.format(position)}
+
+        if isinstance(column.dtype, pd.DatetimeTZDtype):
+            # Saved in UTC, the time zone goes back on when loading
+            entry['kind'] = 'datetime'
+            entry['timezone'] = str(column.dt.tz)
+            values = column.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy()
+        elif pd.api.types.is_datetime64_dtype(column.dtype) or pd.api.types.is_timedelta64_dtype(column.dtype):
+            entry['kind'] = 'datetime'
+            values = column.to_numpy()
+        elif isinstance(column.dtype, pd.CategoricalDtype) or not pd.api.types.is_numeric_dtype(column.dtype):
+            categorical = column.astype('category')
+            categories = categorical.cat.categories
+            # In a file of their own: a column with a million distinct names would
+            # otherwise slow down reading the manifest, even for the other columns
+            entry['categories'] = 'column_{}.categories.json'.format(position)
+            entry['categories_kind'] = categories_kind(categories)
+            entry['categories_dtype'] = str(categories.dtype)
+            with open(os.path.join(directory, entry['categories']), 'w') as categories_file:
+                json.dump(categories_to_json(categories), categories_file, default=json_value)
+            entry['kind'] = 'category' if isinstance(column.dtype, pd.CategoricalDtype) else 'text'
+            entry['dtype'] = str(column.dtype)
+            values = categorical.cat.codes.to_numpy()
+        else:
+            entry['kind'] = 'numeric'
+            values = column.to_numpy()
+
+        np.save(os.path.join(directory, entry['file']), values)
+        manifest['columns'].append(entry)
+
+    # The manifest goes last, so a directory without one is an incomplete cache
+    with open(os.path.join(directory, MANIFEST), 'w') as manifest_file:
+        json.dump(manifest, manifest_file, default=json_value)
+
+
+def read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST)) as manifest_file:
+        manifest = json.load(manifest_file)
+    index_columns = manifest.get('index', {}).get('columns', [])
+
+    return manifest, index_columns
+
+
+def data_columns(manifest, index_columns):
+    return [entry['name'] for entry in manifest['columns'] if entry['name'] not in index_columns]
+
+
+def columnar_columns(directory):
+    return data_columns(*read_manifest(directory))
+
+
+def load_columnar(directory, columns=None, mmap=True):
+    manifest, index_columns = read_manifest(directory)
+
+    entries = {entry['name']: entry for entry in manifest['columns']}
+    data = {}
+    for name in index_columns + list(columns or data_columns(manifest, index_columns)):
+        entry = entries[name]
+        values = np.load(os.path.join(directory, entry['file']), mmap_mode='r' if mmap else None)
+
+        if entry['kind'] == 'numeric':
+            data[name] = values
+        elif entry['kind'] == 'datetime':
+            data[name] = values
+            if 'timezone' in entry:
+                data[name] = pd.DatetimeIndex(values).tz_localize('UTC').tz_convert(entry['timezone'])
+        else:
+            categories = entry['categories']
+            # Directories written before the categories moved out of the manifest
+            if not isinstance(categories, list):
+                with open(os.path.join(directory, categories)) as categories_file:
+                    categories = json.load(categories_file)
+            categories = restore_categories(categories, entry.get('categories_kind', 'plain'),
+                                            entry.get('categories_dtype'))
+            column = pd.Categorical.from_codes(values, categories)
+            if entry['kind'] == 'category':
+                data[name] = column
+            else:
+                # Text columns go back to their original dtype (object or str)
+                data[name] = pd.Series(np.asarray(column, dtype=object), dtype=entry['dtype'])
+
+    frame = pd.DataFrame(data, columns=list(data))
+    if index_columns:
+        frame = frame.set_index(index_columns)
+        frame.index.names = manifest['index']['names']
+    return frame
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from columnar import MANIFEST, columnar_columns, load_columnar, save_columnar
+
+# A cache in front of pd.read_csv/pd.read_table. The first time a file is read
+# with a given set of options it is parsed as usual, and the resulting columns are
+# saved in the columnar format (columnar.py). Later reads of the same file with the
+# same options memory-map the saved columns instead of parsing the text again.
+#
+# An entry is identified by the file's path, modification time and size, plus the
+# reader and its options: a file that changed, or the same file read another way,
+# is a miss. When the cache grows over max_bytes, the least recently used entries
+# are deleted. Options that can't be described the same way on every call (a lambda
+# converter, a callable usecols) can't be part of a key: such reads aren't cached.
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser('~'), '.cache', 'pandas_basics')
+
+
+class DatasetCache:
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_bytes=2 ** 30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def read_csv(self, path, columns=None, **options):
+        return self.load(path, 'read_csv', columns, **options)
+
+    def read_table(self, path, columns=None, **options):
+        return self.load(path, 'read_table', columns, **options)
+
+    def key(self, path, reader, options):
+        # None when the options can't be described in a stable way
+        file_status = os.stat(path)
+        try:
+            description = json.dumps({'path': os.path.abspath(path), 'mtime': file_status.st_mtime_ns,
+                                      'size': file_status.st_size, 'reader': reader, 'options': options},
+                                     sort_keys=True, default=option_value)
+        except TypeError:
+            return None
+        return hashlib.sha1(description.encode()).hexdigest()
+
+    def load(self, path, reader='read_csv', columns=None, **options):
+        # Same result as getattr(pd, reader)(path, **options)[columns], or the whole
+        # frame without `columns`. Only the requested columns are read from the cache.
+        key = self.key(path, reader, options)
+        entry = key and os.path.join(self.directory, key)
+
+        if entry and os.path.exists(os.path.join(entry, MANIFEST)):
+            self.hits += 1
+            # The entry's modification time is its last use, for the LRU eviction
+            os.utime(entry)
+            # Index columns aren't columns of the frame, frame[columns] below
+            # rejects them just like it does after a miss
+            stored_columns = columnar_columns(entry)
+            frame = load_columnar(entry, [column for column in columns if column in stored_columns]
+                                  if columns else None)
+        else:
+            self.misses += 1
+            frame = getattr(pd, reader)(path, **options)
+            if entry:
+                self.store(frame, entry)
+                self.evict()
+
+        return frame[columns] if columns else frame
+
+    def store(self, frame, entry):
+        # Written to a temporary directory and renamed into place, so other
+        # processes never see a half-written entry. Returns whether it was stored:
+        # when another process stored the same entry first, or the frame holds
+        # values the columnar format can't save, the frame is just not cached.
+        partial = tempfile.mkdtemp(dir=self.directory, prefix='.partial-')
+        try:
+            save_columnar(frame, partial)
+            os.rename(partial, entry)
+            return True
+        except Exception:
+            shutil.rmtree(partial, ignore_errors=True)
+            return False
+
+    def entries(self):
+        # (last use, bytes, path) of every complete entry
+        entries = []
+        for name in os.listdir(self.directory):
+            entry = os.path.join(self.directory, name)
+            if name.startswith('.') or not os.path.isdir(entry):
+                continue
+            size = sum(os.path.getsize(os.path.join(entry, file_name)) for file_name in os.listdir(entry))
+            entries.append((os.path.getmtime(entry), size, entry))
+
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        for _, _, entry in self.entries():
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+def option_value(value):
+    # json.dumps' `default` for the options: types and dtypes by name, sets sorted.
+    # Anything else (functions, open files...) has no description that stays the
+    # same from one call to the next.
+    if isinstance(value, type):
+        return '{}.{}'.format(value.__module__, value.__qualname__)
+    if isinstance(value, (np.dtype, pd.api.extensions.ExtensionDtype)):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    raise TypeError("Object of type {} can't be part of a cache key".format(type(value).__name__))
+
+
+_default_cache = None
+
+def default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = DatasetCache()
+    return _default_cache
+
+
+# Drop-in replacements for pd.read_csv/pd.read_table that go through the default cache
+def read_csv(path, columns=None, **options):
+    return default_cache().read_csv(path, columns, **options)
+
+
+def read_table(path, columns=None, **options):
+    return default_cache().read_table(path, columns, **options)
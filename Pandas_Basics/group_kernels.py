@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+
+# Group-wise operations without calling Python once per group. Rows are sorted by
+# group a single time, so every group becomes a contiguous slice, and the per-group
+# work is done by numpy over the whole column at once (np.ufunc.reduceat and
+# friends) instead of by groupby().apply on one sub-DataFrame at a time.
+
+
+class SortedGroups:
+    # The rows of `frame` sorted by the `by` column(s), plus where each group starts
+    def __init__(self, frame, by, sort_within=None):
+        self.frame = frame
+        self.by = by
+        codes, self.keys = pd.factorize(frame[by] if isinstance(by, str) else
+                                        pd.MultiIndex.from_frame(frame[by]), sort=True)
+
+        # np.lexsort sorts by the last key first: groups, then `sort_within` inside them
+        sort_keys = [codes]
+        if sort_within is not None:
+            sort_keys.insert(0, frame[sort_within].to_numpy())
+        self.order = np.lexsort(sort_keys)
+
+        sorted_codes = codes[self.order]
+        self.starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        self.ends = np.r_[self.starts[1:], len(sorted_codes)]
+        self.group_codes = sorted_codes[self.starts]
+        # Rows with a missing key get code -1 and are dropped, like groupby does
+        if len(self.group_codes) and self.group_codes[0] == -1:
+            self.starts, self.ends, self.group_codes = self.starts[1:], self.ends[1:], self.group_codes[1:]
+
+    @property
+    def index(self):
+        index = self.keys[self.group_codes]
+        return index if isinstance(index, pd.MultiIndex) else pd.Index(index, name=self.by)
+
+    @property
+    def first_row(self):
+        return self.starts[0] if len(self.starts) else 0
+
+    @property
+    def last_row(self):
+        return self.ends[-1] if len(self.ends) else 0
+
+    def sorted_values(self, column):
+        return self.frame[column].to_numpy()[self.order]
+
+    def reduce(self, column, ufunc=np.add, transform=None):
+        values = self.sorted_values(column)[self.first_row:]
+        if transform is not None:
+            values = transform(values)
+        if not len(self.starts):
+            return values[:0]
+
+        return ufunc.reduceat(values, self.starts - self.first_row)
+
+
+def top_n(frame, by, attribute, n=2):
+    # Same rows as frame.groupby(by).apply(lambda df: df.sort_values(attribute)[-n:]),
+    # with the same (group, original index) MultiIndex, from one lexsort. Ties keep
+    # their original order (a stable sort). The grouping columns are kept, even though
+    # newer pandas versions drop them from the result of apply.
+    groups = SortedGroups(frame, by, sort_within=attribute)
+
+    # Keep the last n sorted rows of every group. Rows with a missing key sort first
+    # and don't belong to any group, so positions start at the first group.
+    positions = np.arange(groups.first_row, groups.last_row)
+    group_ends = np.repeat(groups.ends, groups.ends - groups.starts)
+    selected = positions[group_ends - positions <= n]
+
+    rows = groups.order[selected]
+    result = frame.iloc[rows]
+    group_keys = np.repeat(groups.index, np.minimum(groups.ends - groups.starts, n))
+    names = [by] if isinstance(by, str) else list(by)
+    result.index = pd.MultiIndex.from_arrays(
+        [group_keys.get_level_values(level) for level in range(len(names))] + [frame.index[rows]],
+        names=names + [frame.index.name])
+    return result
+
+
+def sum_of_squares(frame, by, columns=None):
+    # The sum_of_squares of 10_group_operations.ipynb for every group and column
+    return group_reduce(frame, by, np.add, columns, transform=np.square)
+
+
+def group_reduce(frame, by, ufunc=np.add, columns=None, transform=None):
+    # Any binary numpy ufunc works: np.add (sum), np.multiply (product),
+    # np.maximum, np.minimum, np.logical_or... `transform` is applied to the whole
+    # column first, np.square turns a sum into a sum of squares.
+    groups = SortedGroups(frame, by)
+    by_columns = [by] if isinstance(by, str) else list(by)
+    columns = columns or [column for column in frame.columns if column not in by_columns]
+
+    return pd.DataFrame({column: groups.reduce(column, ufunc, transform) for column in columns},
+                        index=groups.index)
+
+
+def present_count(values):
+    return (~pd.isna(values)).astype(np.int64)
+
+
+def sum_present(values):
+    return np.where(pd.isna(values), 0, values).astype(float)
+
+
+def group_mean(frame, by, columns=None):
+    # Same as frame.groupby(by).mean(): missing values are skipped, and a group
+    # without any value in a column gets NaN there
+    groups = SortedGroups(frame, by)
+    by_columns = [by] if isinstance(by, str) else list(by)
+    columns = columns or [column for column in frame.columns if column not in by_columns]
+
+    means = {}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for column in columns:
+            means[column] = groups.reduce(column, np.add, sum_present) / groups.reduce(column, np.add, present_count)
+    return pd.DataFrame(means, index=groups.index)
@@ -0,0 +1,214 @@
+import numpy as np
+import pandas as pd
+
+# Statistics that are updated chunk by chunk instead of recomputed over the whole
+# data: count, mean, var/std (Welford/Chan), min and max are exact, the median and
+# other quantiles come from a KLL sketch that keeps a bounded number of values.
+# Accumulators built on different chunks or processes can be merged, and give the
+# same result as one accumulator that saw all the data. Missing values are skipped,
+# like in pandas.
+
+
+class QuantileSketch:
+    # KLL sketch (Karnin, Lang, Liberty). Level h keeps values that stand for 2**h
+    # original values each. When a level gets too big it is sorted and every other
+    # value moves up a level, so memory stays around 3 * k values and the rank
+    # error is roughly 1.7 / k.
+    def __init__(self, k=200, rng=None):
+        self.k = k
+        self.levels = [np.array([], dtype=np.float64)]
+        self.rng = rng or np.random.RandomState()
+
+    def capacity(self, level):
+        height = len(self.levels)
+        return max(int(np.ceil(self.k * (2 / 3) ** (height - level - 1))), 2)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        self.levels[0] = np.concatenate([self.levels[0], values[~np.isnan(values)]])
+        self.compress()
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.array([], dtype=np.float64))
+        for level, values in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], values])
+        self.compress()
+        return self
+
+    def compress(self):
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) > self.capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.array([], dtype=np.float64))
+                values = np.sort(self.levels[level])
+                # An odd value out stays at this level, the rest is halved
+                leftover, values = values[:len(values) % 2], values[len(values) % 2:]
+                promoted = values[self.rng.randint(2)::2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self.levels[level] = leftover
+            level += 1
+
+    def quantile(self, q):
+        values = np.concatenate(self.levels)
+        if not len(values):
+            return np.nan
+        weights = np.concatenate([np.full(len(values), 2.0 ** level) for level, values in enumerate(self.levels)])
+        order = np.argsort(values)
+        cumulative = np.cumsum(weights[order])
+        return values[order][np.searchsorted(cumulative, q * cumulative[-1])]
+
+
+class RunningStats:
+    # One accumulator per column. update() takes a 1-D array, a 2-D array with one
+    # column per statistic, or a DataFrame. The first DataFrame chooses the columns
+    # (its numeric ones), later ones are matched to them by name, in any order.
+    def __init__(self, quantiles=True, k=200):
+        self.quantiles = quantiles
+        self.k = k
+        self.start([])
+
+    def start(self, columns):
+        number_of_columns = len(columns)
+        self.columns = columns
+        self.count = np.zeros(number_of_columns)
+        self.mean_ = np.zeros(number_of_columns)
+        self.m2 = np.zeros(number_of_columns)
+        self.min_ = np.full(number_of_columns, np.inf)
+        self.max_ = np.full(number_of_columns, -np.inf)
+        self.sketches = [QuantileSketch(self.k) for _ in columns] if self.quantiles else None
+
+    def update(self, chunk):
+        values, columns = as_matrix(chunk, self.columns)
+        if not len(self.columns):
+            self.start(columns)
+
+        count = np.sum(~np.isnan(values), axis=0).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.nansum(values, axis=0) / count
+        m2 = np.nansum((values - mean) ** 2, axis=0)
+        minimum = np.nanmin(values, axis=0, initial=np.inf, where=~np.isnan(values))
+        maximum = np.nanmax(values, axis=0, initial=-np.inf, where=~np.isnan(values))
+        self.combine(count, np.nan_to_num(mean), m2, minimum, maximum)
+
+        if self.quantiles:
+            for column, sketch in enumerate(self.sketches):
+                sketch.update(values[:, column])
+        return self
+
+    def combine(self, count, mean, m2, minimum, maximum):
+        # Chan et al. parallel update of (count, mean, M2), the same formula for
+        # adding a chunk and for merging two accumulators
+        total = self.count + count
+        delta = mean - self.mean_
+        with np.errstate(invalid='ignore', divide='ignore'):
+            share = np.where(total > 0, count / total, 0)
+            self.m2 = self.m2 + m2 + delta ** 2 * self.count * share
+        self.mean_ = self.mean_ + delta * share
+        self.count = total
+        self.min_ = np.minimum(self.min_, minimum)
+        self.max_ = np.maximum(self.max_, maximum)
+
+    def merge(self, other):
+        if not len(other.columns):
+            return self
+        if not len(self.columns):
+            self.start(other.columns)
+        self.combine(other.count, other.mean_, other.m2, other.min_, other.max_)
+        if self.quantiles and other.quantiles:
+            for sketch, other_sketch in zip(self.sketches, other.sketches):
+                sketch.merge(other_sketch)
+        return self
+
+    def result(self, values):
+        return pd.Series(np.where(self.count > 0, values, np.nan), index=self.columns)
+
+    def mean(self):
+        return self.result(self.mean_)
+
+    def var(self, ddof=1):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.result(np.where(self.count > ddof, self.m2 / (self.count - ddof), np.nan))
+
+    def std(self, ddof=1):
+        return np.sqrt(self.var(ddof))
+
+    def min(self):
+        return self.result(self.min_)
+
+    def max(self):
+        return self.result(self.max_)
+
+    def quantile(self, q):
+        return self.result([sketch.quantile(q) for sketch in self.sketches])
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def describe(self):
+        # The rows of DataFrame.describe() that can be computed incrementally
+        rows = {'count': self.result(self.count), 'mean': self.mean(), 'std': self.std(), 'min': self.min()}
+        if self.quantiles:
+            rows.update({'25%': self.quantile(0.25), '50%': self.median(), '75%': self.quantile(0.75)})
+        rows['max'] = self.max()
+        return pd.DataFrame(rows).T
+
+
+class GroupedStats:
+    # A RunningStats per group (like frame.groupby(by)), updated from chunks that
+    # may contain any mix of groups. Answering a query for a group never rescans data.
+    def __init__(self, by, quantiles=True, k=200):
+        self.by = by
+        self.quantiles = quantiles
+        self.k = k
+        self.groups = {}
+
+    def update(self, frame):
+        for group, rows in frame.groupby(self.by, sort=False):
+            if group not in self.groups:
+                self.groups[group] = RunningStats(self.quantiles, self.k)
+            self.groups[group].update(rows.drop(columns=self.by))
+        return self
+
+    def merge(self, other):
+        for group, stats in other.groups.items():
+            if group not in self.groups:
+                self.groups[group] = RunningStats(self.quantiles, self.k)
+            self.groups[group].merge(stats)
+        return self
+
+    def __getitem__(self, group):
+        return self.groups[group]
+
+    def statistic(self, name, *args):
+        # One row per group, like frame.groupby(by).<name>()
+        return pd.DataFrame({group: getattr(stats, name)(*args) for group, stats in sorted(self.groups.items())}).T \
+            .rename_axis(self.by)
+
+
+def as_matrix(chunk, columns=None):
+    # (values, columns) of a chunk. With `columns` (those of the previous chunks), a
+    # DataFrame must have all of them, numeric, and its values come in their order.
+    if isinstance(chunk, pd.DataFrame):
+        if not columns:
+            numeric = chunk.select_dtypes('number')
+            return numeric.to_numpy(dtype=np.float64), list(numeric.columns)
+
+        missing = [column for column in columns if column not in chunk.columns]
+        if missing:
+            raise KeyError("chunk has no column {}".format(", ".join(map(repr, missing))))
+        selected = chunk[columns]
+        for column, dtype in selected.dtypes.items():
+            if not pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+                raise TypeError("column {!r} is not numeric in this chunk ({})".format(column, dtype))
+        return selected.to_numpy(dtype=np.float64), list(columns)
+    if isinstance(chunk, pd.Series):
+        return chunk.to_numpy(dtype=np.float64)[:, None], [chunk.name]
+
+    values = np.asarray(chunk, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    if columns and values.shape[1] != len(columns):
+        raise ValueError("expected {} columns, got {}".format(len(columns), values.shape[1]))
+    return values, list(range(values.shape[1]))
@@ -0,0 +1,174 @@
+import os
+import pickle
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Joins in the style of pd.merge(left, right, on=..., how=...) for tables that don't
+# fit in memory. Both sides come in as chunks (a DataFrame, a CSV path or any
+# iterable of DataFrames) and the result goes out as a generator of chunks.
+#
+# Every row carries its original position in a hidden column, so collect() can put
+# the rows back in the exact order pd.merge would produce.
+#
+# Numeric keys are hashed as float64, whatever their dtype: read_csv(chunksize=...)
+# infers int64 for a chunk of whole numbers and float64 for one with a missing key,
+# and the two sides may differ the same way, but 3 and 3.0 must meet in the same
+# partition. Large integers that round to the same float only share a partition,
+# pd.merge still compares the exact values.
+LEFT_ROW = '__left_row'
+RIGHT_ROW = '__right_row'
+
+
+def as_chunks(data, chunk_rows=1000000):
+    if isinstance(data, pd.DataFrame):
+        return (data.iloc[start:start + chunk_rows] for start in range(0, max(len(data), 1), chunk_rows))
+    if isinstance(data, str):
+        return pd.read_csv(data, chunksize=chunk_rows)
+    return data
+
+
+def with_row_numbers(chunks, column):
+    next_row = 0
+    for chunk in chunks:
+        chunk = chunk.copy()
+        chunk[column] = np.arange(next_row, next_row + len(chunk))
+        next_row += len(chunk)
+        yield chunk
+
+
+def hashable_keys(keys):
+    if isinstance(keys, pd.DataFrame):
+        return keys.apply(hashable_keys)
+    if pd.api.types.is_numeric_dtype(keys.dtype) and not pd.api.types.is_bool_dtype(keys.dtype):
+        return keys.astype(np.float64)
+    return keys
+
+
+def partition_numbers(keys, number_of_partitions):
+    hashes = pd.util.hash_pandas_object(hashable_keys(keys), index=False).to_numpy()
+    return (hashes % number_of_partitions).astype(np.int64)
+
+
+def hash_partition(chunks, on, number_of_partitions, directory):
+    # Appends the rows of every chunk to partition_<n>.pickle according to the hash
+    # of their key, and returns an empty frame with the columns and dtypes seen
+    schema = None
+    os.makedirs(directory, exist_ok=True)
+    for chunk in chunks:
+        if schema is None:
+            schema = chunk.iloc[:0]
+
+        partitions = partition_numbers(chunk[on], number_of_partitions)
+        for partition, rows in chunk.groupby(partitions, sort=False):
+            with open(os.path.join(directory, 'partition_{}.pickle'.format(partition)), 'ab') as partition_file:
+                pickle.dump(rows, partition_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    return schema
+
+
+def read_partition(directory, partition, schema):
+    path = os.path.join(directory, 'partition_{}.pickle'.format(partition))
+    if not os.path.exists(path):
+        return schema
+
+    pieces = []
+    with open(path, 'rb') as partition_file:
+        while True:
+            try:
+                pieces.append(pickle.load(partition_file))
+            except EOFError:
+                break
+
+    return pd.concat(pieces, ignore_index=True)
+
+
+def partitioned_join(left, right, on, how='inner', number_of_partitions=64, directory=None, chunk_rows=1000000):
+    # Grace hash join: both inputs are split by hash(key) into partitions on disk,
+    # then every pair of matching partitions is joined in memory, one at a time.
+    # Peak memory is about one partition of each side.
+    assert( how in ('inner', 'left', 'right', 'outer') )
+    work_directory = tempfile.mkdtemp(dir=directory)
+    try:
+        left_directory = os.path.join(work_directory, 'left')
+        right_directory = os.path.join(work_directory, 'right')
+        left_schema = hash_partition(with_row_numbers(as_chunks(left, chunk_rows), LEFT_ROW),
+                                     on, number_of_partitions, left_directory)
+        right_schema = hash_partition(with_row_numbers(as_chunks(right, chunk_rows), RIGHT_ROW),
+                                      on, number_of_partitions, right_directory)
+
+        empty = True
+        for partition in range(number_of_partitions):
+            left_rows = read_partition(left_directory, partition, left_schema)
+            right_rows = read_partition(right_directory, partition, right_schema)
+            if len(left_rows) == 0 and len(right_rows) == 0:
+                continue
+
+            joined = pd.merge(left_rows, right_rows, on=on, how=how)
+            if len(joined):
+                empty = False
+                yield joined
+
+        # Nothing matched: an empty chunk still tells collect() the result's columns
+        if empty and left_schema is not None and right_schema is not None:
+            yield pd.merge(left_schema, right_schema, on=on, how=how)
+    finally:
+        shutil.rmtree(work_directory, ignore_errors=True)
+
+
+def probe_join(left, right, on, how='inner', chunk_rows=1000000):
+    # When `right` fits in memory there's no need for partitions: every chunk of
+    # `left` is merged against it as it streams by. For 'right' and 'outer' joins
+    # we remember which right rows found a match, and the ones that never did are
+    # emitted at the end, with missing values for the left columns.
+    assert( how in ('inner', 'left', 'right', 'outer') )
+    right = right.copy()
+    right[RIGHT_ROW] = np.arange(len(right))
+    matched = np.zeros(len(right), dtype=bool)
+    probe_how = 'left' if how in ('left', 'outer') else 'inner'
+
+    left_schema = None
+    empty = True
+    for chunk in with_row_numbers(as_chunks(left, chunk_rows), LEFT_ROW):
+        if left_schema is None:
+            left_schema = chunk.iloc[:0]
+
+        joined = pd.merge(chunk, right, on=on, how=probe_how)
+        if how in ('right', 'outer'):
+            matched[joined[RIGHT_ROW].dropna().to_numpy(dtype=np.int64)] = True
+        if len(joined):
+            empty = False
+            yield joined
+
+    if how in ('right', 'outer') and not matched.all():
+        unmatched = right[~matched]
+        if left_schema is None:
+            yield unmatched
+        else:
+            yield pd.merge(left_schema, unmatched, on=on, how='right')
+    elif empty and left_schema is not None:
+        # Nothing matched: an empty chunk still tells collect() the result's columns
+        yield pd.merge(left_schema, right.iloc[:0], on=on, how=probe_how)
+
+
+def collect(result_chunks, on, how='inner'):
+    # Concatenates the result chunks in the same row order as pd.merge: left order
+    # for inner and left joins, right order for right joins, sorted keys for outer.
+    # The join functions above yield an empty chunk with the columns when no row
+    # matched, so only a join of two inputs without any chunk gives a bare frame.
+    chunks = list(result_chunks)
+    if not chunks:
+        return pd.DataFrame()
+
+    result = pd.concat(chunks, ignore_index=True)
+    if how == 'right':
+        order = [RIGHT_ROW, LEFT_ROW]
+    elif how == 'outer':
+        order = ([on] if isinstance(on, str) else list(on)) + [LEFT_ROW, RIGHT_ROW]
+    else:
+        order = [LEFT_ROW, RIGHT_ROW]
+
+    result = result.sort_values(order, kind='stable', na_position='last')
+    return result.drop(columns=[LEFT_ROW, RIGHT_ROW]).reset_index(drop=True)
@@ -0,0 +1,147 @@
+import concurrent.futures
+import io
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from columnar import MANIFEST, load_columnar, read_manifest, save_columnar
+
+# The schema of poke_data.csv (Name,HP,Attack,...,Type). Stats fit comfortably in
+# int16 and Type has a handful of values, so it is stored as a category: a frame
+# with this schema takes a fraction of the memory pd.read_csv would use.
+POKE_SCHEMA = {
+    'Name': 'object',
+    'HP': 'int16',
+    'Attack': 'int16',
+    'Defense': 'int16',
+    'Sp_Atk': 'int16',
+    'Sp_Def': 'int16',
+    'Speed': 'int16',
+    'Type': 'category',
+}
+
+# Files like poke_data.csv pad their fields with spaces and tabs: "Pikachu", 35	, 55
+# Tabs never carry data in this schema, so they are simply deleted. Spaces before a
+# comma or a newline are removed here, the ones after a comma by skipinitialspace.
+# bytes.translate/replace run in C, much faster than a regular expression.
+def clean_whitespace(data):
+    data = data.translate(None, b'\t')
+    for padding, replacement in ((b' ,', b','), (b' \n', b'\n')):
+        while padding in data:
+            data = data.replace(padding, replacement)
+
+    return data
+
+
+def parse_chunk(data, schema=POKE_SCHEMA):
+    # Parses raw CSV bytes without a header into a frame with the schema dtypes
+    return pd.read_csv(io.BytesIO(clean_whitespace(data)), header=None, names=list(schema),
+                       dtype=schema, quotechar='"', skipinitialspace=True)
+
+
+def read_range(path, start, end, schema=POKE_SCHEMA):
+    with open(path, 'rb') as csv_file:
+        csv_file.seek(start)
+        return parse_chunk(csv_file.read(end - start), schema)
+
+
+def chunk_ranges(path, chunk_bytes):
+    # Byte ranges of roughly chunk_bytes each, cut right after a newline so that no
+    # line is split between two chunks. The first range starts after the header.
+    file_size = os.path.getsize(path)
+    with open(path, 'rb') as csv_file:
+        csv_file.readline()
+        start = csv_file.tell()
+
+        while start < file_size:
+            csv_file.seek(min(start + chunk_bytes, file_size))
+            csv_file.readline()
+            end = min(csv_file.tell(), file_size)
+            yield start, end
+            start = end
+
+
+def iter_chunks(path, chunk_bytes=64 * 2 ** 20, workers=None, schema=POKE_SCHEMA):
+    # Yields one DataFrame per chunk, in file order. Chunks are parsed in a pool of
+    # `workers` processes, with at most 2 * workers chunks in flight, so memory
+    # stays bounded even when the consumer is slower than the parsers.
+    workers = workers or os.cpu_count()
+    ranges = chunk_ranges(path, chunk_bytes)
+
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        in_flight = []
+        for start, end in ranges:
+            in_flight.append(executor.submit(read_range, path, start, end, schema))
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.pop(0).result()
+
+        for future in in_flight:
+            yield future.result()
+
+
+def concat_chunks(chunks):
+    # pd.concat turns categoricals with different categories into objects,
+    # union_categoricals keeps them as (a single) category
+    chunks = list(chunks)
+    if not chunks:
+        return pd.DataFrame()
+
+    frame = pd.concat(chunks, ignore_index=True)
+    for name in chunks[0].columns:
+        if isinstance(chunks[0][name].dtype, pd.CategoricalDtype):
+            frame[name] = union_categoricals([chunk[name] for chunk in chunks])
+
+    return frame
+
+
+def load_pokes(path, chunk_bytes=64 * 2 ** 20, workers=None, schema=POKE_SCHEMA, cache_directory=None):
+    # Loads the whole file into one DataFrame. With cache_directory, the parsed
+    # columns are saved there, and later calls read them back (memory-mapped)
+    # instead of parsing the file again, as long as neither the file nor the schema
+    # changed.
+    if cache_directory and cache_is_fresh(path, cache_directory, schema):
+        return load_columnar(cache_directory)
+
+    frame = concat_chunks(iter_chunks(path, chunk_bytes, workers, schema))
+
+    if cache_directory:
+        store_cache(frame, cache_directory, cache_source(path, schema))
+    return frame
+
+
+def store_cache(frame, cache_directory, source):
+    # Saved in a sibling directory and moved into place once complete: an
+    # interrupted save leaves the previous cache (or none), never a half-written
+    # one that cache_is_fresh can't tell apart from a good one. A directory can't
+    # replace another that has files in it, so the old cache is moved aside first.
+    parent = os.path.dirname(os.path.abspath(cache_directory))
+    os.makedirs(parent, exist_ok=True)
+    partial = tempfile.mkdtemp(dir=parent, prefix='.partial-')
+    try:
+        save_columnar(frame, partial, source)
+        if os.path.exists(cache_directory):
+            os.replace(cache_directory, partial + '-old')
+        os.replace(partial, cache_directory)
+    finally:
+        shutil.rmtree(partial, ignore_errors=True)
+        shutil.rmtree(partial + '-old', ignore_errors=True)
+
+
+def cache_source(path, schema):
+    # What the cached frame depends on: the file (its path, size and modification
+    # time, so a file restored with an older mtime still counts as changed) and the
+    # schema it was parsed with, in order since it names the columns. The chunk size
+    # and the workers don't change the result.
+    file_status = os.stat(path)
+    return {'path': os.path.abspath(path), 'size': file_status.st_size, 'mtime': file_status.st_mtime_ns,
+            'schema': [[name, str(dtype)] for name, dtype in schema.items()]}
+
+
+def cache_is_fresh(path, cache_directory, schema=POKE_SCHEMA):
+    if not os.path.exists(os.path.join(cache_directory, MANIFEST)):
+        return False
+    manifest, _ = read_manifest(cache_directory)
+    return manifest.get('source') == cache_source(path, schema)
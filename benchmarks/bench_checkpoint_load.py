@@ -0,0 +1,47 @@
+import os
+import pickle
+import tempfile
+
+import numpy as nmpy
+
+from common import best_time, sizes_from_argv
+from nn_toolkit import load_checkpoint, save_checkpoint
+
+
+def main():
+    rng = nmpy.random.RandomState(0)
+    directory = tempfile.mkdtemp()
+    print("{:>8} {:>22} {:>12}".format("MB", "format", "load ms"))
+
+    for megabytes in sizes_from_argv([1, 64, 256]):
+        # Two layers with the same number of float64 values in total
+        side = int((megabytes * 2 ** 20 / 8 / 2) ** 0.5)
+        weights = {'weights_1': rng.random_sample((side, side)), 'weights_2': rng.random_sample((side, side))}
+
+        pickle_path = os.path.join(directory, 'weights.pickle')
+        with open(pickle_path, 'wb') as pickle_file:
+            pickle.dump(weights, pickle_file, protocol=pickle.HIGHEST_PROTOCOL)
+        npy_paths = {}
+        for name, array in weights.items():
+            npy_paths[name] = os.path.join(directory, name + '.npy')
+            nmpy.save(npy_paths[name], array)
+        checkpoint_path = os.path.join(directory, 'weights.ckpt')
+        save_checkpoint(checkpoint_path, weights)
+
+        def load_pickle():
+            with open(pickle_path, 'rb') as pickle_file:
+                return pickle.load(pickle_file)
+
+        loaders = [
+            ("pickle", load_pickle),
+            ("np.load", lambda: {name: nmpy.load(path) for name, path in npy_paths.items()}),
+            ("np.load(mmap_mode='r')", lambda: {name: nmpy.load(path, mmap_mode='r') for name, path in npy_paths.items()}),
+            ("checkpoint", lambda: load_checkpoint(checkpoint_path)),
+        ]
+        for name, loader in loaders:
+            # Every run hits the page cache, so this measures parsing and copying only
+            print("{:>8} {:>22} {:>12.3f}".format(megabytes, name, best_time(loader, repeat=5) * 1000))
+
+
+if __name__ == '__main__':
+    main()
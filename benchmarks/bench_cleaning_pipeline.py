@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from common import sizes_from_argv  # first, it puts the repo sections on sys.path
+from cleaning_pipeline import CleaningPipeline
+
+FILL = {'Type': 'Unknown', 'Color': 'Yellow', 'Evolves': True, 'HP': 30}
+
+
+def write_source(path, number_of_rows, rng):
+    # Like pokes_missing.csv and pokes_duplicates.csv: gaps and repeated names
+    frame = pd.DataFrame({'Name': ['poke_{}'.format(index) for index in rng.randint(0, number_of_rows // 2, number_of_rows)],
+                          'Type': rng.choice(['Psychic', 'Electric', 'Poison', None], number_of_rows),
+                          'Color': rng.choice(['Yellow', 'Purple', 'Blue', None], number_of_rows),
+                          'Evolves': rng.choice([True, False, None], number_of_rows),
+                          'HP': np.where(rng.rand(number_of_rows) < 0.1, np.nan, rng.randint(1, 255, number_of_rows))})
+    frame.to_csv(path, index=False)
+
+
+# The steps of 8_data_cleaning.ipynb, one after the other on the whole frame
+def notebook_cleaning(source_path, output_path):
+    frame = pd.read_csv(source_path)
+    frame = frame.fillna(FILL)
+    frame = frame.drop_duplicates('Name')
+    frame['Type'] = frame['Type'].map(lambda x: x.upper())
+    frame['Evolves'] = frame['Evolves'].replace([True, False], ['Yes', 'No'])
+    frame.to_csv(output_path, index=False)
+
+
+def measure(function):
+    # Timed without tracemalloc, which slows down allocation-heavy code a lot,
+    # then run again under tracemalloc for the peak allocation
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20
+
+
+def main():
+    rng = np.random.RandomState(0)
+    directory = tempfile.mkdtemp()
+    pipeline = CleaningPipeline(fill=FILL, upper=['Type'], replace={'Evolves': {True: 'Yes', False: 'No'}},
+                                dedupe_on=['Name'], chunk_bytes=8 * 2 ** 20)
+    print("{:>10} {:>26} {:>10} {:>14}".format("rows", "engine", "seconds", "peak alloc MB"))
+
+    try:
+        for number_of_rows in sizes_from_argv([1000000]):
+            source_path = os.path.join(directory, 'pokes.csv')
+            output_path = os.path.join(directory, 'clean.csv')
+            write_source(source_path, number_of_rows, rng)
+
+            runs = [
+                ("notebook steps", lambda: notebook_cleaning(source_path, output_path)),
+                ("pipeline, full run", lambda: pipeline.run(source_path, output_path, incremental=False)),
+                ("pipeline, nothing new", lambda: pipeline.run(source_path, output_path)),
+            ]
+            for name, run in runs:
+                elapsed, peak_megabytes = measure(run)
+                print("{:>10} {:>26} {:>10.2f} {:>14.1f}".format(number_of_rows, name, elapsed, peak_megabytes))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from common import best_time, sizes_from_argv
+from dataset_cache import DatasetCache
+
+
+def main():
+    rng = np.random.RandomState(0)
+    work_directory = tempfile.mkdtemp()
+    print("{:>9} {:>26} {:>10}".format("rows", "engine", "seconds"))
+
+    try:
+        for number_of_rows in sizes_from_argv([100000, 1000000]):
+            # The columns of sample_data/poke_colors.csv
+            path = os.path.join(work_directory, 'poke_colors_{}.csv'.format(number_of_rows))
+            pd.DataFrame({'Name': ['Poke{}'.format(row) for row in range(number_of_rows)],
+                          'Color': rng.choice(['Red', 'Blue', 'Green', 'Yellow'], number_of_rows),
+                          'HP': rng.randint(1, 255, number_of_rows),
+                          'Attack': rng.randint(1, 255, number_of_rows),
+                          'Defense': rng.randint(1, 255, number_of_rows)}).to_csv(path, index=False)
+
+            cache = DatasetCache(os.path.join(work_directory, 'cache'))
+            engines = [
+                ("pd.read_csv", lambda: pd.read_csv(path)),
+                ("cache miss (parse + store)", lambda: (cache.clear(), cache.read_csv(path))),
+                ("cache hit", lambda: cache.read_csv(path)),
+                ("cache hit, 2 columns", lambda: cache.read_csv(path, columns=['Color', 'Attack'])),
+            ]
+            for name, engine in engines:
+                print("{:>9} {:>26} {:>10.4f}".format(number_of_rows, name, best_time(engine)))
+    finally:
+        shutil.rmtree(work_directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+import tracemalloc
+
+import numpy as nmpy
+
+from common import best_time, sizes_from_argv
+from nn_toolkit import DeepNetwork
+
+# The model of NeuralNetwork_9_Keras_basics/Keras_DL_Tutorial.ipynb, on synthetic
+# MNIST-shaped data (28x28 inputs, 10 classes). The notebook trains with batches of 15.
+LAYER_SIZES = [784, 512, 216, 128, 64, 32, 16, 10]
+SAMPLES = 3000
+
+
+def synthetic_mnist(dtype):
+    random = nmpy.random.RandomState(0)
+    return random.rand(SAMPLES, 784).astype(dtype), random.randint(10, size=SAMPLES)
+
+
+def naive_epoch(weights, biases, inputs, labels, batch_size, alpha=0.01):
+    # The same network written the obvious way: every expression allocates its result
+    for start in range(0, len(inputs), batch_size):
+        activations = [inputs[start:start + batch_size]]
+        for layer, (layer_weights, layer_biases) in enumerate(zip(weights, biases)):
+            outputs = activations[-1].dot(layer_weights) + layer_biases
+            activations.append(nmpy.maximum(outputs, 0) if layer < len(weights) - 1 else outputs)
+
+        exponentials = nmpy.exp(activations[-1] - activations[-1].max(axis=1, keepdims=True))
+        delta = exponentials / exponentials.sum(axis=1, keepdims=True)
+        delta[nmpy.arange(len(delta)), labels[start:start + batch_size]] -= 1
+        delta /= len(delta)
+
+        for layer in reversed(range(len(weights))):
+            weight_gradient = activations[layer].T.dot(delta)
+            bias_gradient = delta.sum(axis=0)
+            if layer > 0:
+                delta = delta.dot(weights[layer].T) * (activations[layer] > 0)
+            weights[layer] -= alpha * weight_gradient
+            biases[layer] -= alpha * bias_gradient
+
+
+def keras_epoch(batch_size):
+    # Only when TensorFlow is installed
+    try:
+        from tensorflow import keras
+    except ImportError:
+        return None
+
+    model = keras.Sequential([keras.Input((784,))] +
+                             [keras.layers.Dense(size, activation='relu') for size in LAYER_SIZES[1:-1]] +
+                             [keras.layers.Dense(10, activation='softmax')])
+    model.compile(optimizer=keras.optimizers.SGD(0.01), loss='sparse_categorical_crossentropy')
+    inputs, labels = synthetic_mnist(nmpy.float32)
+    return lambda: model.fit(inputs, labels, batch_size=batch_size, epochs=1, verbose=0)
+
+
+def peak_allocated(function):
+    # The most memory allocated at once during an epoch, once the workspaces exist
+    function()
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    print("{:>6} {:>8} {:>8} {:>12} {:>12}".format("batch", "engine", "dtype", "samples/s", "peak KB"))
+
+    for batch_size in sizes_from_argv([15, 32, 128]):
+        for dtype in (nmpy.float32, nmpy.float64):
+            inputs, labels = synthetic_mnist(dtype)
+            dtype_name = nmpy.dtype(dtype).name
+
+            network = DeepNetwork(LAYER_SIZES, 'softmax', alpha=0.01, dtype=dtype, rng=nmpy.random.RandomState(0))
+            weights = [layer_weights.copy() for layer_weights in network.weights]
+            biases = [layer_biases.copy() for layer_biases in network.biases]
+            engines = (("naive", lambda: naive_epoch(weights, biases, inputs, labels, batch_size)),
+                       ("deep", lambda: network.train_epoch(inputs, labels, batch_size)))
+
+            for name, engine in engines:
+                seconds = best_time(engine)
+                print("{:>6} {:>8} {:>8} {:>12.0f} {:>12.1f}".format(
+                    batch_size, name, dtype_name, SAMPLES / seconds, peak_allocated(engine) / 1024))
+
+        keras_engine = keras_epoch(batch_size)
+        if keras_engine is not None:
+            keras_engine()
+            print("{:>6} {:>8} {:>8} {:>12.0f} {:>12}".format(
+                batch_size, "keras", "float32", SAMPLES / best_time(keras_engine), "-"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+import numpy as nmpy
+
+from common import best_time, sizes_from_argv
+from nn_toolkit import Dense
+
+
+# The per-row loop that NeuralNetwork_2/multi_input_multi_output.py used before Dense
+def python_loop_layer(inputs, weights):
+    estimates = []
+    for weights_for_estimate in weights:
+        dot_product_result = 0
+        for index in range(len(inputs)):
+            dot_product_result += inputs[index] * weights_for_estimate[index]
+        estimates.append(dot_product_result)
+
+    return estimates
+
+
+def main():
+    rng = nmpy.random.RandomState(0)
+    print("{:>6} {:>18} {:>14}".format("size", "engine", "seconds/call"))
+
+    for size in sizes_from_argv([64, 512]):
+        weights = rng.random_sample((size, size))
+        inputs = rng.random_sample(size)
+        batch = rng.random_sample((256, size))
+
+        list_weights, list_inputs = weights.tolist(), inputs.tolist()
+        elapsed = best_time(lambda: python_loop_layer(list_inputs, list_weights))
+        print("{:>6} {:>18} {:>14.6f}".format(size, "python loop", elapsed))
+
+        for dtype in (nmpy.float64, nmpy.float32):
+            layer = Dense(weights, dtype=dtype)
+            elapsed = best_time(lambda: layer.forward(inputs))
+            print("{:>6} {:>18} {:>14.6f}".format(size, "Dense {}".format(nmpy.dtype(dtype).name), elapsed))
+
+            elapsed = best_time(lambda: layer.forward(batch)) / len(batch)
+            print("{:>6} {:>18} {:>14.6f}".format(size, "Dense batch/row", elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+import numpy as nmpy
+
+from common import best_time, sizes_from_argv
+from nn_toolkit import StoppingPolicy, TwoLayerEnsemble, TwoLayerNetwork
+
+# The data of NeuralNetwork_8_backpropagation/two_layer_network.py
+INPUTS = nmpy.array([[1, 1, 1],
+                     [1, 1, 0],
+                     [0, 1, 0],
+                     [0, 1, 1]])
+EXPECTED_VALUES = nmpy.array([1, 0, 1, 0])
+
+
+def stopping():
+    # Shorter than the script's 10000 iterations, so the sequential runs finish
+    return StoppingPolicy(tolerance=0, patience=500, max_iterations=2000)
+
+
+def sequential(number_of_models):
+    epochs = 0
+    for seed in range(number_of_models):
+        network = TwoLayerNetwork(3, rng=nmpy.random.RandomState(seed))
+        policy = stopping()
+        while not policy.should_stop(network.train_epoch(INPUTS, EXPECTED_VALUES)):
+            pass
+        epochs += policy.iteration
+
+    return epochs
+
+
+def ensemble(number_of_models):
+    models = TwoLayerEnsemble(number_of_models, 3, seeds=range(number_of_models))
+    return sum(policy.iteration for policy in models.fit(INPUTS, EXPECTED_VALUES, stopping=stopping))
+
+
+def main():
+    print("{:>6} {:>12} {:>10} {:>12} {:>10}".format("models", "engine", "seconds", "model-epochs", "speedup"))
+
+    for number_of_models in sizes_from_argv([1, 4, 16, 64, 256]):
+        sequential_seconds = None
+        for name, engine in (("sequential", sequential), ("ensemble", ensemble)):
+            epochs = engine(number_of_models)
+            seconds = best_time(lambda: engine(number_of_models), repeat=1)
+            sequential_seconds = sequential_seconds or seconds
+            print("{:>6} {:>12} {:>10.3f} {:>12} {:>10.1f}".format(
+                number_of_models, name, seconds, epochs, sequential_seconds / seconds))
+
+
+if __name__ == '__main__':
+    main()
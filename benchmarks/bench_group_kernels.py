@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from common import best_time, sizes_from_argv
+from group_kernels import sum_of_squares, top_n
+
+ROWS_PER_GROUP = 10
+
+
+# The helpers of 11_Apply_function.ipynb and 10_group_operations.ipynb
+def highest_attack(data_frame):
+    return data_frame.sort_values(by='Attack')[-2:]
+
+
+def python_sum_of_squares(arr):
+    sos = 0
+    for element in arr:
+        sos += element**2
+    return sos
+
+
+def main():
+    rng = np.random.RandomState(0)
+    print("{:>8} {:>34} {:>10}".format("groups", "engine", "seconds"))
+
+    for number_of_groups in sizes_from_argv([1000, 100000]):
+        number_of_rows = number_of_groups * ROWS_PER_GROUP
+        pdata = pd.DataFrame({'Color': rng.randint(0, number_of_groups, number_of_rows).astype(str),
+                              'HP': rng.randint(1, 255, number_of_rows),
+                              'Attack': rng.randint(1, 255, number_of_rows),
+                              'Defense': rng.randint(1, 255, number_of_rows)})
+
+        engines = [
+            ("groupby.apply(highest_attack)", lambda: pdata.groupby('Color').apply(highest_attack)),
+            ("top_n", lambda: top_n(pdata, 'Color', 'Attack', 2)),
+            ("groupby.agg(sum_of_squares)", lambda: pdata.groupby('Color').agg(python_sum_of_squares)),
+            ("sum_of_squares kernel", lambda: sum_of_squares(pdata, 'Color')),
+        ]
+        for name, engine in engines:
+            print("{:>8} {:>34} {:>10.3f}".format(number_of_groups, name, best_time(engine, repeat=1)))
+
+
+if __name__ == '__main__':
+    main()
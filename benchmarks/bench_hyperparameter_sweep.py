@@ -0,0 +1,35 @@
+import os
+import time
+
+from common import sizes_from_argv
+from nn_toolkit import TwoLayerTrainer, grid_search, run_sweep
+
+MAX_ITERATIONS = 2000
+
+
+def main():
+    print("{:>7} {:>8} {:>10} {:>10} {:>12} {:>10}".format(
+        "trials", "workers", "halving", "seconds", "iterations", "best loss"))
+
+    for number_of_seeds in sizes_from_argv([2, 8]):
+        space = {'alpha': [0.001, 0.01, 0.1, 0.3, 1, 3],
+                 'hidden_layer_number_of_nodes': [2, 4, 8, 16],
+                 'seed': list(range(number_of_seeds))}
+        number_of_trials = 6 * 4 * number_of_seeds
+
+        for workers in sorted({1, os.cpu_count()}):
+            for halving in (False, True):
+                # Without halving every trial trains until it stops on its own
+                min_iterations = 20 if halving else MAX_ITERATIONS
+                start = time.perf_counter()
+                trials = run_sweep(TwoLayerTrainer, grid_search(space), workers=workers,
+                                   max_iterations=MAX_ITERATIONS, min_iterations=min_iterations, patience=500)
+                seconds = time.perf_counter() - start
+
+                print("{:>7} {:>8} {:>10} {:>10.3f} {:>12} {:>10.4g}".format(
+                    number_of_trials, workers, str(halving), seconds,
+                    sum(trial.iterations for trial in trials), trials[0].loss))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as nmpy
+
+from common import sizes_from_argv
+from nn_toolkit.serving import http_request, serve
+
+NUMBER_OF_INPUTS = 64
+HIDDEN_NODES = 256
+REQUESTS_PER_CLIENT = 200
+
+
+async def client(unix_path, payloads, latencies):
+    reader, writer = await asyncio.open_unix_connection(unix_path)
+    for payload in payloads:
+        start = time.perf_counter()
+        writer.write(payload)
+        await writer.drain()
+        # Read the headers, then exactly Content-Length bytes of body
+        content_length = 0
+        while True:
+            header = await reader.readline()
+            if header == b'\r\n':
+                break
+            if header.lower().startswith(b'content-length'):
+                content_length = int(header.split(b':')[1])
+        await reader.readexactly(content_length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def load_test(unix_path, concurrency, payloads):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*[client(unix_path, payloads, latencies) for _ in range(concurrency)])
+    return latencies, time.perf_counter() - start
+
+
+def wait_for_socket(unix_path):
+    while not os.path.exists(unix_path):
+        time.sleep(0.01)
+
+
+def main():
+    rng = nmpy.random.RandomState(0)
+    directory = tempfile.mkdtemp()
+    weights_path = os.path.join(directory, 'weights.npz')
+    nmpy.savez(weights_path, weights_1=rng.random_sample((NUMBER_OF_INPUTS, HIDDEN_NODES)),
+               weights_2=rng.random_sample(HIDDEN_NODES))
+    payloads = [http_request(rng.random_sample(NUMBER_OF_INPUTS).tolist()) for _ in range(REQUESTS_PER_CLIENT)]
+
+    print("{:>12} {:>10} {:>10} {:>10} {:>10}".format("server", "clients", "QPS", "p50 ms", "p99 ms"))
+    for concurrency in sizes_from_argv([1, 16, 64]):
+        for name, max_batch_size, max_wait_ms in (('unbatched', 1, 0), ('batched', 64, 2)):
+            unix_path = os.path.join(directory, '{}-{}.sock'.format(name, concurrency))
+            server = multiprocessing.Process(target=serve, args=(weights_path,),
+                                             kwargs=dict(unix_path=unix_path, max_batch_size=max_batch_size,
+                                                         max_wait_ms=max_wait_ms),
+                                             daemon=True)
+            server.start()
+            wait_for_socket(unix_path)
+
+            latencies, elapsed = asyncio.run(load_test(unix_path, concurrency, payloads))
+            server.terminate()
+            server.join()
+
+            latencies_ms = nmpy.array(latencies) * 1000
+            print("{:>12} {:>10} {:>10.0f} {:>10.2f} {:>10.2f}".format(
+                name, concurrency, len(latencies) / elapsed,
+                nmpy.percentile(latencies_ms, 50), nmpy.percentile(latencies_ms, 99)))
+
+
+if __name__ == '__main__':
+    main()
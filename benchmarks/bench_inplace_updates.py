@@ -0,0 +1,93 @@
+import timeit
+import tracemalloc
+
+import numpy as nmpy
+
+from common import sizes_from_argv
+from nn_toolkit import MatrixUpdates, as_weights
+
+STEPS = 1000
+ALPHA = 0.0001
+
+
+# The list helpers of NeuralNetwork_6/gradient_descent_multiinput_multioutput.py
+def calculate_weight_correction_matrix(alpha, inputs, expected_values, predicted_values):
+    weight_correction_factors = []
+    for exp, pred in zip(expected_values, predicted_values):
+        row = []
+        delta = (pred - exp) * alpha
+        for input in inputs:
+            row.append( input * delta )
+        weight_correction_factors.append(row)
+
+    return weight_correction_factors
+
+
+def calculate_corrected_weights(weights, correction_factors):
+    updated_weights = []
+    for row_weight, row_correction in zip(weights, correction_factors):
+        row = []
+        for weight, correction in zip(row_weight, row_correction):
+            row.append( weight - correction )
+        updated_weights.append(row)
+
+    return updated_weights
+
+
+def list_steps(weights, inputs, expected_values, predicted_values, steps):
+    for _ in range(steps):
+        correction_factors = calculate_weight_correction_matrix(ALPHA, inputs, expected_values, predicted_values)
+        weights = calculate_corrected_weights(weights, correction_factors)
+
+    return weights
+
+
+def inplace_steps(engine, weights, inputs, expected_values, steps):
+    for _ in range(steps):
+        predicted_values = engine.predict(weights, inputs)
+        engine.step(weights, ALPHA, inputs, expected_values, predicted_values)
+
+    return weights
+
+
+def allocated_bytes(function):
+    # Bytes still allocated after `function` ran, and the peak while it ran, both
+    # relative to what was allocated before
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    function()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return after - before, peak - before
+
+
+def main():
+    rng = nmpy.random.RandomState(0)
+    print("{:>6} {:>10} {:>14} {:>14} {:>14}".format("size", "engine", "seconds/step", "retained bytes", "peak bytes"))
+
+    for size in sizes_from_argv([3, 64, 256]):
+        inputs = rng.random_sample(size)
+        expected_values = rng.random_sample(size)
+        weights = rng.random_sample((size, size))
+        steps = max(STEPS // size, 10)
+
+        engine = MatrixUpdates(size, size)
+        inplace_weights = as_weights(weights)
+        # The first step only warms up numpy, the buffers are allocated in MatrixUpdates()
+        inplace_steps(engine, inplace_weights, inputs, expected_values, 1)
+        run_inplace = lambda: inplace_steps(engine, inplace_weights, inputs, expected_values, steps)
+
+        # The list version gets fixed predictions, it would need its own forward pass otherwise
+        list_weights, list_inputs = weights.tolist(), inputs.tolist()
+        list_expected, list_predicted = expected_values.tolist(), weights.dot(inputs).tolist()
+        run_lists = lambda: list_steps(list_weights, list_inputs, list_expected, list_predicted, steps)
+
+        for name, run in (("lists", run_lists), ("in place", run_inplace)):
+            seconds = min(timeit.repeat(run, number=1, repeat=3)) / steps
+            retained, peak = allocated_bytes(run)
+            print("{:>6} {:>10} {:>14.7f} {:>14} {:>14}".format(size, name, seconds, retained, peak))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+import time
+
+import numpy as nmpy
+
+from common import best_time, sizes_from_argv
+from nn_toolkit import ArraySource, NormalEquations, least_squares_weights
+
+NUMBER_OF_INPUTS = 50
+BATCH_SIZE = 1000
+MAX_EPOCHS = 100
+
+
+# The loop of NeuralNetwork_7_correlation/stochastic_gradient_descent.py, without rounding
+def sgd_epochs(weights, inputs, expected_values, epochs, alpha=0.1):
+    for _ in range(epochs):
+        for input_set, expected_value in zip(inputs, expected_values):
+            weights -= alpha * (input_set * (input_set.dot(weights) - expected_value))
+
+    return weights
+
+
+def mean_squared_error(weights, inputs, expected_values):
+    return nmpy.mean((inputs.dot(weights) - expected_values) ** 2)
+
+
+def minibatch_gd_until(weights, source, target_error, inputs, expected_values, alpha=0.05):
+    # Mini-batch gradient descent until the training error is within 1% of the
+    # least squares optimum (or MAX_EPOCHS). Returns the epochs it took.
+    for epoch in range(1, MAX_EPOCHS + 1):
+        for input_batch, expected_batch in source.batches(BATCH_SIZE):
+            deltas = input_batch.dot(weights) - expected_batch
+            weights -= alpha * input_batch.T.dot(deltas) / len(input_batch)
+        if mean_squared_error(weights, inputs, expected_values) <= target_error * 1.01:
+            break
+
+    return epoch
+
+
+def main():
+    print("{:>14} {:>22} {:>10} {:>8} {:>12}".format("data", "engine", "seconds", "epochs", "mse"))
+
+    # The dataset of stochastic_gradient_descent.py
+    inputs = nmpy.array([[0,0,1], [0,1,0], [1,1,1], [0,1,1], [1,0,0], [1,0,1], [0,0,0], [1,1,0]], dtype=float)
+    expected_values = nmpy.array([0,1,1,1,0,0,0,1], dtype=float)
+    for name, engine, epochs in (
+            ("SGD, 15 runs", lambda: sgd_epochs(nmpy.array([0.5, 0.5, 0.5]), inputs, expected_values, 15), 15),
+            ("least squares", lambda: least_squares_weights(nmpy.array([0.5, 0.5, 0.5]), inputs, expected_values), 1)):
+        seconds = best_time(engine)
+        print("{:>14} {:>22} {:>10.6f} {:>8} {:>12.3g}".format(
+            "sgd example", name, seconds, epochs, mean_squared_error(engine(), inputs, expected_values)))
+
+    rng = nmpy.random.RandomState(0)
+    for number_of_rows in sizes_from_argv([100000, 1000000]):
+        inputs = rng.random_sample((number_of_rows, NUMBER_OF_INPUTS))
+        true_weights = rng.normal(size=NUMBER_OF_INPUTS)
+        expected_values = inputs.dot(true_weights) + rng.normal(0, 0.1, number_of_rows)
+        source = ArraySource(inputs, expected_values, chunk_rows=65536)
+        label = "{} rows".format(number_of_rows)
+
+        start = time.perf_counter()
+        weights = NormalEquations(NUMBER_OF_INPUTS).update_from_chunks(source.chunks()).solve()[:, 0]
+        seconds = time.perf_counter() - start
+        optimum = mean_squared_error(weights, inputs, expected_values)
+        print("{:>14} {:>22} {:>10.3f} {:>8} {:>12.4g}".format(label, "streamed least squares", seconds, 1, optimum))
+
+        weights = nmpy.zeros(NUMBER_OF_INPUTS)
+        start = time.perf_counter()
+        epochs = minibatch_gd_until(weights, source, optimum, inputs, expected_values)
+        seconds = time.perf_counter() - start
+        print("{:>14} {:>22} {:>10.3f} {:>8} {:>12.4g}".format(
+            label, "mini-batch GD", seconds, epochs, mean_squared_error(weights, inputs, expected_values)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+import os
+import tempfile
+from contextlib import redirect_stdout
+
+import numpy as nmpy
+
+from common import best_time, sizes_from_argv
+from nn_toolkit import FileSink, NullSink, RingBufferSink, SampledSink
+
+inputs = nmpy.array([[0,0,1],
+                     [0,1,0],
+                     [1,1,1],
+                     [0,1,1],
+                     [1,0,0],
+                     [1,0,1],
+                     [0,0,0],
+                     [1,1,0]
+                    ])
+
+expected_values = nmpy.array([0,1,1,1,0,0,0,1])
+
+
+# The loop of stochastic_gradient_descent.py with its original per-sample print
+def train_with_prints(runs):
+    weights = nmpy.array([0.5, 0.5, 0.5])
+    for run in range(runs):
+        error_for_run = 0
+        for input_set, expected_value in zip(inputs, expected_values):
+            predicted_value = round( input_set.dot(weights), 1)
+            print("Our network predicted {} for the inputs {}".format(predicted_value, input_set))
+            error = (predicted_value - expected_value) ** 2
+            error_for_run += error
+            weights -= 0.1 * (input_set * (predicted_value - expected_value) )
+        print("The accumulated error for this run is {} \n\n\n".format(error_for_run))
+
+
+# The same loop reporting every sample to a metrics sink
+def train_with_sink(runs, metrics):
+    weights = nmpy.array([0.5, 0.5, 0.5])
+    step = 0
+    for run in range(runs):
+        for input_set, expected_value in zip(inputs, expected_values):
+            predicted_value = round( input_set.dot(weights), 1)
+            error = (predicted_value - expected_value) ** 2
+            if metrics.enabled:
+                metrics.record(step, prediction=predicted_value, error=error)
+            step += 1
+            weights -= 0.1 * (input_set * (predicted_value - expected_value) )
+    metrics.close()
+
+
+def main():
+    output_directory = tempfile.mkdtemp()
+    print("{:>8} {:>16} {:>14}".format("runs", "sink", "steps/sec"))
+
+    for runs in sizes_from_argv([1000, 10000]):
+        steps = runs * len(inputs)
+
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            elapsed = best_time(lambda: train_with_prints(runs), repeat=1)
+        print("{:>8} {:>16} {:>14.0f}".format(runs, "print", steps / elapsed))
+
+        sinks = [
+            ("off", NullSink),
+            ("ring buffer", RingBufferSink),
+            ("sampled/1000", lambda: SampledSink(1000, RingBufferSink())),
+            ("csv", lambda: FileSink(os.path.join(output_directory, 'metrics.csv'))),
+            ("jsonl", lambda: FileSink(os.path.join(output_directory, 'metrics.jsonl'))),
+        ]
+        for name, make_sink in sinks:
+            elapsed = best_time(lambda: train_with_sink(runs, make_sink()), repeat=1)
+            print("{:>8} {:>16} {:>14.0f}".format(runs, name, steps / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from common import best_time, sizes_from_argv
+from onehot_encoder import OneHotEncoder
+
+# Dense 0/1 matrices above this many cells are skipped, they wouldn't fit in memory
+MAX_DENSE_CELLS = 2 * 10 ** 8
+
+
+# strings_to_onehot, exactly as defined in OneHotEncodingDemo.ipynb
+def strings_to_onehot(categories_column):
+    unique_categories = list(set(categories_column))
+    one_hot_matrix = np.zeros( (len(categories_column), len(unique_categories)), dtype=int )
+    for row, category in zip(one_hot_matrix, categories_column):
+        category_index = unique_categories.index(category)
+        row[category_index] = 1
+
+    return pd.DataFrame(columns = unique_categories, data = one_hot_matrix)
+
+
+def main():
+    rng = np.random.RandomState(0)
+    print("{:>10} {:>10} {:>28} {:>10}".format("rows", "categories", "engine", "seconds"))
+
+    for number_of_rows in sizes_from_argv([100000, 1000000, 10000000]):
+        for number_of_categories in (18, 50000):
+            names = np.array(['type_{}'.format(index) for index in range(number_of_categories)], dtype=object)
+            column = names[rng.randint(0, number_of_categories, number_of_rows)]
+            dense_fits = number_of_rows * number_of_categories <= MAX_DENSE_CELLS
+
+            engines = []
+            if dense_fits and number_of_rows <= 1000000:
+                engines.append(("strings_to_onehot", lambda: strings_to_onehot(list(column))))
+            if dense_fits:
+                engines.append(("pd.get_dummies", lambda: pd.get_dummies(column)))
+                engines.append(("OneHotEncoder dense", lambda: OneHotEncoder().fit_transform(column)))
+            engines.append(("pd.get_dummies(sparse=True)", lambda: pd.get_dummies(column, sparse=True)))
+            engines.append(("OneHotEncoder indices", lambda: OneHotEncoder().fit_transform(column, 'indices')))
+
+            encoder = OneHotEncoder().fit(column)
+            engines.append(("transform only, indices", lambda: encoder.transform(column, 'indices')))
+
+            for name, engine in engines:
+                elapsed = best_time(engine, repeat=1)
+                print("{:>10} {:>10} {:>28} {:>10.3f}".format(number_of_rows, number_of_categories, name, elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from common import best_time, sizes_from_argv
+from online_stats import GroupedStats, RunningStats
+
+CHUNK_ROWS = 100000
+COLUMNS = ['HP', 'Attack', 'Defense']
+
+
+def recompute(seen):
+    # What 6_Descriptive_Statistics.ipynb does when new data arrives: everything again
+    frame = pd.concat(seen, ignore_index=True)
+    return frame[COLUMNS].mean(), frame[COLUMNS].std(), frame[COLUMNS].median()
+
+
+def main():
+    rng = np.random.RandomState(0)
+    print("{:>10} {:>26} {:>10} {:>14} {:>12}".format("rows", "engine", "seconds", "rows/second", "max error"))
+
+    for number_of_rows in sizes_from_argv([1000000, 5000000]):
+        pdata = pd.DataFrame({'Color': rng.choice(['Red', 'Blue', 'Green', 'Yellow'], number_of_rows),
+                              'HP': rng.randint(1, 255, number_of_rows).astype(float),
+                              'Attack': rng.normal(80, 20, number_of_rows),
+                              'Defense': rng.lognormal(4, 0.5, number_of_rows)})
+        chunks = [pdata.iloc[start:start + CHUNK_ROWS] for start in range(0, number_of_rows, CHUNK_ROWS)]
+
+        def recompute_every_chunk():
+            for end in range(1, len(chunks) + 1):
+                recompute(chunks[:end])
+
+        def update_every_chunk():
+            stats = RunningStats()
+            for chunk in chunks:
+                stats.update(chunk[COLUMNS])
+                stats.mean(), stats.std(), stats.median()
+            return stats
+
+        def update_per_color():
+            stats = GroupedStats('Color')
+            for chunk in chunks:
+                stats.update(chunk)
+            return stats
+
+        stats = update_every_chunk()
+        # Error of the median as a rank: the fraction of rows below it should be 0.5
+        median_error = max(abs(np.mean(pdata[column] <= stats.median()[column]) - 0.5) for column in COLUMNS)
+        mean_error = (stats.mean() - pdata[COLUMNS].mean()).abs().max()
+        std_error = (stats.std() - pdata[COLUMNS].std()).abs().max()
+
+        engines = [
+            ("recompute after each chunk", recompute_every_chunk, np.nan),
+            ("RunningStats.update", update_every_chunk, max(mean_error, std_error, median_error)),
+            ("GroupedStats.update", update_per_color, np.nan),
+        ]
+        for name, engine, error in engines:
+            seconds = best_time(engine, repeat=1)
+            print("{:>10} {:>26} {:>10.3f} {:>14.0f} {:>12.2e}".format(
+                number_of_rows, name, seconds, number_of_rows / seconds, error))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import time
+
+import numpy as nmpy
+
+from common import sizes_from_argv
+from nn_toolkit import Adam, GradientDescent, Momentum, Nesterov, RMSProp, StoppingPolicy, TwoLayerNetwork
+
+ALPHAS = [0.0003, 0.001, 0.003, 0.01, 0.03, 0.1, 0.3, 1]
+OPTIMIZERS = [("gradient descent", GradientDescent), ("momentum", Momentum), ("nesterov", Nesterov),
+              ("rmsprop", RMSProp), ("adam", Adam)]
+MAX_STEPS = 5000
+
+
+def linear_problem(inputs, expected_values):
+    # Full-batch gradient of the mean squared error of inputs.dot(weights)
+    def make():
+        return nmpy.zeros(inputs.shape[1])
+
+    def step(weights, optimizer):
+        deltas = inputs.dot(weights) - expected_values
+        optimizer.step(weights, inputs.T.dot(deltas) / len(inputs))
+        return nmpy.mean(deltas ** 2)
+
+    return make, step
+
+
+def two_layer_problem(inputs, expected_values):
+    # NeuralNetwork_8_backpropagation/two_layer_network.py, one full-batch step per epoch
+    def make():
+        return TwoLayerNetwork(inputs.shape[1], 8, decimals=None, rng=nmpy.random.RandomState(0))
+
+    def step(network, optimizer):
+        network.optimizer = optimizer
+        return network.train_batch(inputs, expected_values) / len(inputs)
+
+    return make, step
+
+
+def steps_to_target(problem, optimizer, target_loss):
+    make, step = problem
+    model = make()
+    stopping = StoppingPolicy(tolerance=target_loss, max_iterations=MAX_STEPS)
+    start = time.perf_counter()
+    with nmpy.errstate(all='ignore'):
+        while not stopping.should_stop(step(model, optimizer)):
+            pass
+
+    reached = stopping.reason == 'converged'
+    return (stopping.iteration if reached else None), time.perf_counter() - start
+
+
+def main():
+    rng = nmpy.random.RandomState(0)
+    problems = [
+        # The data of stochastic_gradient_descent.py and two_layer_network.py
+        ("sgd example", linear_problem(
+            nmpy.array([[0,0,1], [0,1,0], [1,1,1], [0,1,1], [1,0,0], [1,0,1], [0,0,0], [1,1,0]], dtype=float),
+            nmpy.array([0,1,1,1,0,0,0,1], dtype=float)), 1e-4),
+        ("two layer example", two_layer_problem(
+            nmpy.array([[1,1,1], [1,1,0], [0,1,0], [0,1,1]], dtype=float),
+            nmpy.array([1,0,1,0], dtype=float)), 1e-4),
+    ]
+    for number_of_rows in sizes_from_argv([10000]):
+        # Features on very different scales, where a single alpha fits none of them
+        inputs = rng.random_sample((number_of_rows, 20)) * nmpy.logspace(0, 2, 20)
+        expected_values = inputs.dot(rng.normal(size=20)) + rng.normal(0, 0.1, number_of_rows)
+        optimum = nmpy.mean((inputs.dot(nmpy.linalg.lstsq(inputs, expected_values, rcond=None)[0])
+                             - expected_values) ** 2)
+        problems.append(("{} rows".format(number_of_rows), linear_problem(inputs, expected_values), optimum * 1.05))
+
+    print("{:>18} {:>17} {:>8} {:>8} {:>10}".format("data", "optimizer", "alpha", "steps", "seconds"))
+    for data_name, problem, target_loss in problems:
+        for name, optimizer_class in OPTIMIZERS:
+            # Every optimizer gets its best alpha out of ALPHAS
+            best = None
+            for alpha in ALPHAS:
+                steps, seconds = steps_to_target(problem, optimizer_class(alpha), target_loss)
+                if steps is not None and (best is None or steps < best[1]):
+                    best = (alpha, steps, seconds)
+
+            if best is None:
+                print("{:>18} {:>17} {:>8} {:>8} {:>10}".format(data_name, name, "-", ">{}".format(MAX_STEPS), "-"))
+            else:
+                print("{:>18} {:>17} {:>8} {:>8} {:>10.4f}".format(data_name, name, *best))
+
+
+if __name__ == '__main__':
+    main()
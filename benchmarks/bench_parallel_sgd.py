@@ -0,0 +1,70 @@
+import os
+import time
+
+import numpy as nmpy
+
+from common import sizes_from_argv
+from nn_toolkit import DataParallelTrainer, TwoLayerModel
+
+NUMBER_OF_INPUTS = 64
+HIDDEN_NODES = 32
+EPOCHS = 3
+
+
+def make_dataset(number_of_rows, rng):
+    inputs = rng.random_sample((number_of_rows, NUMBER_OF_INPUTS))
+    true_weights = rng.random_sample(NUMBER_OF_INPUTS)
+    expected_values = (inputs.dot(true_weights) > true_weights.sum() / 2).astype(float)
+    return inputs, expected_values
+
+
+# The existing single-process loop: one sample at a time, like two_layer_network.py
+def single_process_loop(model, weights, inputs, expected_values, alpha):
+    epoch_errors = []
+    for _ in range(EPOCHS):
+        epoch_error = 0
+        for input_set, expected_value in zip(inputs, expected_values):
+            gradient, error = model.gradient(weights, input_set[None, :], expected_value)
+            weights -= alpha * gradient
+            epoch_error += error
+        epoch_errors.append(epoch_error)
+
+    return epoch_errors
+
+
+def main():
+    rng = nmpy.random.RandomState(0)
+    model = TwoLayerModel(NUMBER_OF_INPUTS, HIDDEN_NODES)
+    alpha = 0.01
+    print("Machine has {} cores".format(os.cpu_count()))
+    print("{:>9} {:>8} {:>8} {:>12} {:>14} {:>16}".format(
+        "rows", "mode", "workers", "rows/sec", "rows/sec/worker", "last epoch MSE"))
+
+    for number_of_rows in sizes_from_argv([100000]):
+        inputs, expected_values = make_dataset(number_of_rows, rng)
+        initial_weights = [rng.random_sample((NUMBER_OF_INPUTS, HIDDEN_NODES)) * 0.1,
+                           rng.random_sample(HIDDEN_NODES) * 0.1]
+        flat_weights = nmpy.concatenate([w.ravel() for w in initial_weights])
+
+        start = time.perf_counter()
+        errors = single_process_loop(model, flat_weights.copy(), inputs, expected_values, alpha)
+        elapsed = time.perf_counter() - start
+        rows_per_second = number_of_rows * EPOCHS / elapsed
+        print("{:>9} {:>8} {:>8} {:>12.0f} {:>14.0f} {:>16.4f}".format(
+            number_of_rows, "loop", 1, rows_per_second, rows_per_second, errors[-1] / number_of_rows))
+
+        for mode, batch_size in (('sync', 256), ('hogwild', 32)):
+            for workers in (1, 2, 4, 8):
+                trainer = DataParallelTrainer(model, initial_weights, alpha=alpha, workers=workers,
+                                              mode=mode, batch_size=batch_size)
+                start = time.perf_counter()
+                errors = trainer.fit(inputs, expected_values, epochs=EPOCHS)
+                elapsed = time.perf_counter() - start
+                rows_per_second = number_of_rows * EPOCHS / elapsed
+                print("{:>9} {:>8} {:>8} {:>12.0f} {:>14.0f} {:>16.4f}".format(
+                    number_of_rows, mode, workers, rows_per_second, rows_per_second / workers,
+                    errors[-1] / number_of_rows))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from common import sizes_from_argv
+from partitioned_join import partitioned_join, probe_join
+
+CHUNK_ROWS = 500000
+
+
+def write_tables(directory, number_of_rows, rng):
+    # Same shape as poke_attributes.csv / poke_stats.csv, joined on Name
+    names = np.array(['poke_{}'.format(index) for index in range(number_of_rows)], dtype=object)
+    attributes = pd.DataFrame({'Name': names[rng.permutation(number_of_rows)],
+                               'Type': rng.choice(['Psychic', 'Poison', 'Normal', 'Dragon'], number_of_rows),
+                               'Evolves': rng.randint(0, 2, number_of_rows).astype(bool)})
+    stats = pd.DataFrame({'Name': names[rng.randint(0, number_of_rows, number_of_rows // 2)],
+                          'HP': rng.randint(1, 255, number_of_rows // 2),
+                          'Attack': rng.randint(1, 255, number_of_rows // 2)})
+    attributes_path = os.path.join(directory, 'poke_attributes.csv')
+    stats_path = os.path.join(directory, 'poke_stats.csv')
+    attributes.to_csv(attributes_path, index=False)
+    stats.to_csv(stats_path, index=False)
+    return attributes_path, stats_path
+
+
+def run_engine(engine, attributes_path, stats_path, how, results):
+    start = time.perf_counter()
+    if engine == 'pd.merge':
+        rows = len(pd.merge(pd.read_csv(attributes_path), pd.read_csv(stats_path), on='Name', how=how))
+    elif engine == 'partitioned_join':
+        rows = sum(len(chunk) for chunk in partitioned_join(attributes_path, stats_path, 'Name', how,
+                                                            chunk_rows=CHUNK_ROWS))
+    else:
+        rows = sum(len(chunk) for chunk in probe_join(attributes_path, pd.read_csv(stats_path), 'Name', how,
+                                                      chunk_rows=CHUNK_ROWS))
+    # ru_maxrss is in kilobytes on Linux
+    results.put((rows, time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+
+def main():
+    rng = np.random.RandomState(0)
+    directory = tempfile.mkdtemp()
+    print("{:>10} {:>6} {:>18} {:>10} {:>10} {:>14}".format("rows", "how", "engine", "out rows", "seconds", "peak RSS MB"))
+
+    try:
+        for number_of_rows in sizes_from_argv([1000000, 5000000]):
+            attributes_path, stats_path = write_tables(directory, number_of_rows, rng)
+            for how in ('inner', 'outer'):
+                for engine in ('pd.merge', 'partitioned_join', 'probe_join'):
+                    # A fresh process per run, so the peak RSS belongs to this engine only
+                    context = multiprocessing.get_context('spawn')
+                    results = context.Queue()
+                    worker = context.Process(
+                        target=run_engine, args=(engine, attributes_path, stats_path, how, results))
+                    worker.start()
+                    rows, elapsed, peak_megabytes = results.get()
+                    worker.join()
+                    print("{:>10} {:>6} {:>18} {:>10} {:>10.2f} {:>14.0f}".format(
+                        number_of_rows, how, engine, rows, elapsed, peak_megabytes))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+from common import REPO_ROOT, best_time, sizes_from_argv
+from poke_loader import load_pokes
+
+SAMPLE_PATH = os.path.join(REPO_ROOT, 'OneHotEncoding', 'poke_data.csv')
+
+
+def write_big_file(path, number_of_rows):
+    # Repeats the rows of poke_data.csv, tab padding included
+    with open(SAMPLE_PATH) as sample_file:
+        header = sample_file.readline()
+        rows = [line if line.endswith('\n') else line + '\n' for line in sample_file]
+
+    with open(path, 'w') as big_file:
+        big_file.write(header)
+        repeats = number_of_rows // len(rows)
+        big_file.write(''.join(rows) * repeats)
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    print("{:>10} {:>28} {:>10} {:>12}".format("rows", "loader", "seconds", "memory MB"))
+
+    try:
+        for number_of_rows in sizes_from_argv([1000000, 5000000]):
+            path = os.path.join(directory, 'pokes.csv')
+            write_big_file(path, number_of_rows)
+            cache_directory = os.path.join(directory, 'cache')
+            shutil.rmtree(cache_directory, ignore_errors=True)
+
+            loaders = [
+                ("pd.read_csv", lambda: pd.read_csv(path, skipinitialspace=True)),
+                ("load_pokes", lambda: load_pokes(path)),
+                ("load_pokes, writes cache", lambda: load_pokes(path, cache_directory=cache_directory)),
+                ("load_pokes, from cache", lambda: load_pokes(path, cache_directory=cache_directory)),
+            ]
+            for name, loader in loaders:
+                frame = None
+
+                def run():
+                    nonlocal frame
+                    frame = loader()
+
+                elapsed = best_time(run, repeat=1)
+                print("{:>10} {:>28} {:>10.3f} {:>12.1f}".format(
+                    number_of_rows, name, elapsed, frame.memory_usage(deep=True).sum() / 2 ** 20))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import numpy as nmpy
+
+from common import best_time, sizes_from_argv
+from nn_toolkit import NullProfiler, Profiler, relu, relu_deriv
+
+# The loop of NeuralNetwork_8_backpropagation/two_layer_network.py, whose examples
+# take a few microseconds each: the worst case for the cost of the profiler calls.
+INPUTS = nmpy.array([[1, 1, 1],
+                     [1, 1, 0],
+                     [0, 1, 0],
+                     [0, 1, 1]], dtype=float)
+EXPECTED_VALUES = nmpy.array([1, 0, 1, 0])
+
+
+def without_hooks(epochs, alpha=0.1):
+    weights_1, weights_2 = nmpy.random.RandomState(0).random_sample((3, 4)), nmpy.full(4, 0.5)
+    for _ in range(epochs):
+        for input_set, expected_value in zip(INPUTS, EXPECTED_VALUES):
+            hidden_outputs = relu(nmpy.dot(input_set, weights_1))
+            predicted_value = nmpy.dot(hidden_outputs, weights_2)
+            layer2_delta = predicted_value - expected_value
+            layer1_delta = (weights_2 * layer2_delta) * relu_deriv(hidden_outputs)
+            weights_2 -= alpha * hidden_outputs.dot(layer2_delta)
+            weights_1 -= alpha * nmpy.outer(input_set, layer1_delta)
+
+
+def with_hooks(epochs, profiler, alpha=0.1):
+    weights_1, weights_2 = nmpy.random.RandomState(0).random_sample((3, 4)), nmpy.full(4, 0.5)
+    profiler.start()
+    for _ in range(epochs):
+        for input_set, expected_value in zip(INPUTS, EXPECTED_VALUES):
+            profiler.lap('data')
+            hidden_outputs = relu(nmpy.dot(input_set, weights_1))
+            predicted_value = nmpy.dot(hidden_outputs, weights_2)
+            profiler.lap('forward', 36)
+            layer2_delta = predicted_value - expected_value
+            profiler.lap('loss', 1)
+            layer1_delta = (weights_2 * layer2_delta) * relu_deriv(hidden_outputs)
+            profiler.lap('backward', 8)
+            weights_2 -= alpha * hidden_outputs.dot(layer2_delta)
+            weights_1 -= alpha * nmpy.outer(input_set, layer1_delta)
+            profiler.lap('update', 48)
+        profiler.step(len(INPUTS))
+    profiler.close()
+
+
+def main():
+    print("{:>7} {:>22} {:>10} {:>10}".format("epochs", "profiler", "seconds", "overhead"))
+
+    for epochs in sizes_from_argv([1000, 10000]):
+        baseline = best_time(lambda: without_hooks(epochs))
+        print("{:>7} {:>22} {:>10.3f} {:>10}".format(epochs, "none", baseline, "-"))
+
+        for name, make_profiler in (("NullProfiler", NullProfiler),
+                                    ("Profiler", Profiler),
+                                    ("Profiler + allocations", lambda: Profiler(track_allocations=True))):
+            seconds = best_time(lambda: with_hooks(epochs, make_profiler()))
+            print("{:>7} {:>22} {:>10.3f} {:>9.1f}%".format(epochs, name, seconds, (seconds / baseline - 1) * 100))
+
+
+if __name__ == '__main__':
+    main()
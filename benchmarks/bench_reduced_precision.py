@@ -0,0 +1,44 @@
+import tracemalloc
+
+import numpy as nmpy
+
+from common import best_time, sizes_from_argv
+from nn_toolkit import LinearPredictor, TwoLayerPredictor, precision_report, reduce_precision
+
+BATCH_SIZE = 256
+
+
+def peak_bytes(function):
+    # The most memory one call allocates at once, after a first call has set up
+    # any buffers the predictor keeps
+    function()
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    rng = nmpy.random.RandomState(0)
+    print("{:>6} {:>10} {:>10} {:>14} {:>14} {:>14} {:>12}".format(
+        "size", "model", "precision", "weight bytes", "peak bytes", "seconds/batch", "max drift"))
+
+    for size in sizes_from_argv([256, 2048]):
+        batch = rng.random_sample((BATCH_SIZE, size))
+        held_out_inputs = rng.random_sample((1000, size))
+        models = [("linear", LinearPredictor(rng.normal(0, 1 / nmpy.sqrt(size), (size, size)))),
+                  ("two layer", TwoLayerPredictor(rng.normal(0, 1 / nmpy.sqrt(size), (size, size)),
+                                                  rng.normal(0, 1 / nmpy.sqrt(size), size)))]
+
+        for name, predictor in models:
+            for row in precision_report(predictor, held_out_inputs):
+                reduced = reduce_precision(predictor, row['precision'])
+                seconds = best_time(lambda: reduced.predict(batch))
+                print("{:>6} {:>10} {:>10} {:>14} {:>14} {:>14.6f} {:>12.3g}".format(
+                    size, name, row['precision'], row['weight_bytes'], peak_bytes(lambda: reduced.predict(batch)),
+                    seconds, row['max_drift']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import numpy as nmpy
+
+from common import best_time, sizes_from_argv
+from nn_toolkit import SparseLinearSGD, SparseRows
+
+NUMBER_OF_ROWS = 2000
+NUMERIC_FEATURES = 4
+
+
+# The loop of NeuralNetwork_7_correlation/stochastic_gradient_descent.py
+def dense_epoch(weights, inputs, expected_values, alpha=0.1):
+    error_for_run = 0
+    for input_set, expected_value in zip(inputs, expected_values):
+        predicted_value = round( input_set.dot(weights), 1)
+        error_for_run += (predicted_value - expected_value) ** 2
+        weights -= alpha * (input_set * (predicted_value - expected_value) )
+
+    return error_for_run
+
+
+def main():
+    rng = nmpy.random.RandomState(0)
+    print("{:>10} {:>8} {:>14} {:>10}".format("categories", "engine", "seconds/row", "close"))
+
+    for number_of_categories in sizes_from_argv([100, 5000, 50000]):
+        # A one-hot encoded category plus a few numeric columns, like get_dummies output
+        codes = rng.randint(number_of_categories, size=NUMBER_OF_ROWS)
+        numeric = rng.random_sample((NUMBER_OF_ROWS, NUMERIC_FEATURES))
+        inputs = nmpy.zeros((NUMBER_OF_ROWS, NUMERIC_FEATURES + number_of_categories))
+        inputs[:, :NUMERIC_FEATURES] = numeric
+        inputs[nmpy.arange(NUMBER_OF_ROWS), NUMERIC_FEATURES + codes] = 1
+        expected_values = rng.random_sample(NUMBER_OF_ROWS)
+        initial_weights = rng.random_sample(inputs.shape[1]) * 0.1
+
+        sparse_inputs = SparseRows.from_dense(inputs)
+        dense_weights = initial_weights.copy()
+        model = SparseLinearSGD(initial_weights)
+
+        dense_seconds = best_time(lambda: dense_epoch(dense_weights, inputs, expected_values), repeat=1)
+        sparse_seconds = best_time(lambda: model.train_epoch(sparse_inputs, expected_values), repeat=1)
+        # Equal up to rounding, the sparse sums run in another order
+        close = nmpy.allclose(dense_weights, model.weights, rtol=1e-12, atol=1e-12)
+
+        print("{:>10} {:>8} {:>14.7f} {:>10}".format(number_of_categories, "dense", dense_seconds / NUMBER_OF_ROWS, ""))
+        print("{:>10} {:>8} {:>14.7f} {:>10}".format(number_of_categories, "sparse", sparse_seconds / NUMBER_OF_ROWS, str(close)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+import numpy as nmpy
+
+from common import best_time, sizes_from_argv
+from nn_toolkit import TwoLayerNetwork, relu, relu_deriv
+
+
+# The training loop from two_layer_network.py, one sample at a time and without prints
+def per_sample_epoch(inputs, expected_values, weights_1, weights_2, alpha):
+    overall_run_error = 0
+    for input_set, expected_value in zip(inputs, expected_values):
+        hidden_outputs = relu(nmpy.dot(input_set, weights_1))
+        predicted_value = round(nmpy.dot(hidden_outputs, weights_2), 1)
+
+        layer2_delta = (predicted_value - expected_value)
+        layer1_delta = (weights_2 * layer2_delta) * relu_deriv(hidden_outputs)
+
+        weights_2 -= alpha * hidden_outputs.dot(layer2_delta)
+        weights_1 -= alpha * nmpy.outer(input_set, layer1_delta)
+
+        overall_run_error += nmpy.sum((predicted_value - expected_value) ** 2)
+
+    return overall_run_error
+
+
+def main():
+    rng = nmpy.random.RandomState(0)
+    print("{:>10} {:>22} {:>14}".format("rows", "engine", "rows/sec"))
+
+    for number_of_rows in sizes_from_argv([10000, 100000, 1000000]):
+        inputs = rng.randint(0, 2, size=(number_of_rows, 3)).astype(float)
+        expected_values = rng.randint(0, 2, size=number_of_rows).astype(float)
+        weights_1 = rng.random_sample((3, 4))
+        weights_2 = rng.random_sample(4)
+
+        elapsed = best_time(lambda: per_sample_epoch(inputs, expected_values,
+                                                     weights_1.copy(), weights_2.copy(), 0.1),
+                            repeat=1)
+        print("{:>10} {:>22} {:>14.0f}".format(number_of_rows, "per-sample loop", number_of_rows / elapsed))
+
+        for batch_size in (1, 32, 1024, number_of_rows):
+            if batch_size == 1 and number_of_rows > 100000:
+                continue
+
+            def run_epoch():
+                network = TwoLayerNetwork(3, 4, alpha=0.1, weights_1=weights_1, weights_2=weights_2)
+                network.train_epoch(inputs, expected_values, batch_size=batch_size)
+
+            elapsed = best_time(run_epoch, repeat=1 if batch_size == 1 else 3)
+            print("{:>10} {:>22} {:>14.0f}".format(number_of_rows, "batch_size={}".format(batch_size),
+                                                   number_of_rows / elapsed))
+
+
+if __name__ == '__main__':
+    main()
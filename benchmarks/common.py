@@ -0,0 +1,30 @@
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Make the importable helpers of every section available to the benchmarks
+for section in ('DeepLearningBasics', 'Pandas_Basics', 'OneHotEncoding'):
+    section_path = os.path.join(REPO_ROOT, section)
+    if section_path not in sys.path:
+        sys.path.append(section_path)
+
+
+def best_time(function, repeat=3):
+    # Returns the fastest of `repeat` runs, in seconds
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def sizes_from_argv(default_sizes):
+    # Every benchmark accepts an optional list of sizes: python bench_x.py 1000 10000
+    if len(sys.argv) > 1:
+        return [int(size) for size in sys.argv[1:]]
+
+    return default_sizes
@@ -0,0 +1,445 @@
+import os
+import sys
+
+# A fixed set of benchmarks, plain Python next to NumPy, over a range of sizes, whose
+# results are saved as JSON and compared with a stored baseline:
+#
+#     python suite.py                      run everything, compare with baseline.json
+#     python suite.py --only=pandas        only the cases whose name starts with "pandas"
+#     python suite.py --quick              only the smallest size of every case
+#     python suite.py --output=PATH        where to write the results (benchmark_results.json)
+#     python suite.py --baseline=PATH      compare with PATH instead of baseline.json
+#     python suite.py --save-baseline      record a new baseline, from --runs=5 complete runs
+#     python suite.py --threshold=0.25     how much slower counts as a regression
+#     python suite.py --threads=1          BLAS/OpenMP threads
+#
+# Every case gets the same seeds on every run, BLAS runs on a fixed number of threads
+# and the process is pinned to one CPU. Every case also runs in a fresh interpreter
+# of its own: the cases that ran before it leave the allocator and pandas' caches in
+# a different state, which changed some times by 40% depending on --only and --quick.
+# Timings still vary from run to run, on shared
+# machines by tens of percent, so a single measurement is never compared with a
+# single measurement: the baseline keeps the median of several runs and the range
+# they spanned, a case counts as slower only beyond that range plus the threshold,
+# and it is measured again before being reported. The exit status is 1 when a case
+# is still slower after that.
+#
+# A baseline recorded on a busy machine can have a range so wide that even a large
+# regression stays inside it. Cases whose range is over MAX_SPREAD are reported as
+# "noisy" instead of being judged; record the baseline again on a quieter machine.
+
+
+def option(name, default=None):
+    return next((argument.split('=', 1)[1] for argument in sys.argv if argument.startswith(name + '=')), default)
+
+
+# The thread count has to be in the environment before numpy is imported
+THREADS = int(option('--threads', 1))
+for variable in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+                 'VECLIB_MAXIMUM_THREADS', 'NUMEXPR_NUM_THREADS'):
+    os.environ[variable] = str(THREADS)
+
+import itertools
+import json
+import platform
+import random
+import subprocess
+import time
+import timeit
+
+import numpy as nmpy
+import pandas as pd
+
+# Importing common puts DeepLearningBasics, Pandas_Basics and OneHotEncoding on sys.path
+import common
+from bench_dense_layer import python_loop_layer
+from bench_onehot_encoding import strings_to_onehot
+from group_kernels import group_mean
+from nn_toolkit import SingleOutputUpdates, TwoLayerNetwork, dot_product, multi_input_multi_output_neural_network, relu, relu_deriv
+from onehot_encoder import OneHotEncoder
+from partitioned_join import collect, probe_join
+
+SEED = 0
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Every measurement: at least WARMUP_SECONDS of untimed calls, then REPEAT timed
+# runs of at least MIN_SECONDS each, of which the median is kept
+WARMUP_SECONDS = 0.1
+REPEAT = 7
+MIN_SECONDS = 0.1
+# Complete runs a baseline is made of, and how many times a case that looks slower
+# is measured again before it counts as a regression
+BASELINE_RUNS = 5
+CONFIRMATIONS = 2
+# The widest range (slowest / fastest of the baseline runs) a case can be judged with
+MAX_SPREAD = 1.5
+
+
+# The plain Python versions, as the NeuralNetwork_2 and NeuralNetwork_5 scripts wrote them
+def python_dot_product(first_vector, second_vector):
+    result = 0
+    for first_value, second_value in zip(first_vector, second_vector):
+        result += first_value * second_value
+    return result
+
+
+def calculate_weight_adjustments(inputs, correction_factor):
+    return [input * correction_factor for input in inputs]
+
+
+def calculate_updated_weights(weights, weight_adjustments):
+    return [weight - weight_adjustment for weight, weight_adjustment in zip(weights, weight_adjustments)]
+
+
+# Every setup gets the size and a seeded RandomState and returns the function to time
+def dot_product_python(size, rng):
+    first_vector, second_vector = rng.random_sample(size).tolist(), rng.random_sample(size).tolist()
+    return lambda: python_dot_product(first_vector, second_vector)
+
+
+def dot_product_numpy(size, rng):
+    first_vector, second_vector = rng.random_sample(size), rng.random_sample(size)
+    return lambda: dot_product(first_vector, second_vector)
+
+
+def mimo_python(size, rng):
+    inputs, weights = rng.random_sample(size).tolist(), rng.random_sample((size, size)).tolist()
+    return lambda: python_loop_layer(inputs, weights)
+
+
+def mimo_numpy(size, rng):
+    inputs, weights = rng.random_sample(size), rng.random_sample((size, size))
+    return lambda: multi_input_multi_output_neural_network(inputs, weights)
+
+
+def updates_python(size, rng):
+    inputs, weights = rng.random_sample(size).tolist(), rng.random_sample(size).tolist()
+
+    def step():
+        calculate_updated_weights(weights, calculate_weight_adjustments(inputs, 0.01))
+    return step
+
+
+def updates_inplace(size, rng):
+    inputs, weights = rng.random_sample(size), rng.random_sample(size)
+    engine = SingleOutputUpdates(size)
+
+    def step():
+        engine.calculate_updated_weights(weights, engine.calculate_weight_adjustments(inputs, 0.01))
+    return step
+
+
+def sgd_loop(size, rng):
+    # One epoch of NeuralNetwork_7_correlation/stochastic_gradient_descent.py over `size` rows
+    inputs, expected_values = rng.randint(2, size=(size, 3)), rng.randint(2, size=size)
+
+    def epoch(alpha=0.1):
+        weights = nmpy.array([0.5, 0.5, 0.5])
+        for input_set, expected_value in zip(inputs, expected_values):
+            predicted_value = round(input_set.dot(weights), 1)
+            weights -= alpha * (input_set * (predicted_value - expected_value))
+    return epoch
+
+
+def two_layer_loop(size, rng):
+    # One epoch of NeuralNetwork_8_backpropagation/two_layer_network.py over `size` rows
+    inputs, expected_values = rng.randint(2, size=(size, 3)), rng.randint(2, size=size)
+    initial_weights_1, initial_weights_2 = rng.random_sample((3, 4)), rng.random_sample(4)
+
+    def epoch(alpha=0.1):
+        weights_1, weights_2 = initial_weights_1.copy(), initial_weights_2.copy()
+        for input_set, expected_value in zip(inputs, expected_values):
+            hidden_outputs = relu(nmpy.dot(input_set, weights_1))
+            predicted_value = round(nmpy.dot(hidden_outputs, weights_2), 1)
+            layer2_delta = predicted_value - expected_value
+            layer1_delta = (weights_2 * layer2_delta) * relu_deriv(hidden_outputs)
+            weights_2 -= alpha * hidden_outputs.dot(layer2_delta)
+            weights_1 -= alpha * nmpy.outer(input_set, layer1_delta)
+    return epoch
+
+
+def two_layer_batched(size, rng):
+    inputs, expected_values = rng.randint(2, size=(size, 3)), rng.randint(2, size=size)
+    initial_weights_1, initial_weights_2 = rng.random_sample((3, 4)), rng.random_sample(4)
+
+    def epoch():
+        network = TwoLayerNetwork(3, weights_1=initial_weights_1.copy(), weights_2=initial_weights_2.copy())
+        network.train_epoch(inputs, expected_values, batch_size=32)
+    return epoch
+
+
+def category_column(size, rng, number_of_categories=18):
+    names = nmpy.array(['type_{}'.format(index) for index in range(number_of_categories)], dtype=object)
+    return names[rng.randint(number_of_categories, size=size)]
+
+
+def onehot_strings_to_onehot(size, rng):
+    column = list(category_column(size, rng))
+    return lambda: strings_to_onehot(column)
+
+
+def onehot_encoder(size, rng):
+    column = category_column(size, rng)
+    return lambda: OneHotEncoder().fit_transform(column)
+
+
+def sales_frame(size, rng):
+    # The shape of the tables of 10_group_operations and 9_merging_dataframes
+    return pd.DataFrame({'store': rng.randint(100, size=size), 'units': rng.randint(50, size=size),
+                         'price': rng.random_sample(size) * 100})
+
+
+def pandas_groupby_mean(size, rng):
+    frame = sales_frame(size, rng)
+    return lambda: frame.groupby('store').mean()
+
+
+def pandas_group_mean_kernel(size, rng):
+    frame = sales_frame(size, rng)
+    return lambda: group_mean(frame, 'store')
+
+
+def pandas_merge(size, rng):
+    frame = sales_frame(size, rng)
+    stores = pd.DataFrame({'store': nmpy.arange(100), 'city': ['city_{}'.format(store % 7) for store in range(100)]})
+    return lambda: pd.merge(frame, stores, on='store')
+
+
+def pandas_probe_join(size, rng):
+    frame = sales_frame(size, rng)
+    stores = pd.DataFrame({'store': nmpy.arange(100), 'city': ['city_{}'.format(store % 7) for store in range(100)]})
+    return lambda: collect(probe_join(frame, stores, on='store', chunk_rows=100000), on='store')
+
+
+# (name, sizes, setup). The plain Python paths stop at sizes that still finish quickly.
+CASES = [
+    ('dot_product/python', [100, 10000, 1000000], dot_product_python),
+    ('dot_product/numpy', [100, 10000, 1000000], dot_product_numpy),
+    ('mimo/python', [16, 128, 512], mimo_python),
+    ('mimo/numpy', [16, 128, 512], mimo_numpy),
+    ('updates/python', [10, 1000, 100000], updates_python),
+    ('updates/inplace', [10, 1000, 100000], updates_inplace),
+    ('sgd/loop', [100, 10000], sgd_loop),
+    ('two_layer/loop', [100, 10000], two_layer_loop),
+    ('two_layer/batched', [100, 10000, 100000], two_layer_batched),
+    ('onehot/strings_to_onehot', [1000, 100000], onehot_strings_to_onehot),
+    ('onehot/encoder', [1000, 100000, 1000000], onehot_encoder),
+    ('pandas/groupby_mean', [10000, 1000000], pandas_groupby_mean),
+    ('pandas/group_mean_kernel', [10000, 1000000], pandas_group_mean_kernel),
+    ('pandas/merge', [10000, 1000000], pandas_merge),
+    ('pandas/probe_join', [10000, 1000000], pandas_probe_join),
+]
+
+
+def pin_cpu():
+    # One CPU, the first one we may run on (Linux only)
+    if not hasattr(os, 'sched_setaffinity'):
+        return None
+    cpu = min(os.sched_getaffinity(0))
+    os.sched_setaffinity(0, {cpu})
+    return cpu
+
+
+def environment(cpu):
+    # What the numbers depend on, to tell whether two result files are comparable
+    return {'python': platform.python_version(), 'numpy': nmpy.__version__, 'pandas': pd.__version__,
+            'machine': platform.machine(), 'processor': platform.processor(), 'system': platform.system(),
+            'cpu_count': os.cpu_count(), 'pinned_cpu': cpu, 'threads': THREADS, 'seed': SEED}
+
+
+def measure(function, repeat=REPEAT, min_seconds=MIN_SECONDS):
+    # Seconds per call over `repeat` runs, each long enough (at least min_seconds)
+    # for the clock's resolution not to matter. The first calls fill caches and
+    # grow the allocator's pools, so they run before any timing.
+    warmup_end = time.perf_counter() + WARMUP_SECONDS
+    for call in itertools.count():
+        function()
+        if call >= 2 and time.perf_counter() >= warmup_end:
+            break
+
+    timer = timeit.Timer(function)
+    number = 1
+    while timer.timeit(number) < min_seconds:
+        number *= 10 if number < 1000 else 2
+
+    times = sorted(seconds / number for seconds in timer.repeat(repeat, number))
+    return {'number': number, 'best': times[0], 'median': times[len(times) // 2], 'times': times}
+
+
+def selected_cases(only='', quick=False):
+    # (key, name, size, setup) of every case to run
+    return [('{}[{}]'.format(name, size), name, size, setup)
+            for name, sizes, setup in CASES if name.startswith(only)
+            for size in (sizes[:1] if quick else sizes)]
+
+
+def measure_case(name, size, setup):
+    # Same seeds for the data and for anything drawing from the global generators
+    nmpy.random.seed(SEED)
+    random.seed(SEED)
+    function = setup(size, nmpy.random.RandomState(SEED))
+    return dict(case=name, size=size, **measure(function))
+
+
+def run_case(key):
+    # Measures the case in a new process (main() with --case=KEY) and returns its result
+    command = [sys.executable, os.path.abspath(__file__), '--case=' + key, '--threads={}'.format(THREADS)]
+    output = subprocess.run(command, check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+    return json.loads(output)
+
+
+def run(cases):
+    results = {}
+    for key, _, _, _ in cases:
+        results[key] = run_case(key)
+        print("{:<40} {:>14.2f} us".format(key, results[key]['median'] * 1e6), flush=True)
+
+    return results
+
+
+def merge_runs(runs):
+    # A baseline from several complete runs: the median of their medians, and the
+    # range those medians spanned, which is how much the machine varies by itself.
+    # With 5 runs or more the fastest and the slowest are left out of the range.
+    baseline = {}
+    for key, result in runs[0].items():
+        medians = sorted(run[key]['median'] for run in runs)
+        spanned = medians[1:-1] if len(medians) >= 5 else medians
+        baseline[key] = {'case': result['case'], 'size': result['size'], 'median': medians[len(medians) // 2],
+                         'low': spanned[0], 'high': spanned[-1], 'medians': medians}
+    return baseline
+
+
+def too_noisy(reference):
+    return reference['high'] > reference['low'] * MAX_SPREAD
+
+
+def status(median, reference, threshold):
+    # Slower or faster only beyond the range of the baseline runs, plus the threshold
+    if too_noisy(reference):
+        return 'noisy'
+    if median > reference['high'] * (1 + threshold):
+        return 'SLOWER'
+    if median < reference['low'] / (1 + threshold):
+        return 'faster'
+    return 'ok'
+
+
+def compare(results, baseline, threshold, remeasure=None):
+    # (key, median, status) for every result. A case that looks slower is measured
+    # again, up to CONFIRMATIONS times, and only stays SLOWER if it is every time:
+    # a single unlucky measurement doesn't make a regression.
+    comparison = []
+    for key, result in results.items():
+        if key not in baseline:
+            comparison.append((key, result['median'], 'new'))
+            continue
+
+        median = result['median']
+        case_status = status(median, baseline[key], threshold)
+        for _ in range(CONFIRMATIONS if remeasure else 0):
+            if case_status != 'SLOWER':
+                break
+            print("{} looks slower, measuring it again".format(key), flush=True)
+            median = min(median, remeasure(key)['median'])
+            case_status = status(median, baseline[key], threshold)
+        comparison.append((key, median, case_status))
+
+    return comparison
+
+
+def comparison_table(baseline, comparison, threshold):
+    lines = ["{:<40} {:>12} {:>12} {:>12} {:>7} {:>7}".format(
+        "case", "median us", "baseline us", "limit us", "ratio", "status")]
+    for key, median, case_status in comparison:
+        if key in baseline:
+            reference = baseline[key]
+            limit = "-" if case_status == 'noisy' else "{:.2f}".format(reference['high'] * (1 + threshold) * 1e6)
+            lines.append("{:<40} {:>12.2f} {:>12.2f} {:>12} {:>7.2f} {:>7}".format(
+                key, median * 1e6, reference['median'] * 1e6, limit, median / reference['median'], case_status))
+        else:
+            lines.append("{:<40} {:>12.2f} {:>12} {:>12} {:>7} {:>7}".format(key, median * 1e6, "-", "-", "-", case_status))
+    return "\n".join(lines)
+
+
+def write_json(path, data):
+    with open(path, 'w') as output_file:
+        json.dump(data, output_file, indent=1, sort_keys=True)
+
+
+def main():
+    only = option('--only', '')
+    output_path = option('--output', 'benchmark_results.json')
+    baseline_path = option('--baseline', BASELINE)
+    threshold = float(option('--threshold', 0.25))
+    cases = selected_cases(only, '--quick' in sys.argv)
+
+    cpu = pin_cpu()
+    if option('--case'):
+        # A single case, for run_case: the result goes to stdout as JSON
+        name, size, setup = next(case[1:] for case in selected_cases() if case[0] == option('--case'))
+        print(json.dumps(measure_case(name, size, setup)))
+        return 0
+
+    if '--save-baseline' in sys.argv:
+        number_of_runs = int(option('--runs', BASELINE_RUNS))
+        runs = []
+        for run_number in range(1, number_of_runs + 1):
+            print("Baseline run {} of {}".format(run_number, number_of_runs), flush=True)
+            runs.append(run(cases))
+
+        # With --only, the other cases of an existing baseline are kept
+        baseline = {'results': {}}
+        if only and os.path.exists(baseline_path):
+            with open(baseline_path) as baseline_file:
+                baseline = json.load(baseline_file)
+        recorded = merge_runs(runs)
+        baseline['results'].update(recorded)
+        baseline.pop('calibration', None)
+        baseline.update(environment=environment(cpu), runs=number_of_runs)
+
+        write_json(baseline_path, baseline)
+        print("\nBaseline written to {}".format(baseline_path))
+        noisy = [key for key, reference in sorted(recorded.items()) if too_noisy(reference)]
+        if noisy:
+            print("{} case(s) varied by more than {}x between the runs and won't be judged: {}".format(
+                len(noisy), MAX_SPREAD, ", ".join(noisy)))
+        return 0
+
+    results = {'environment': environment(cpu), 'results': run(cases)}
+    write_json(output_path, results)
+    print("\nResults written to {}".format(output_path))
+
+    if not os.path.exists(baseline_path):
+        print("No baseline at {}, run with --save-baseline to create one".format(baseline_path))
+        return 0
+
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+
+    differences = {name: (value, baseline['environment'].get(name)) for name, value in results['environment'].items()
+                   if name != 'pinned_cpu' and baseline['environment'].get(name) != value}
+    if differences:
+        print("Warning: the baseline comes from another environment, the comparison is only indicative:")
+        for name, (value, baseline_value) in sorted(differences.items()):
+            print("  {}: {} here, {} in the baseline".format(name, value, baseline_value))
+
+    comparison = compare(results['results'], baseline['results'], threshold, remeasure=run_case)
+    print()
+    print(comparison_table(baseline['results'], comparison, threshold))
+
+    noisy = [key for key, _, case_status in comparison if case_status == 'noisy']
+    if noisy:
+        print("\n{} case(s) not judged, their baseline runs varied by more than {}x: {}. Record the baseline "
+              "again on a quieter machine.".format(len(noisy), MAX_SPREAD, ", ".join(noisy)))
+
+    regressions = [key for key, _, case_status in comparison if case_status == 'SLOWER']
+    if regressions:
+        print("\n{} regression(s) beyond the baseline's range plus {:.0f}%: {}".format(
+            len(regressions), threshold * 100, ", ".join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())